@@ -0,0 +1,136 @@
+"""
+Read-only JSON/CSV API on the Flask server of the Dash app.
+
+    /api/seasons                       available seasons and the one being served
+    /api/<table>.json, /api/<table>.csv
+        table: overview, percent, rp, punten or games (one row per player per game,
+               public columns only: no player ids or federation numbers)
+        ?klasse=A         only players of a class
+        ?datum=DD/MM/YYYY only one game (games)
+        ?naam=...         only one player (games)
+
+Every response carries a strong ETag tied to the data version, a request with a
+matching If-None-Match gets an empty 304. Rows are streamed in chunks.
+"""
+
+import hashlib
+import json
+import uuid
+
+import app_logging
+
+logger = app_logging.get_logger('api')
+
+TABLES = ['overview', 'percent', 'rp', 'punten', 'games']
+FORMATS = {'json': 'application/json', 'csv': 'text/csv; charset=utf-8'}
+FILTERS = {'klasse': 'Klasse', 'datum': 'Datum', 'naam': 'Naam'}
+CHUNK_ROWS = 500
+
+# Public columns of the games table (the B-columns go after Nr): no internal ids (PlayerId,
+# GameNr) and no federation numbers
+GAME_COLUMNS = ['Naam', 'KLASSE', 'Datum', 'Nr']
+GAME_SCORE_COLUMNS = ['Totaal', 'TheoMax', 'Percent', 'RP', 'Punten']
+
+# ETags of an earlier process must never match: the data version restarts at every start
+_PROCESS_TOKEN = uuid.uuid4().hex[:8]
+
+
+def make_etag(version, *parts):
+    """Strong ETag of a response built from data version `version`"""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:16]
+    return f"{_PROCESS_TOKEN}-{version}-{digest}"
+
+
+def public_games(df_global):
+    """The games table as published: one row per player per game with the public columns (and the B-columns)"""
+    turns = [column for column in df_global.columns if str(column).startswith('B') and str(column)[1:].isdigit()]
+    columns = [column for column in GAME_COLUMNS + turns + GAME_SCORE_COLUMNS if column in df_global.columns]
+    return df_global[columns].rename(columns={'KLASSE': 'Klasse'})
+
+
+def filter_table(df, args):
+    """Rows matching the filters in the query string (filters on missing columns are ignored)"""
+    for parameter, column in FILTERS.items():
+        value = args.get(parameter)
+        if value and column in df.columns:
+            df = df[df[column].astype(str) == value]
+    return df
+
+
+def plain_floats(df):
+    """float32 columns of the compact schema as float64 rounded to 2 decimals (the precision they keep)"""
+    float32_columns = [column for column in df.columns if df[column].dtype == 'float32']
+    if not float32_columns:
+        return df
+    df = df.copy()
+    df[float32_columns] = df[float32_columns].astype('float64').round(2)
+    return df
+
+
+def iter_json(df):
+    """A JSON array of row objects, CHUNK_ROWS rows per chunk"""
+    yield "["
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS].to_json(orient='records', force_ascii=False)
+        yield ("," if start else "") + chunk[1:-1]
+    yield "]"
+
+
+def iter_csv(df):
+    """CSV with a header line, CHUNK_ROWS rows per chunk"""
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS].to_csv(index=False, header=False)
+
+
+def register(server, get_state):
+    """
+    Add the API routes to a Flask server.
+
+    Args:
+        server (flask.Flask): Server of the Dash app.
+        get_state (callable): get_state() -> dict with 'version' (data version), 'season'
+            (file name), 'seasons' (available files) and 'tables' (table name -> dataframe).
+    """
+    from flask import Response, abort, jsonify, request
+
+    def not_modified(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    @server.route("/api/seasons")
+    def api_seasons():
+        state = get_state()
+        etag = make_etag(state['version'], 'seasons', state['season'], *state['seasons'])
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+        response = jsonify({'season': state['season'], 'seasons': state['seasons'], 'version': state['version']})
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    @server.route("/api/<table>.<fmt>")
+    def api_table(table, fmt):
+        if table not in TABLES or fmt not in FORMATS:
+            abort(404)
+        state = get_state()
+        df = state['tables'].get(table)
+        if df is None or df.empty:
+            abort(503, description="Geen seizoensdata geladen")
+
+        query = sorted((key, request.args[key]) for key in FILTERS if request.args.get(key))
+        etag = make_etag(state['version'], state['season'], table, fmt, json.dumps(query))
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
+
+        df = plain_floats(filter_table(df, request.args))
+        chunks = iter_json(df) if fmt == 'json' else iter_csv(df)
+        response = Response(chunks, content_type=FORMATS[fmt])
+        response.set_etag(etag)
+        # Clients may keep the response but must revalidate, which costs a 304 while nothing changed
+        response.headers['Cache-Control'] = 'no-cache'
+        if fmt == 'csv':
+            response.headers['Content-Disposition'] = f'inline; filename="{table}.csv"'
+        logger.debug("Serving %s.%s", table, fmt, extra={'rows': len(df)})
+        return response
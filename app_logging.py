@@ -0,0 +1,106 @@
+"""
+Structured, level-controlled logging for the app.
+
+Every subsystem gets its own logger under the "scrabble" namespace (scrabble.data,
+scrabble.dropbox, scrabble.ui, ...). Levels are set with environment variables:
+
+    LOG_LEVEL=INFO                       default level for all subsystems
+    LOG_LEVELS=data=DEBUG,dropbox=WARNING  per-subsystem overrides
+    LOG_FORMAT=json                      one JSON object per line instead of key=value text
+
+Use %-style arguments (logger.debug("Loaded %s rows", len(df))) so messages are only
+formatted when the level is enabled, and guard expensive diagnostics with
+logger.isEnabledFor(logging.DEBUG).
+"""
+
+import json
+import logging
+import os
+
+ROOT_LOGGER = "scrabble"
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_configured = False
+
+
+def _extra_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+def _subsystem(record):
+    prefix = ROOT_LOGGER + "."
+    return record.name[len(prefix):] if record.name.startswith(prefix) else record.name
+
+
+class KeyValueFormatter(logging.Formatter):
+    """time level subsystem message key=value ..."""
+
+    def format(self, record):
+        message = record.getMessage()
+        fields = " ".join(f"{key}={value!r}" for key, value in _extra_fields(record).items())
+        line = f"{self.formatTime(record)} {record.levelname:<7} [{_subsystem(record)}] {message}"
+        if fields:
+            line += " " + fields
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per log line"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'subsystem': _subsystem(record),
+            'message': record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+def parse_levels(spec):
+    """Parse 'data=DEBUG,dropbox=WARNING' into {'data': 10, 'dropbox': 30}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        if "=" not in item:
+            continue
+        subsystem, level = item.split("=", 1)
+        level_value = logging.getLevelName(level.strip().upper())
+        if isinstance(level_value, int):
+            levels[subsystem.strip()] = level_value
+    return levels
+
+
+def configure_logging(default_level=None, levels=None, fmt=None):
+    """Install the handler on the app root logger and apply the configured levels"""
+    global _configured
+
+    default_level = default_level or os.environ.get("LOG_LEVEL", "INFO")
+    levels = levels if levels is not None else parse_levels(os.environ.get("LOG_LEVELS", ""))
+    fmt = fmt or os.environ.get("LOG_FORMAT", "text")
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(default_level.upper() if isinstance(default_level, str) else default_level)
+    root.propagate = False
+
+    if not _configured:
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter() if fmt == "json" else KeyValueFormatter())
+        root.addHandler(handler)
+        _configured = True
+
+    for subsystem, level in levels.items():
+        logging.getLogger(f"{ROOT_LOGGER}.{subsystem}").setLevel(level)
+
+    return root
+
+
+def get_logger(subsystem):
+    """Return the logger of a subsystem, e.g. get_logger('data') -> scrabble.data"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the data pipeline.
+
+Generates synthetic seasons at the requested scales and measures wall time and peak
+memory of every stage (tools.process_uitgebreid, give_gen_info,
+calculate_summer_percentage, make_pivot, compact_season_frame and the season loader
+of dash_app), plus the size of the season frame before and after compacting.
+With --startup the cold start of dash_app is measured as well (import time and
+time to the first response, each run in a fresh interpreter).
+dash_app runs with DATA_DIR set to a temporary directory, so the player registry, the
+stores and the snapshot of the benchmark never end up in the data directory of the app.
+Results are written as JSON so runs of different versions can be compared:
+
+    python benchmark.py --scale 40x30 --scale 200x100 --startup --output before.json
+    python benchmark.py --scale 40x30 --scale 200x100 --startup --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import synthetic_data
+import tools
+
+DEFAULT_SCALES = ['40x30', '200x100']
+
+# Modules that should only be imported when first needed, reported by the startup benchmark
+LAZY_MODULES = ['PyPDF2', 'dropbox', 'plotly.express', 'openpyxl', 'setuptools']
+
+STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import dash_app
+imported = time.perf_counter()
+client = dash_app.app.server.test_client()
+client.get('/')
+client.get('/_dash-layout')
+client.get('/_dash-dependencies')
+first_response = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'first_response_s': first_response - start,
+                  'lazy_modules_loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure(fn, repeat=3):
+    """Run fn repeat times for timing and once under tracemalloc for the peak memory"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_min_s': round(min(timings), 6),
+        'wall_median_s': round(statistics.median(timings), 6),
+        'peak_mb': round(peak / 1024 / 1024, 3),
+        'repeat': repeat,
+    }
+
+
+def check_class_change(df_season):
+    """
+    Regression check: a player whose class changes during the season is one row of the
+    general info tables, in the class of their latest game.
+    """
+    df = df_season.copy()
+    df['KLASSE'] = df['KLASSE'].astype(object)
+    name = df['Naam'].value_counts().index[0]
+    rows = df['Naam'] == name
+    later = rows & (df['GameNr'] > df.loc[rows, 'GameNr'].median())
+    new_class = next(klasse for klasse in ['A', 'B', 'C'] if klasse != df.loc[rows, 'KLASSE'].iloc[0])
+    df.loc[later, 'KLASSE'] = new_class
+    for compute in (tools.give_gen_info, tools.calculate_summer_percentage):
+        df_info = compute(df)
+        player = df_info[df_info['Naam'] == name]
+        if len(player) != 1 or player['Klasse'].iloc[0] != new_class or df_info['Naam'].duplicated().any():
+            raise AssertionError(f"{compute.__name__}: a player whose class changed is not one row in their latest class")
+
+
+def get_season_loader():
+    """Import dash_app lazily, the import itself syncs files and loads the current season"""
+    import dash_app
+    return dash_app
+
+
+def run_scale(n_games, n_players, repeat, work_dir, seed=0):
+    """Benchmark all stages for one scale and return a list of result records"""
+    df_members, games = synthetic_data.generate_games(n_games, n_players, seed)
+    parsed_games = [(date_str, synthetic_data.as_uploaded(df_game)) for date_str, df_game in games]
+    workbook = os.path.join(work_dir, f"Globaal {n_games}x{n_players}.xlsx")
+
+    results = []
+
+    def record(stage, fn):
+        result = measure(fn, repeat)
+        result.update({'stage': stage, 'games': n_games, 'players': n_players})
+        results.append(result)
+        print(f"  {stage:<28} {result['wall_median_s']:>10.4f} s  {result['peak_mb']:>9.2f} MB")
+
+    record('process_uitgebreid', lambda: synthetic_data.process_games(parsed_games, df_members))
+    df_season = synthetic_data.process_games(parsed_games, df_members)
+
+    record('write_workbook', lambda: df_season.to_excel(workbook, sheet_name='Globaal', index=False))
+
+    dash_app = get_season_loader()
+    record('load_data_for_season', lambda: dash_app.load_data_for_season(workbook))
+    df_global = dash_app.df_global
+
+    # Memory of the season frame as read from the workbook and in the compact schema
+    df_wide = pd.read_excel(workbook, sheet_name='Globaal')
+    record('compact_season_frame', lambda: tools.compact_season_frame(df_wide))
+    report = tools.memory_report({'wide': df_wide, 'compact': tools.compact_season_frame(df_wide)})
+    results[-1]['frame_mb'] = round(report['KB'].iloc[0] / 1024, 3)
+    results[-1]['compact_mb'] = round(report['KB'].iloc[1] / 1024, 3)
+    print(f"  {'season frame':<28} {results[-1]['frame_mb']:>9.2f} MB -> {results[-1]['compact_mb']:.2f} MB compact")
+
+    record('give_gen_info', lambda: tools.give_gen_info(df_global))
+    check_class_change(df_global)
+    record('calculate_summer_percentage', lambda: tools.calculate_summer_percentage(df_global))
+    record('make_pivot', lambda: tools.make_pivot(df_global, 'Naam', 'Datum', 'Percent'))
+    record('make_pivot_int', lambda: tools.make_pivot(df_global, 'Naam', 'Datum', 'Punten', True))
+
+    return results
+
+
+def run_startup(runs):
+    """Measure the cold start of dash_app in fresh interpreters and return result records"""
+    import_times, response_times, process_times = [], [], []
+    loaded = set()
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', STARTUP_SNIPPET % (LAZY_MODULES,)],
+                                   capture_output=True, text=True, cwd=app_dir)
+        process_times.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Startup run failed:\n{completed.stderr[-2000:]}")
+        measurement = json.loads(completed.stdout.strip().splitlines()[-1])
+        import_times.append(measurement['import_s'])
+        response_times.append(measurement['first_response_s'])
+        loaded.update(measurement['lazy_modules_loaded'])
+
+    results = []
+    for stage, timings in [('startup_import', import_times),
+                           ('startup_first_response', response_times),
+                           ('startup_process', process_times)]:
+        results.append({'stage': stage, 'games': 0, 'players': 0, 'repeat': runs, 'peak_mb': 0.0,
+                        'wall_min_s': round(min(timings), 6),
+                        'wall_median_s': round(statistics.median(timings), 6)})
+        print(f"  {stage:<28} {statistics.median(timings):>10.4f} s")
+    print(f"  lazy modules loaded at startup: {sorted(loaded) or 'none'}")
+    results[0]['lazy_modules_loaded'] = sorted(loaded)
+    return results
+
+
+def get_metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def compare_results(current, baseline, threshold):
+    """Print the ratio current / baseline per stage and return the regressions above threshold"""
+    baseline_index = {(r['stage'], r['games'], r['players']): r for r in baseline['results']}
+    regressions = []
+    print(f"\nComparison with {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}):")
+    for r in current['results']:
+        key = (r['stage'], r['games'], r['players'])
+        if key not in baseline_index:
+            continue
+        old = baseline_index[key]
+        ratio = r['wall_median_s'] / old['wall_median_s'] if old['wall_median_s'] else float('inf')
+        mem_ratio = r['peak_mb'] / old['peak_mb'] if old['peak_mb'] else float('nan')
+        flag = "  <-- regression" if ratio > threshold else ""
+        print(f"  {r['stage']:<28} {r['games']:>5}x{r['players']:<5} time x{ratio:.2f}  memory x{mem_ratio:.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def parse_scale(value):
+    games, players = value.lower().split('x')
+    return int(games), int(players)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Scrabble ranking data pipeline")
+    parser.add_argument("--scale", action="append", help="GAMESxPLAYERS, can be given several times "
+                                                         f"(default: {', '.join(DEFAULT_SCALES)})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--startup", action="store_true", help="Also measure the cold start of dash_app")
+    parser.add_argument("--skip-pipeline", action="store_true", help="Only run the startup benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as regression when comparing (default 1.25)")
+    args = parser.parse_args(argv)
+
+    results = {'meta': get_metadata(), 'results': []}
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Inherited by the startup runs, read by dash_app on import
+        os.environ['DATA_DIR'] = os.path.join(work_dir, 'data')
+        if args.startup or args.skip_pipeline:
+            print("Startup")
+            results['results'].extend(run_startup(args.repeat))
+
+        if not args.skip_pipeline:
+            for scale in args.scale or DEFAULT_SCALES:
+                n_games, n_players = parse_scale(scale)
+                print(f"Scale {n_games} games x {n_players} players")
+                results['results'].extend(run_scale(n_games, n_players, args.repeat, work_dir, args.seed))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
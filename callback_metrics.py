@@ -0,0 +1,175 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from dash.exceptions import PreventUpdate
+from flask import has_request_context, request
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class CallbackMetrics:
+    """Rolling timing and payload-size statistics per Dash callback (kept in memory)"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _get(self, name):
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = {
+                'durations': deque(maxlen=self.window),
+                'request_bytes': deque(maxlen=self.window),
+                'response_bytes': deque(maxlen=self.window),
+                'calls': 0,
+                'errors': 0,
+                'prevented': 0,
+                'duration_sum': 0.0,
+                'request_bytes_sum': 0,
+                'response_bytes_sum': 0,
+                'last_error': None,
+            }
+            self._stats[name] = stats
+        return stats
+
+    def record(self, name, duration, request_bytes, response_bytes, error=None, prevented=False):
+        """Record one callback invocation"""
+        with self._lock:
+            stats = self._get(name)
+            stats['calls'] += 1
+            stats['durations'].append(duration)
+            stats['duration_sum'] += duration
+            stats['request_bytes'].append(request_bytes)
+            stats['request_bytes_sum'] += request_bytes
+            stats['response_bytes'].append(response_bytes)
+            stats['response_bytes_sum'] += response_bytes
+            if prevented:
+                stats['prevented'] += 1
+            if error is not None:
+                stats['errors'] += 1
+                stats['last_error'] = f"{type(error).__name__}: {error}"
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self):
+        """Return one dict per callback with counters and rolling percentiles"""
+        with self._lock:
+            items = [(name, dict(stats, durations=list(stats['durations']),
+                                 request_bytes=list(stats['request_bytes']),
+                                 response_bytes=list(stats['response_bytes'])))
+                     for name, stats in self._stats.items()]
+
+        rows = []
+        for name, stats in items:
+            durations = np.asarray(stats['durations']) * 1000
+            quantiles = np.quantile(durations, QUANTILES) if len(durations) else [0.0] * len(QUANTILES)
+            rows.append({
+                'callback': name,
+                'calls': stats['calls'],
+                'errors': stats['errors'],
+                'prevented': stats['prevented'],
+                'p50_ms': round(float(quantiles[0]), 2),
+                'p90_ms': round(float(quantiles[1]), 2),
+                'p99_ms': round(float(quantiles[2]), 2),
+                'max_ms': round(float(durations.max()), 2) if len(durations) else 0.0,
+                'avg_request_kb': round(float(np.mean(stats['request_bytes'])) / 1024, 2) if stats['request_bytes'] else 0.0,
+                'avg_response_kb': round(float(np.mean(stats['response_bytes'])) / 1024, 2) if stats['response_bytes'] else 0.0,
+                'duration_sum': stats['duration_sum'],
+                'request_bytes_sum': stats['request_bytes_sum'],
+                'response_bytes_sum': stats['response_bytes_sum'],
+                'request_bytes': stats['request_bytes'],
+                'response_bytes': stats['response_bytes'],
+                'durations': stats['durations'],
+                'last_error': stats['last_error'],
+            })
+        return sorted(rows, key=lambda row: row['p90_ms'], reverse=True)
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def summary(metric, help_text, values_key, sum_key):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            for row in rows:
+                label = _escape_label(row['callback'])
+                values = np.asarray(row[values_key], dtype=float)
+                for q in QUANTILES:
+                    value = float(np.quantile(values, q)) if len(values) else 0.0
+                    lines.append(f'{metric}{{callback="{label}",quantile="{q}"}} {value:.6g}')
+                lines.append(f'{metric}_sum{{callback="{label}"}} {row[sum_key]:.6g}')
+                lines.append(f'{metric}_count{{callback="{label}"}} {row["calls"]}')
+
+        def counter(metric, help_text, key):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for row in rows:
+                lines.append(f'{metric}{{callback="{_escape_label(row["callback"])}"}} {row[key]}')
+
+        rows = self.snapshot()
+        summary('dash_callback_duration_seconds', 'Dash callback duration in seconds.',
+                'durations', 'duration_sum')
+        summary('dash_callback_request_bytes', 'Size of the callback request payload in bytes.',
+                'request_bytes', 'request_bytes_sum')
+        summary('dash_callback_response_bytes', 'Size of the callback response payload in bytes.',
+                'response_bytes', 'response_bytes_sum')
+        counter('dash_callback_errors_total', 'Callbacks that raised an exception.', 'errors')
+        counter('dash_callback_prevented_total', 'Callbacks that raised PreventUpdate.', 'prevented')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _request_size(args):
+    if has_request_context():
+        return request.content_length or len(request.get_data(cache=True))
+    try:
+        return len(json.dumps(args, default=str))
+    except Exception:
+        return 0
+
+
+def _wrap_callback(func, name, metrics):
+    @functools.wraps(func)
+    def timed_callback(*args, **kwargs):
+        request_bytes = _request_size(args)
+        start = time.perf_counter()
+        try:
+            response = func(*args, **kwargs)
+        except PreventUpdate:
+            metrics.record(name, time.perf_counter() - start, request_bytes, 0, prevented=True)
+            raise
+        except Exception as e:
+            metrics.record(name, time.perf_counter() - start, request_bytes, 0, error=e)
+            raise
+        response_bytes = len(response) if isinstance(response, (str, bytes)) else 0
+        metrics.record(name, time.perf_counter() - start, request_bytes, response_bytes)
+        return response
+
+    timed_callback._callback_metrics = True
+    return timed_callback
+
+
+def instrument_app(app, metrics):
+    """
+    Wrap every callback registered on the Dash app so its calls are recorded in metrics.
+
+    Call this after all callbacks are registered. The wrapped function is the one Dash
+    dispatches to, so the response size is the size of the serialized JSON response.
+    """
+    for output, callback in app.callback_map.items():
+        func = callback.get('callback')
+        if func is None or getattr(func, '_callback_metrics', False):
+            continue
+        name = getattr(func, '__name__', output)
+        callback['callback'] = _wrap_callback(func, name, metrics)
+    return metrics
@@ -3,26 +3,45 @@ from dash import dcc, html, dash_table, Input, Output, State, callback, ctx, no_
 import dash_bootstrap_components as dbc
 import pandas as pd
 import tools
-import importlib
-import plotly.express as px
+import turn_cube
+import standings
+import summer_simulation
+import season_snapshot
+import season_store
+import pdf_store
+import pdf_metadata
+import report_search
+import upload_jobs
+import export_cache
+import api
+import static_export
+import single_flight
+import season_files
+import players
+import member_service
 import os
 from datetime import datetime
 import base64
 import io
 import glob
 import hashlib
-import PyPDF2
-import re
 import json
 import logging
+import threading
+import time
 import dropbox_integration
+import callback_metrics
+import app_logging
 
 from dash.dash_table.Format import Format, Scheme
 from dash.dependencies import ALL
 
-# Set up logging for production debugging
+# Set up logging: per-subsystem levels via LOG_LEVEL / LOG_LEVELS (see app_logging.py)
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+app_logging.configure_logging()
+logger = app_logging.get_logger('app')
+data_logger = app_logging.get_logger('data')
+ui_logger = app_logging.get_logger('ui')
 
 # Dropbox configuration - support both access token and refresh token
 DROPBOX_ACCESS_TOKEN = os.environ.get("DROPBOX_TOKEN", "")
@@ -65,46 +84,24 @@ if USE_DROPBOX:
 else:
     logger.info("No Dropbox credentials found - app cannot function without persistent storage")
 
-importlib.reload(tools)
-
-def sync_pdf_files():
-    """Sync PDF files from Wedstrijdverslagen to assets/Wedstrijdverslagen"""
-    import shutil
-    import glob
-    
-    source_dir = "Wedstrijdverslagen"
-    target_dir = "assets/Wedstrijdverslagen"
-    
-    # Create target directory if it doesn't exist
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
-    
-    # Get all PDF files from source directory
-    source_files = glob.glob(os.path.join(source_dir, "*.pdf"))
-    
-    # Copy each file to target directory
-    for source_file in source_files:
-        filename = os.path.basename(source_file)
-        target_file = os.path.join(target_dir, filename)
-        
-        # Only copy if target doesn't exist or source is newer
-        if not os.path.exists(target_file) or os.path.getmtime(source_file) > os.path.getmtime(target_file):
-            shutil.copy2(source_file, target_file)
-            logger.info(f"Synced: {filename}")
-    
-    logger.info(f"PDF sync complete. {len(source_files)} files processed.")
-
-# Sync PDF files on startup
-sync_pdf_files()
-
 # Global variables to store current data
 df_global = None
 df_gen_info = None
 df_pct_final = None
 df_rp_final = None
 df_pts_final = None
+season_turn_cube = None
+season_standings = None
 current_filename = None
 available_seasons = []
+# Bumped whenever other season views are installed, exports are cached per version
+data_version = 0
+members_version = 0
+# The season views are swapped under this lock all at once; readers that use several of
+# them hold it too, so a request never sees the views of two different seasons
+season_views_lock = threading.RLock()
+# Season loads and Dropbox syncs asked for by several requests at the same time run once
+flights = single_flight.SingleFlight()
 
 # Authentication state
 is_authenticated = False
@@ -136,40 +133,12 @@ def assign_smart_game_numbers(df):
     return df
 
 def extract_date_from_pdf_content(pdf_content):
-    """Extract date from PDF content using PyPDF2"""
+    """Extract date from uploaded PDF content (cached by content, both upload callbacks see the same PDF)"""
     try:
         # Decode base64 content
         content_type, content_string = pdf_content.split(',')
         decoded = base64.b64decode(content_string)
-        
-        # Create a temporary file-like object
-        pdf_file = io.BytesIO(decoded)
-        
-        # Read PDF
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        if len(pdf_reader.pages) > 0:
-            first_page = pdf_reader.pages[0]
-            text = first_page.extract_text()
-            
-            # Look for date pattern: "Clubwedstrijd - COXHYDE, Koksijde - DD/MM/YYYY"
-            # The date is always in DD/MM/YYYY format
-            date_pattern = r'Clubwedstrijd - COXHYDE, Koksijde - (\d{2})/(\d{2})/(\d{4})'
-            match = re.search(date_pattern, text)
-            
-            if match:
-                day, month, year = match.groups()
-                return f"{day}/{month}/{year}"
-            
-            # Fallback: look for any DD/MM/YYYY pattern
-            fallback_pattern = r'(\d{2})/(\d{2})/(\d{4})'
-            fallback_match = re.search(fallback_pattern, text)
-            
-            if fallback_match:
-                day, month, year = fallback_match.groups()
-                return f"{day}/{month}/{year}"
-        
-        return None
+        return pdf_metadata.cached_extract_date(decoded)
         
     except Exception as e:
         logger.error(f"Error extracting date from PDF: {e}")
@@ -179,159 +148,143 @@ def extract_date_from_pdf_content(pdf_content):
 
 # Global variable to track if PDFs have been synced
 _pdfs_synced = False
+# PDF index restored from the season snapshot, served until the PDF sync is done
+_snapshot_pdf_mapping = None
 
-def get_available_pdf_reports():
-    """Scan Wedstrijdverslagen folder and return mapping of dates to PDF files"""
-    global _pdfs_synced
-    pdf_mapping = {}
+def get_available_pdf_reports(allow_snapshot=True):
+    """Return mapping of dates to the PDF reports in the report store (synced from Dropbox once)"""
+    # After a restore from the snapshot its PDF index is used until the background sync is done
+    if allow_snapshot and USE_DROPBOX and not _pdfs_synced and _snapshot_pdf_mapping is not None:
+        return dict(_snapshot_pdf_mapping)
     
-    # Sync PDF files from Dropbox only once during app startup
+    # Sync PDF files from Dropbox only once during app startup, requests arriving during the sync wait for it
     if USE_DROPBOX and not _pdfs_synced:
-        logger.info("Syncing PDF files from Dropbox...")
-        dropbox_manager = dropbox_integration.get_dropbox_manager()
-        if dropbox_manager:
-            # Ensure local directories exist
-            for folder in ["Wedstrijdverslagen", "assets/Wedstrijdverslagen"]:
-                if not os.path.exists(folder):
-                    os.makedirs(folder)
-                    logger.info(f"Created directory: {folder}")
-            
-            # List files in Dropbox
-            dropbox_files = dropbox_manager.list_files()
-            for file_info in dropbox_files:
-                if file_info['name'].endswith('.pdf'):
-                    # Download PDF to local folders
-                    dropbox_path = file_info['path']
-                    local_path = f"Wedstrijdverslagen/{file_info['name']}"
-                    assets_path = f"assets/Wedstrijdverslagen/{file_info['name']}"
-                    
-                    # Download to main folder
-                    if dropbox_manager.download_file(dropbox_path, local_path):
-                        logger.info(f"Downloaded PDF: {file_info['name']}")
-                        
-                        # Also copy to assets folder for web serving
-                        import shutil
-                        try:
-                            shutil.copy2(local_path, assets_path)
-                            logger.info(f"Copied to assets: {file_info['name']}")
-                        except Exception as e:
-                            logger.error(f"Error copying to assets: {e}")
-            
-            # Also check for PDFs in subfolders (Wedstrijdverslagen folder)
-            try:
-                subfolder_result = dropbox_manager.dbx.files_list_folder(f"{dropbox_manager.app_folder}/Wedstrijdverslagen")
-                for entry in subfolder_result.entries:
-                    if hasattr(entry, 'size') and entry.name.endswith('.pdf'):
-                        dropbox_path = entry.path_display
-                        local_path = f"Wedstrijdverslagen/{entry.name}"
-                        assets_path = f"assets/Wedstrijdverslagen/{entry.name}"
-                        
-                        # Download to main folder
-                        if dropbox_manager.download_file(dropbox_path, local_path):
-                            logger.info(f"Downloaded PDF from subfolder: {entry.name}")
-                            
-                            # Also copy to assets folder for web serving
-                            import shutil
-                            try:
-                                shutil.copy2(local_path, assets_path)
-                                logger.info(f"Copied to assets: {entry.name}")
-                            except Exception as e:
-                                logger.error(f"Error copying to assets: {e}")
-            except Exception as e:
-                logger.warning(f"Could not list Wedstrijdverslagen subfolder: {e}")
+        flights.do('pdf-sync', sync_pdf_reports)
+    
+    return report_store.mapping()
+
+def sync_pdf_reports():
+    """Download the PDF reports in Dropbox that are not in the report store yet"""
+    global _pdfs_synced
+    if _pdfs_synced:
+        return
+    logger.info("Syncing PDF files from Dropbox...")
+    dropbox_manager = dropbox_integration.get_dropbox_manager()
+    if dropbox_manager:
+        # PDFs in the app folder and in its Wedstrijdverslagen subfolder
+        dropbox_files = [file_info for file_info in dropbox_manager.list_files() if file_info['name'].endswith('.pdf')]
+        try:
+            subfolder_result = dropbox_manager.dbx.files_list_folder(f"{dropbox_manager.app_folder}/Wedstrijdverslagen")
+            dropbox_files += [{'name': entry.name, 'path': entry.path_display, 'size': entry.size}
+                              for entry in subfolder_result.entries
+                              if hasattr(entry, 'size') and entry.name.endswith('.pdf')]
+        except Exception as e:
+            logger.warning(f"Could not list Wedstrijdverslagen subfolder: {e}")
         
-        # Mark PDFs as synced
-        _pdfs_synced = True
-        logger.info("PDF sync completed")
-    
-    # Now scan local Wedstrijdverslagen folder
-    if not os.path.exists("Wedstrijdverslagen"):
-        logger.warning("Wedstrijdverslagen folder not found")
-        return pdf_mapping
-    
-    for filename in os.listdir("Wedstrijdverslagen"):
-        if filename.endswith('.pdf'):
-            # Parse filename like "zomerwedstrijd 1 van 3-7-25.pdf"
-            try:
-                # Extract date part after "van "
-                if "van " in filename:
-                    date_part = filename.split("van ")[1].replace('.pdf', '')
-                    # Convert to DD/MM/YYYY format
-                    if '-' in date_part:
-                        parts = date_part.split('-')
-                        if len(parts) == 3:
-                            day, month, year = parts
-                            # Handle different year formats
-                            if len(year) == 2:
-                                year = '20' + year
-                            elif len(year) == 4:
-                                year = year
-                            else:
-                                continue  # Skip if year format is unknown
-                            
-                            # Ensure day and month are 2 digits
-                            day = day.zfill(2)
-                            month = month.zfill(2)
-                            
-                            date_str = f"{day}/{month}/{year}"
-                            pdf_mapping[date_str] = filename
-            except Exception as e:
-                logger.error(f"Error parsing PDF filename {filename}: {e}")
+        os.makedirs(report_store.root, exist_ok=True)
+        for file_info in dropbox_files:
+            # Reports that are already stored are not downloaded again
+            if report_store.has(file_info['name'], file_info['size']):
                 continue
+            download_path = os.path.join(report_store.root, file_info['name'] + ".download")
+            if dropbox_manager.download_file(file_info['path'], download_path):
+                try:
+                    date_str = pdf_store.parse_report_date(file_info['name'])
+                    if date_str:
+                        with open(download_path, 'rb') as f:
+                            report_store.add(f.read(), date_str, file_info['name'])
+                        logger.info(f"Downloaded PDF: {file_info['name']}")
+                    else:
+                        logger.warning(f"No date in PDF file name {file_info['name']}, skipped")
+                finally:
+                    os.remove(download_path)
     
-    return pdf_mapping
+    # Mark PDFs as synced
+    _pdfs_synced = True
+    logger.info("PDF sync completed")
+    start_report_tasks()
 
-def get_summer_highlighting_data():
-    """Get highlighting data for summer competition best 5 rule"""
-    if df_global is None or df_global.empty:
-        return []
-    
-    highlighting = []
-    
-    # Get date columns from the pivot table (these are the actual column names in the table)
-    # We need to get this from the pivot table that's used in the Ranking Percent table
+def validate_report_dates():
+    """Compare the date in every stored PDF with the date it is indexed under (taken from the file name)"""
     try:
-        df_rankingpct = tools.make_pivot(df_global, 'Naam', 'Datum', 'Percent')
-        date_columns = df_rankingpct.columns.tolist()
-    except Exception as e:
-        return []
-    
-    # Filter for players with valid classes only (exclude blank/missing classes)
-    valid_classes = ['A', 'B', 'C']
-    df_valid = df_global[df_global['KLASSE'].isin(valid_classes) & df_global['KLASSE'].notna()]
-    
-    for player_name, player_data in df_valid.groupby('Naam'):
-        games_played = len(player_data)
-        
-        if games_played <= 5:
-            # All games count - no highlighting needed
+        start = time.perf_counter()
+        mismatches = pdf_metadata.validate_report_index(report_store.entries(), report_store.object_path)
+        for mismatch in mismatches:
+            logger.warning("PDF report %s is indexed under %s but contains date %s",
+                           mismatch['Bestand'], mismatch['Datum'], mismatch['Datum in PDF'])
+        logger.info("Validated PDF report dates", extra={'mismatches': len(mismatches),
+                                                          'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+    except Exception:
+        logger.exception("Error validating PDF report dates")
+
+def update_report_index():
+    """Add the reports that are not in the search index yet (only new reports are read)"""
+    try:
+        report_index.update(report_store.entries(), report_store.object_path)
+    except Exception:
+        logger.exception("Error updating the report search index")
+
+def run_report_tasks():
+    validate_report_dates()
+    update_report_index()
+
+def start_report_tasks():
+    """Validate the report dates and update the search index in the background, reading all reports takes a while"""
+    threading.Thread(target=run_report_tasks, name="report-tasks", daemon=True).start()
+
+_report_tasks_started = False
+_report_tasks_lock = threading.Lock()
+
+def ensure_report_tasks():
+    """
+    Start the report tasks once, at server start or on the first search (not on import,
+    they read every report). With Dropbox they are started when the reports are synced.
+    """
+    global _report_tasks_started
+    if USE_DROPBOX:
+        return
+    with _report_tasks_lock:
+        if _report_tasks_started:
+            return
+        _report_tasks_started = True
+    start_report_tasks()
+
+def get_report_url(date_str):
+    """URL of the PDF report of a date (content-addressed, so it can be cached forever), or None"""
+    entry = report_store.get(date_str)
+    return f"/reports/{entry['sha256']}.pdf" if entry else None
+
+# Hidden columns of the summer Ranking Percent table, 1 where the game of that date does not count
+SUMMER_MASK_PREFIX = "telt niet "
+
+def get_summer_mask_columns(df):
+    """Return the hidden summer mask columns of a table"""
+    return [col for col in df.columns if isinstance(col, str) and col.startswith(SUMMER_MASK_PREFIX)]
+
+def add_summer_mask_columns(df_pct, df_season):
+    """Append a hidden mask column per date to the summer Ranking Percent table"""
+    mask = tools.summer_dropped_games(df_season)
+    if mask.empty:
+        return df_pct
+    mask = mask.reindex(df_pct['Naam'].astype(str), fill_value=False).astype('int8')
+    mask.columns = [SUMMER_MASK_PREFIX + date for date in mask.columns]
+    mask.index = df_pct.index
+    return pd.concat([df_pct, mask], axis=1)
+
+def get_summer_highlighting_data(df):
+    """Get highlighting data for summer competition best 5 rule: one rule per date with dropped games"""
+    highlighting = []
+    for mask_col in get_summer_mask_columns(df):
+        if not df[mask_col].any():
             continue
-        
-        # Player has 6+ games, need to identify which 5 count
-        game_percentages = (player_data['Totaal'] / player_data['TheoMax'] * 100).fillna(0)
-        
-        # Get the dates of the best 5 games
-        best_5_indices = game_percentages.sort_values(ascending=False).head(5).index
-        best_5_dates = player_data.loc[best_5_indices, 'Datum'].tolist()
-        
-        # Get the dates of games that don't count
-        worst_dates = player_data[~player_data.index.isin(best_5_indices)]['Datum'].tolist()
-        
-        # Add highlighting for games that don't count (gray them out)
-        for date in worst_dates:
-            if date in date_columns:
-                # Use a more robust filter query that handles special characters
-                # Replace problematic characters in player names
-                safe_player_name = player_name.replace("'", "").replace('"', "").replace("\\", "")
-                highlighting.append({
-                    "if": {
-                        "column_id": date,
-                        "filter_query": f"{{Naam}} contains '{safe_player_name}'"
-                    },
-                    "color": "#999999",  # Gray text color
-                    "fontStyle": "italic"  # Italic to indicate non-counting games
-                })
-    
+        highlighting.append({
+            "if": {
+                "column_id": mask_col[len(SUMMER_MASK_PREFIX):],
+                "filter_query": f"{{{mask_col}}} = 1"
+            },
+            "color": "#999999",  # Gray text color
+            "fontStyle": "italic"  # Italic to indicate non-counting games
+        })
     return highlighting
 
 def get_available_seasons():
@@ -386,240 +339,470 @@ def get_current_season_filename():
             end_year = year
         return f'Globaal {start_year}-{end_year}.xlsx'
 
-def load_data_for_season(filename):
-    """Load data from a specific season file"""
-    global df_global, df_gen_info, df_pct_final, df_rp_final, df_pts_final
+def get_current_season_start():
+    """First day of the current season (1 July for the summer competition, 1 September otherwise), as ISO date"""
+    today = datetime.now()
+    if today.month in [7, 8]:
+        return f'{today.year}-07-01'
+    return f'{today.year if today.month >= 9 else today.year - 1}-09-01'
+
+def prepare_season_frame(df_season):
+    """Sort a season frame by date, number the games and convert it to the compact schema"""
+    # Check if Datum_dt already exists, if not create it
+    if 'Datum_dt' not in df_season.columns:
+        df_season['Datum_dt'] = pd.to_datetime(df_season['Datum'], dayfirst=True)
+    else:
+        data_logger.debug("Datum_dt column already exists, using existing values")
+    
+    df_season = df_season.sort_values('Datum_dt').copy()
     
-    print(f"=== DEBUG: Inside load_data_for_season({filename}) ===")
+    # Check if GameNr already exists, if not create it
+    if 'GameNr' not in df_season.columns:
+        # Smart game numbering: preserve original positions when possible
+        df_season = assign_smart_game_numbers(df_season)
+    else:
+        data_logger.debug("GameNr column already exists, using existing values")
+    
+    df_season['Datum'] = df_season['Datum_dt'].dt.strftime('%d/%m/%Y')
+    
+    # Integer player ids from the player registry, every player under their current name
+    df_season = player_registry.identify(df_season)
+    
+    # Class as of the game date from the class history, the class stored with the game before that
+    df_season['KLASSE'] = player_registry.classes_as_of(df_season).fillna(df_season['KLASSE'].astype(object))
+    
+    # Keep the season in the compact schema (categorical names and dates, small integers)
+    return tools.compact_season_frame(df_season)
+
+def read_season_frame(filename):
+    """Read the Globaal sheet of a season workbook and prepare it"""
+    # Try both "Globaal" and "globaal" (case sensitive)
+    try:
+        df_season = pd.read_excel(filename, sheet_name="Globaal")
+    except Exception as e:
+        data_logger.debug("Could not read sheet 'Globaal' from %s (%s), trying 'globaal'", filename, e)
+        df_season = pd.read_excel(filename, sheet_name="globaal")
+    
+    if data_logger.isEnabledFor(logging.DEBUG):
+        data_logger.debug("Read %s: shape %s, columns %s", filename, df_season.shape, list(df_season.columns))
+    
+    return prepare_season_frame(df_season)
+
+def compute_gen_info(df_season, filename):
+    """General info table of a season"""
+    if os.path.basename(filename).startswith('Zomer'):
+        # Use special summer percentage calculation
+        return tools.calculate_summer_percentage(df_season)
+    # Use regular calculation for regular season
+    return tools.give_gen_info(df_season)
+
+def build_season_views(df_season, filename):
+    """Compute all views of a season from its prepared frame"""
+    # Check if this is a summer competition file
+    is_summer = os.path.basename(filename).startswith('Zomer')
+    df_info = compute_gen_info(df_season, filename)
+    
+    df_rankingpct = tools.make_pivot(df_season, 'Naam', 'Datum', 'Percent')
+    # Use the appropriate percentage column based on season type
+    if is_summer:
+        columns_pct = ['Naam', 'Klasse', 'Tot. T. MAX', 'Tot. Score', '% (Alle)', '% (Beste 5)'] 
+        df_pct = tools.process_final_df(df_info, df_rankingpct, columns_pct, '% (Beste 5)')
+        df_pct = add_summer_mask_columns(df_pct, df_season)
+    else:
+        columns_pct = ['Naam', 'Klasse', 'Tot. T. MAX', 'Tot. Score', '%'] 
+        df_pct = tools.process_final_df(df_info, df_rankingpct, columns_pct, '%')
+    df_rp = tools.make_pivot(df_season, 'Naam', 'Datum', 'RP')
+    columns_rp = ['Naam', 'Klasse', 'Gem. RP']
+    df_rankingpts = tools.make_pivot(df_season, 'Naam', 'Datum', 'Punten', True)
+    columns_rankingpts = ['Naam', 'Klasse', 'Tot. punten']
+    views = {
+        'df_global': df_season,
+        'df_gen_info': df_info,
+        'df_pct_final': df_pct,
+        'df_rp_final': tools.process_final_df(df_info, df_rp, columns_rp, 'Gem. RP'),
+        'df_pts_final': tools.process_final_df(df_info, df_rankingpts, columns_rankingpts, 'Tot. punten'),
+        'season_turn_cube': turn_cube.build_turn_cube(df_season),
+        'season_standings': build_season_standings(df_season, filename),
+    }
+    add_movement_columns(views)
+    return views
+
+def build_season_standings(df_season, filename):
+    """Cumulative standings after every game (best-5 rule for a summer season)"""
+    is_summer = os.path.basename(filename).startswith('Zomer')
+    return standings.build_standings(df_season, summer_simulation.SUMMER_BEST_N if is_summer else None)
+
+# Ranking tables: view key, metric they are sorted on
+RANKING_TABLES = {
+    'pct': ('df_pct_final', '%'),
+    'rp': ('df_rp_final', 'Gem. RP'),
+    'pts': ('df_pts_final', 'Tot. punten'),
+}
+MOVEMENT_COLUMN = '±'
+
+def get_ranking_metric(kind, df):
+    metric = RANKING_TABLES[kind][1]
+    return '% (Beste 5)' if metric == '%' and '% (Beste 5)' in df.columns else metric
+
+def insert_movement_column(df, values):
+    df.insert(df.columns.get_loc('Klasse') + 1, MOVEMENT_COLUMN, values)
+
+def add_movement_columns(views):
+    """Add the change of place since the previous game to the ranking tables"""
+    season_standings = views['season_standings']
+    for kind, (key, _) in RANKING_TABLES.items():
+        df = views[key]
+        if season_standings is None or df.empty:
+            continue
+        last_game = len(season_standings.dates) - 1
+        previous_places = season_standings.places(last_game - 1, get_ranking_metric(kind, df))
+        insert_movement_column(df, standings.movement(previous_places, df['Naam']))
+
+def install_season_views(views, filename=None):
+    """Make the views the ones served by the app (and filename the current season, when given)"""
+    global df_global, df_gen_info, df_pct_final, df_rp_final, df_pts_final, season_turn_cube, season_standings, data_version
+    global current_filename
+    with season_views_lock:
+        df_global = views['df_global']
+        df_gen_info = views['df_gen_info']
+        df_pct_final = views['df_pct_final']
+        df_rp_final = views['df_rp_final']
+        df_pts_final = views['df_pts_final']
+        season_turn_cube = views['season_turn_cube']
+        season_standings = views['season_standings']
+        if filename is not None:
+            current_filename = filename
+        data_version += 1
+
+def load_data_for_season(filename):
+    """Load data from a specific season file and make it the current season"""
+    data_logger.debug("Loading season %s", filename)
     
     if not os.path.exists(filename):
-        print(f"=== DEBUG: Season file not found: {filename} ===")
+        data_logger.warning("Season file not found: %s", filename)
         # No data available
-        df_global = pd.DataFrame()
-        df_gen_info = pd.DataFrame()
-        df_pct_final = pd.DataFrame()
-        df_rp_final = pd.DataFrame()
-        df_pts_final = pd.DataFrame()
+        clear_season_data(filename)
         return
     
     try:
-        print(f"=== DEBUG: Loading data from {filename} ===")
-        # Try both "Globaal" and "globaal" (case sensitive)
-        try:
-            df_global = pd.read_excel(filename, sheet_name="Globaal")
-            print(f"=== DEBUG: Successfully read {filename} with {len(df_global)} rows ===")
-        except Exception as e:
-            print(f"=== DEBUG: Error reading with 'Globaal': {e} ===")
-            df_global = pd.read_excel(filename, sheet_name="globaal")
-            print(f"=== DEBUG: Successfully read {filename} with 'globaal' sheet: {len(df_global)} rows ===")
-        
-        print(f"=== DEBUG: Columns in df_global: {list(df_global.columns)} ===")
-        
-        # Check if Datum_dt already exists, if not create it
-        if 'Datum_dt' not in df_global.columns:
-            df_global['Datum_dt'] = pd.to_datetime(df_global['Datum'], dayfirst=True)
-        else:
-            print("=== DEBUG: Datum_dt column already exists, using existing values ===")
-        
-        df_global = df_global.sort_values('Datum_dt').copy()
-        
-        # Check if GameNr already exists, if not create it
-        if 'GameNr' not in df_global.columns:
-            # Smart game numbering: preserve original positions when possible
-            df_global = assign_smart_game_numbers(df_global)
-        else:
-            print("=== DEBUG: GameNr column already exists, using existing values ===")
-        
-        df_global['Datum'] = df_global['Datum_dt'].dt.strftime('%d/%m/%Y')
-        
-        # Check if this is a summer competition file
-        is_summer = filename.startswith('Zomer')
-        
-        if is_summer:
-            # Use special summer percentage calculation
-            df_gen_info = tools.calculate_summer_percentage(df_global)
-        else:
-            # Use regular calculation for regular season
-            df_gen_info = tools.give_gen_info(df_global)
-        
-        df_rankingpct = tools.make_pivot(df_global, 'Naam', 'Datum', 'Percent')
-        # Use the appropriate percentage column based on season type
-        if filename.startswith('Zomer'):
-            columns_pct = ['Naam', 'Klasse', 'Tot. T. MAX', 'Tot. Score', '% (Alle)', '% (Beste 5)'] 
-            df_pct_final = tools.process_final_df(df_gen_info, df_rankingpct, columns_pct, '% (Beste 5)')
-        else:
-            columns_pct = ['Naam', 'Klasse', 'Tot. T. MAX', 'Tot. Score', '%'] 
-            df_pct_final = tools.process_final_df(df_gen_info, df_rankingpct, columns_pct, '%')
-        df_rp = tools.make_pivot(df_global, 'Naam', 'Datum', 'RP')
-        columns_rp = ['Naam', 'Klasse', 'Gem. RP']
-        df_rp_final = tools.process_final_df(df_gen_info, df_rp, columns_rp, 'Gem. RP')
-        df_global['Punten'] = df_global['Punten'].astype('int64')
-        df_rankingpts = tools.make_pivot(df_global, 'Naam', 'Datum', 'Punten', True)
-        columns_rankingpts = ['Naam', 'Klasse', 'Tot. punten']
-        df_pts_final = tools.process_final_df(df_gen_info, df_rankingpts, columns_rankingpts, 'Tot. punten')
-        
-        logger.info(f"Successfully loaded data: {len(df_global)} rows")
-        
-    except Exception as e:
-        logger.error(f"Error loading data from {filename}: {e}")
-        import traceback
-        traceback.print_exc()
+        # The views are built outside the lock, requests keep seeing the previous season meanwhile
+        views = build_season_views(read_season_frame(filename), filename)
+        install_season_views(views, filename)
+        season_aggregate_store.put(filename, views['df_gen_info'])
+        data_logger.info("Loaded season %s", filename, extra={'rows': len(views['df_global'])})
+    except Exception:
+        data_logger.exception("Error loading data from %s", filename)
         # Initialize empty dataframes
-        df_global = pd.DataFrame()
-        df_gen_info = pd.DataFrame()
-        df_pct_final = pd.DataFrame()
-        df_rp_final = pd.DataFrame()
-        df_pts_final = pd.DataFrame()
+        clear_season_data(filename)
+
+def load_season(filename):
+    """Load a season, concurrent requests for the same season share one load"""
+    flights.do(('season', filename), load_data_for_season, filename)
+
+def write_season_file(filename, df_season):
+    """Write a season workbook atomically and invalidate what was cached for the previous content"""
+    global data_version
+    # The compact view frame loses precision (float32) and carries current names and classes:
+    # writes always start from the raw sheet
+    compact = tools.compact_columns(df_season)
+    if compact:
+        raise ValueError(f"Season frame in the compact schema is not written to {filename}: {compact}")
+    # Player ids are only valid in the registry of this app, the workbook keeps the federation numbers
+    written = season_files.write_season(filename, df_season.drop(columns=['Datum_dt', 'GameNr', 'PlayerId'], errors='ignore'))
+    with season_views_lock:
+        data_version += 1
+    return written
+
+def refresh_written_season(filename, df_season, written):
+    """
+    Refresh the views after a write, under the season lock.
+
+    When the season was written again since (another upload or delete), the views are
+    built from the workbook instead, so an older frame never replaces newer views.
+    """
+    with season_files.season_lock(filename):
+        if season_files.signature(filename) != written:
+            data_logger.info("Season %s was written again, refreshing from the file", filename)
+            df_season = None
+        refresh_season(filename, df_season)
 
-def load_current_data():
-    """Load data from the current season file"""
-    global df_global, df_gen_info, df_pct_final, df_rp_final, df_pts_final, current_filename, available_seasons
+def update_member_classes(df_leden):
+    """
+    Take the classes of a member table into the class history and apply class changes.
+
+    A changed class applies from the VANAF date of the member, or else from the start of
+    the current season. The views of the current season are rebuilt from the frame in
+    memory: no season file is read or written.
+    """
+    if not player_registry.update_members(df_leden, get_current_season_start()):
+        return
+    # The stored aggregates of every season may have other classes now
+    season_aggregate_store.invalidate()
+    filename = current_filename
+    if filename is None or df_global is None or df_global.empty:
+        return
+    start = time.perf_counter()
+    with season_files.season_lock(filename):
+        with season_views_lock:
+            if filename != current_filename:
+                return
+            df_season = df_global
+        views = build_season_views(prepare_season_frame(df_season.copy()), filename)
+        install_season_views(views, filename)
+    data_logger.info("Applied class changes to %s", filename, extra={
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+    season_aggregate_store.put(filename, views['df_gen_info'])
+    save_season_snapshot(filename)
+
+def refresh_season(filename, df_season=None):
+    """
+    Rebuild the views after a season file was written, from the frame that was written.
+
+    No Dropbox sync and no Excel read: only the list of seasons is updated, and the
+    views are rebuilt when the changed season is the one being shown (or nothing is shown).
+
+    Args:
+        filename (str): Season workbook that was written.
+        df_season (pd.DataFrame): The season frame as written to the workbook, None to
+            read the workbook (when it was written again since).
+    """
+    global available_seasons
+    available_seasons = get_available_seasons()
     
-    print("=== DEBUG: Inside load_current_data() ===")
+    if filename != current_filename and df_global is not None and not df_global.empty:
+        data_logger.debug("Season %s changed, showing %s, nothing to rebuild", filename, current_filename)
+        return
     
+    try:
+        df_prepared = read_season_frame(filename) if df_season is None else prepare_season_frame(df_season.copy())
+        views = build_season_views(df_prepared, filename)
+        install_season_views(views, filename)
+        season_aggregate_store.put(filename, views['df_gen_info'])
+        data_logger.info("Refreshed season %s", filename, extra={'rows': len(views['df_global'])})
+    except Exception:
+        data_logger.exception("Error refreshing season %s, reloading it", filename)
+        load_season(filename)
+    save_season_snapshot(filename)
+
+def get_persistent_data_dir():
+    """Return the persistent data directory (DATA_DIR when set, else the Render disk on Render and ./data locally)"""
+    if os.environ.get('DATA_DIR'):
+        data_dir = os.environ['DATA_DIR']
+    elif os.environ.get('RENDER'):
+        data_dir = "/opt/render/project/src/data"
+    else:
+        data_dir = os.path.join(os.getcwd(), "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+# Player dimension: integer ids keyed by federation number, with name aliases, class history and club
+player_registry = players.PlayerRegistry(os.path.join(get_persistent_data_dir(), players.REGISTRY_FILENAME))
+
+# Player aggregates per season file, for comparing seasons without loading them
+season_aggregate_store = season_store.SeasonStore(os.path.join(get_persistent_data_dir(), "season_store"))
+
+# Match reports, stored once by content; the reports shipped in Wedstrijdverslagen are indexed on startup
+report_store = pdf_store.PdfStore(os.path.join(get_persistent_data_dir(), "pdf_store"))
+report_store.import_folder("Wedstrijdverslagen")
+# Full-text search over the match reports
+report_index = report_search.ReportIndex(os.path.join(get_persistent_data_dir(), "report_index"))
+
+def clear_season_data(filename=None):
+    """Reset the season views to empty dataframes"""
+    install_season_views({
+        'df_global': pd.DataFrame(),
+        'df_gen_info': pd.DataFrame(),
+        'df_pct_final': pd.DataFrame(),
+        'df_rp_final': pd.DataFrame(),
+        'df_pts_final': pd.DataFrame(),
+        'season_turn_cube': None,
+        'season_standings': None,
+    }, filename)
+
+def sync_season_files():
+    """Download all season files from Dropbox, returns True when at least one file was synced"""
+    # A sync asked for while one is running waits for that one instead of downloading everything again
+    return flights.do('season-sync', download_season_files)
+
+def download_season_files():
     # For online app, we MUST have Dropbox for persistent storage
     if not USE_DROPBOX:
         logger.error("No Dropbox integration available - app cannot function without persistent storage")
-        # Initialize with empty data and show error message
-        df_global = pd.DataFrame()
-        df_gen_info = pd.DataFrame()
-        df_pct_final = pd.DataFrame()
-        df_rp_final = pd.DataFrame()
-        df_pts_final = pd.DataFrame()
-        return
+        return False
     
     # Sync with Dropbox - this is required for online app
     logger.info("Syncing Excel files from Dropbox...")
     try:
         dropbox_manager = dropbox_integration.get_dropbox_manager()
-        if dropbox_manager:
-            # Dynamically discover all season files from Dropbox
-            all_files = dropbox_manager.list_files()
-            season_files = []
-            
-            # Look for Globaal and Zomer files
-            for file_info in all_files:
-                filename = file_info['name']
-                if (filename.startswith('Globaal ') and filename.endswith('.xlsx')) or \
-                   (filename.startswith('Zomer ') and filename.endswith('.xlsx')):
-                    season_files.append(filename)
-            
-            logger.info(f"Found season files in Dropbox: {season_files}")
-            
-            # Sync all discovered season files
-            synced_files = dropbox_manager.sync_excel_files(season_files)
-            logger.info(f"Synced {len(synced_files)} files from Dropbox: {synced_files}")
-            
-            if not synced_files:
-                logger.error("No season files synced from Dropbox - app cannot function")
-                # Initialize with empty data
-                df_global = pd.DataFrame()
-                df_gen_info = pd.DataFrame()
-                df_pct_final = pd.DataFrame()
-                df_rp_final = pd.DataFrame()
-                df_pts_final = pd.DataFrame()
-                return
-        else:
+        if not dropbox_manager:
             logger.error("Dropbox manager not available - app cannot function")
-            # Initialize with empty data
-            df_global = pd.DataFrame()
-            df_gen_info = pd.DataFrame()
-            df_pct_final = pd.DataFrame()
-            df_rp_final = pd.DataFrame()
-            df_pts_final = pd.DataFrame()
-            return
+            return False
+        
+        # Dynamically discover all season files from Dropbox
+        all_files = dropbox_manager.list_files()
+        season_files = []
+        
+        # Look for Globaal and Zomer files
+        for file_info in all_files:
+            filename = file_info['name']
+            if (filename.startswith('Globaal ') and filename.endswith('.xlsx')) or \
+               (filename.startswith('Zomer ') and filename.endswith('.xlsx')):
+                season_files.append(filename)
+        
+        logger.info(f"Found season files in Dropbox: {season_files}")
+        
+        # Sync all discovered season files
+        synced_files = dropbox_manager.sync_excel_files(season_files)
+        logger.info(f"Synced {len(synced_files)} files from Dropbox: {synced_files}")
+        
+        if not synced_files:
+            logger.error("No season files synced from Dropbox - app cannot function")
+            return False
+        return True
     except Exception as e:
         logger.error(f"Dropbox sync error: {e} - app cannot function without data")
-        # Initialize with empty data
-        df_global = pd.DataFrame()
-        df_gen_info = pd.DataFrame()
-        df_pct_final = pd.DataFrame()
-        df_rp_final = pd.DataFrame()
-        df_pts_final = pd.DataFrame()
-        return
+        return False
+
+def resolve_season_file():
+    """Update the available seasons and return the file of the current season (None when there is none)"""
+    global available_seasons
     
     # Get available seasons
     available_seasons = get_available_seasons()
-    print(f"=== DEBUG: Available seasons: {[s['value'] for s in available_seasons]} ===")
+    data_logger.debug("Available seasons: %s", [s['value'] for s in available_seasons])
     
-    current_filename = get_current_season_filename()
-    print(f"=== DEBUG: Current filename determined: {current_filename} ===")
+    # The file only becomes the current season when its views are installed
+    filename = get_current_season_filename()
+    data_logger.debug("Current season filename: %s", filename)
     
     # Check if current season file exists
-    if os.path.exists(current_filename):
-        filename = current_filename
-        print(f"=== DEBUG: Using current season file: {filename} ===")
-    elif available_seasons:
+    if os.path.exists(filename):
+        data_logger.debug("Using current season file: %s", filename)
+        return filename
+    if available_seasons:
         filename = available_seasons[0]["value"]
-        current_filename = filename
-        print(f"=== DEBUG: Using first available season: {filename} ===")
-    else:
-        print("=== DEBUG: No data files found - initializing with empty data ===")
+        data_logger.info("Current season file not found, using first available season: %s", filename)
+        return filename
+    data_logger.warning("No data files found - initializing with empty data")
+    return None
+
+def load_current_data():
+    """Load data from the current season file"""
+    data_logger.debug("Loading current season data")
+    
+    if not sync_season_files():
+        # Initialize with empty data and show error message
+        clear_season_data()
+        return
+    
+    filename = resolve_season_file()
+    if filename is None:
         # No data available
-        df_global = pd.DataFrame()
-        df_gen_info = pd.DataFrame()
-        df_pct_final = pd.DataFrame()
-        df_rp_final = pd.DataFrame()
-        df_pts_final = pd.DataFrame()
+        clear_season_data()
         return
     
-    print(f"=== DEBUG: About to load data from: {filename} ===")
-    load_data_for_season(filename)
+    load_season(filename)
+    save_season_snapshot(filename)
 
-# Debug: Check what files exist
-print("=== DEBUG: Checking files ===")
-print(f"Current directory: {os.getcwd()}")
-files = os.listdir('.')
-excel_files = [f for f in files if f.endswith('.xlsx')]
-print(f"Excel files found: {excel_files}")
+def save_season_snapshot(filename):
+    """Store the computed views of the current season so a restart can serve them immediately"""
+    pdf_mapping = get_available_pdf_reports()
+    with season_views_lock:
+        # Another season may have been installed meanwhile, its views are not the ones of filename
+        if df_global is None or df_global.empty or filename != current_filename:
+            return
+        views = {
+            'df_global': df_global,
+            'df_gen_info': df_gen_info,
+            'df_pct_final': df_pct_final,
+            'df_rp_final': df_rp_final,
+            'df_pts_final': df_pts_final,
+            'pdf_mapping': pdf_mapping,
+            'games': df_global.drop_duplicates('Datum')[['GameNr', 'Datum']].to_dict('records'),
+            'available_seasons': available_seasons,
+        }
+    # The snapshot holds PlayerIds, the registry is written with the ids it refers to
+    player_registry.save()
+    season_snapshot.save_snapshot(get_persistent_data_dir(), filename, views,
+                                  season_snapshot.file_hash(filename))
 
-for file in excel_files:
-    if os.path.exists(file):
-        print(f"  {file} exists ({os.path.getsize(file)} bytes)")
+def restore_season_snapshot():
+    """Install the views of the stored snapshot, returns the snapshot or None when there is none"""
+    global available_seasons, _snapshot_pdf_mapping
+    
+    snapshot = season_snapshot.load_snapshot(get_persistent_data_dir())
+    if snapshot is None:
+        return None
+    
+    views = snapshot['views']
+    install_season_views(dict(views, season_turn_cube=turn_cube.build_turn_cube(views['df_global']),
+                              season_standings=build_season_standings(views['df_global'], snapshot['season_filename'])),
+                         snapshot['season_filename'])
+    _snapshot_pdf_mapping = views['pdf_mapping']
+    available_seasons = views['available_seasons']
+    data_logger.info("Restored snapshot of %s", current_filename, extra={'rows': len(df_global)})
+    return snapshot
+
+def validate_season_snapshot(snapshot):
+    """Sync the season files and reload the current season when the snapshot is out of date"""
+    try:
+        if not sync_season_files() and not os.path.exists(snapshot['season_filename']):
+            # Without the source files the snapshot is the best data there is
+            data_logger.warning("Could not validate snapshot, serving snapshot of %s", snapshot['season_filename'])
+            return
+        
+        # Download the PDF reports, from then on the local folder is used instead of the snapshot
+        pdf_mapping = get_available_pdf_reports(allow_snapshot=False)
+        
+        filename = resolve_season_file()
+        if filename is None:
+            return
+        
+        if not season_snapshot.is_valid(snapshot, filename, season_snapshot.file_hash(filename)):
+            data_logger.info("Snapshot is out of date, reloading %s", filename)
+            load_season(filename)
+            save_season_snapshot(filename)
+        elif pdf_mapping != snapshot['views']['pdf_mapping']:
+            save_season_snapshot(filename)
+        else:
+            data_logger.info("Snapshot of %s is up to date", filename)
+    except Exception:
+        data_logger.exception("Error validating snapshot")
+
+def log_workbook_scan():
+    """Log the workbooks in the working directory and their sheets (diagnostics, opens every file)"""
+    startup_logger = app_logging.get_logger('startup')
+    startup_logger.debug("Current directory: %s", os.getcwd())
+    for file in sorted(f for f in os.listdir('.') if f.endswith('.xlsx')):
         try:
-            xl = pd.ExcelFile(file)
-            print(f"    Sheets: {xl.sheet_names}")
+            sheets = pd.ExcelFile(file).sheet_names
+            startup_logger.debug("Workbook %s (%s bytes), sheets: %s", file, os.path.getsize(file), sheets)
         except Exception as e:
-            print(f"    Error reading: {e}")
+            startup_logger.debug("Workbook %s could not be read: %s", file, e)
+
+# The workbook scan is only done when startup debugging is enabled (LOG_LEVELS=startup=DEBUG)
+if app_logging.get_logger('startup').isEnabledFor(logging.DEBUG):
+    log_workbook_scan()
 
-# Load initial data
-print("=== DEBUG: About to call load_current_data() ===")
+# Load initial data: serve the snapshot of the last run immediately and check it against
+# the season files in the background, without a snapshot load the season the slow way
 try:
-    load_current_data()
-    print("=== DEBUG: load_current_data() completed successfully ===")
-except Exception as e:
-    print(f"=== DEBUG: Error in load_current_data(): {e} ===")
-    import traceback
-    print(f"=== DEBUG: Traceback: {traceback.format_exc()} ===")
+    _startup_snapshot = restore_season_snapshot()
+    if _startup_snapshot is not None:
+        threading.Thread(target=validate_season_snapshot, args=(_startup_snapshot,),
+                         name="snapshot-validation", daemon=True).start()
+    else:
+        load_current_data()
+except Exception:
+    data_logger.exception("Error in load_current_data()")
 
 # Member management functions
-def load_member_data():
-    """Load member data from Dropbox Leden.xlsx file"""
-    try:
-        if USE_DROPBOX:
-            dropbox_manager = dropbox_integration.get_dropbox_manager()
-            if dropbox_manager:
-                # Use the same sync method that works for other files
-                synced_files = dropbox_manager.sync_excel_files(['Leden.xlsx'])
-                if synced_files and 'Leden.xlsx' in synced_files:
-                    if os.path.exists('Leden.xlsx'):
-                        df_leden = pd.read_excel('Leden.xlsx', sheet_name="Leden")
-                        # Handle different possible column names
-                        if 'NAAM' in df_leden.columns:
-                            df_leden.rename(columns={'NAAM': 'Naam'}, inplace=True)
-                        if 'CLUB' not in df_leden.columns and 'Club' in df_leden.columns:
-                            df_leden.rename(columns={'Club': 'CLUB'}, inplace=True)
-                        if 'KLASSE' not in df_leden.columns and 'Klasse' in df_leden.columns:
-                            df_leden.rename(columns={'Klasse': 'KLASSE'}, inplace=True)
-                        
-                        logger.info(f"Loaded {len(df_leden)} members from Dropbox Leden.xlsx")
-                        return df_leden
-    except Exception as e:
-        logger.error(f"Error loading member data from Dropbox: {e}")
-    
-    # Fallback: no data available
-    logger.warning("No member data available")
-    return pd.DataFrame()
+def install_member_table(df_members):
+    """Make a new member table the current one (called by the member service when a source changed)"""
+    global df_leden, members_version
+    df_leden = df_members
+    members_version += 1
+    update_member_classes(df_members)
 
 def save_member_data(df):
     """Save member data to JSON file"""
@@ -632,11 +815,19 @@ def save_member_data(df):
         logger.error(f"Error saving members.json: {e}")
         return False
 
-# Load member data
-df_leden = load_member_data()
-logger.info(f"Loaded {len(df_leden)} members from data source")
+# Member table of Leden.xlsx (Dropbox) and Info.xlsx, checked for changes in the background;
+# Leden.xlsx is managed by the admins and comes first when the two disagree
+df_leden = pd.DataFrame()
+member_data = member_service.MemberService(
+    [member_service.MemberSource('Leden.xlsx', in_dropbox=True), member_service.MemberSource('Info.xlsx')],
+    get_dropbox=lambda: dropbox_integration.get_dropbox_manager() if USE_DROPBOX else None,
+    on_change=install_member_table)
+member_data.check()
+member_data.start()
+logger.info("Loaded %s members from data source", len(df_leden))
 if not df_leden.empty:
-    logger.info(f"Member data loaded: {df_leden.head(3).to_dict('records')}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Member data loaded: %s", df_leden.head(3).to_dict('records'))
 else:
     logger.warning("No member data loaded - check if Leden.xlsx exists in Dropbox")
 
@@ -647,17 +838,21 @@ def make_table(df, table_id, title, klasse_filter_id=None):
             html.P("Geen data beschikbaar", className="text-muted")
         ])
     
+    # Summer mask columns stay in the data (for the highlighting rules) but are not shown
+    mask_columns = get_summer_mask_columns(df)
+    visible_columns = [col for col in df.columns if col not in mask_columns]
+    
     int_cols = [
         'Tot. T. MAX', 'Tot. Score', 'Tot. punten', 'Wedstrijden', 'Scrabbles',
         "Solo's", 'S.scr', 'Nulscores', 'Tot. beurten', 'Max. scores'
     ]
-    float_cols = [col for col in df.columns if pd.api.types.is_float_dtype(df[col]) and col not in int_cols]
+    float_cols = [col for col in visible_columns if pd.api.types.is_float_dtype(df[col]) and col not in int_cols]
 
     if "Gem. RP" in df.columns:
         df["Gem. RP"] = pd.to_numeric(df["Gem. RP"], errors="coerce").astype(float)
 
     columns = []
-    for col in df.columns:
+    for col in visible_columns:
         if col in int_cols:
             columns.append({
                 "name": col,
@@ -693,7 +888,7 @@ def make_table(df, table_id, title, klasse_filter_id=None):
         {"if": {"column_id": "Naam"}, "textAlign": "left", "fontWeight": "bold", "width": "240px", "maxWidth": "240px", "whiteSpace": "nowrap"},
         {"if": {"column_id": "Klasse"}, "textAlign": "center", "fontWeight": "bold", "width": "60px"},
     ]
-    for col in df.columns:
+    for col in visible_columns:
         if col in int_cols or col in float_cols or col in ['%', '% (Alle)', '% (Beste 5)', 'Gem. RP', 'Tot. punten']:
             style_cell_conditional.append({
                 "if": {"column_id": col},
@@ -724,14 +919,16 @@ def make_table(df, table_id, title, klasse_filter_id=None):
         {"if": {"row_index": "even"}, "backgroundColor": "#fff9c4"},
     ]
 
+    # Places won and lost since the previous game
+    if MOVEMENT_COLUMN in df.columns:
+        style_data_conditional.extend([
+            {"if": {"column_id": MOVEMENT_COLUMN, "filter_query": f'{{{MOVEMENT_COLUMN}}} contains "▲"'}, "color": "#2e7d32"},
+            {"if": {"column_id": MOVEMENT_COLUMN, "filter_query": f'{{{MOVEMENT_COLUMN}}} contains "▼"'}, "color": "#c62828"},
+        ])
+
     # Add summer rule highlighting for Ranking Percent table
-    if table_id == "table-pct" and current_filename and current_filename.startswith('Zomer'):
-        try:
-            summer_highlighting = get_summer_highlighting_data()
-            if summer_highlighting:
-                style_data_conditional.extend(summer_highlighting)
-        except Exception as e:
-            pass
+    if table_id == "table-pct" and mask_columns:
+        style_data_conditional.extend(get_summer_highlighting_data(df))
 
     button_group = []
     if klasse_filter_id:
@@ -785,13 +982,57 @@ def make_table(df, table_id, title, klasse_filter_id=None):
         dash_table.DataTable(**datatable_kwargs)
     ], className="mb-4")
 
-def make_graphs_tab(df_global):
-    if df_global.empty:
-        return html.Div([
-            html.H3("Grafieken", className="mb-4", style={"color": "#2c3e50"}),
-            html.P("Geen data beschikbaar voor grafieken", className="text-muted")
-        ])
-    
+def get_ranking_as_of(kind, date_str=None):
+    """
+    Ranking table ('pct', 'rp' or 'pts') as it stood after the game of date_str.
+
+    The aggregates come from the cumulative standings, the game columns after that
+    date are left blank; without a date (or for the last game) the current table.
+    """
+    with season_views_lock:
+        df_final = globals()[RANKING_TABLES[kind][0]]
+        g = season_standings.game_index(date_str) if season_standings is not None and date_str else None
+        if g is None or g == len(season_standings.dates) - 1 or df_final.empty:
+            return df_final
+    
+        mask_columns = get_summer_mask_columns(df_final)
+        date_columns = [col for col in df_final.columns if col in season_standings.dates]
+        aggregate_columns = [col for col in df_final.columns
+                             if col not in date_columns and col not in mask_columns and col != MOVEMENT_COLUMN]
+        metric = get_ranking_metric(kind, df_final)
+    
+        df_asof = season_standings.table(g)
+        # Same order as the current table: metric descending, ties alphabetical
+        df_asof = df_asof.sort_values(metric, ascending=False, kind='stable', na_position='last')[aggregate_columns]
+        df_asof = df_asof.merge(df_final[['Naam'] + date_columns], on='Naam', how='left')
+        for col in date_columns[g + 1:]:
+            df_asof[col] = ''
+        insert_movement_column(df_asof, standings.movement(season_standings.places(g - 1, metric), df_asof['Naam']))
+        df_asof.index = range(1, len(df_asof) + 1)
+        if mask_columns:
+            df_asof = add_summer_mask_columns(df_asof, df_global[df_global['GameNr'] <= season_standings.game_numbers[g]])
+        return df_asof
+
+def make_standings_selector(kind):
+    """Dropdown to show a ranking as it stood after an earlier game"""
+    if season_standings is None:
+        return ""
+    options = [{"label": f"Wedstrijd {nr} - {date}", "value": date}
+               for nr, date in zip(season_standings.game_numbers, season_standings.dates)][::-1]
+    return html.Div([
+        html.Label("Stand na:", style={"fontWeight": "bold", "marginRight": "10px"}),
+        dcc.Dropdown(
+            id=f"standings-asof-{kind}",
+            options=options,
+            value=options[0]["value"],
+            clearable=False,
+            style={"width": "260px"}
+        )
+    ], className="mb-3", style={"display": "flex", "alignItems": "center"})
+
+def make_season_figures(df_global, turn_cube=None):
+    """Bar charts of the graphs tab: players per game and theoretical maximum per game (from the turn cube of df_global when given)"""
+    import plotly.express as px
     df_filtered = df_global[~df_global['Naam'].str.upper().eq('MAXIMUM')].copy()
     turn_columns = [col for col in df_filtered.columns if col.startswith('B') and col[1:].isdigit()]
 
@@ -810,12 +1051,18 @@ def make_graphs_tab(df_global):
     fig_players.update_traces(texttemplate='%{text:.0f}')
 
     # 2. Bar chart: Theoretical maximum per game
-    theo_max_per_game = (
-        df_filtered.groupby('GameNr')[turn_columns]
-        .max()
-        .sum(axis=1)
-        .reset_index(name='TheoMax')
-    )
+    if turn_cube is not None:
+        theo_max_per_game = pd.DataFrame({
+            'GameNr': turn_cube.game_numbers,
+            'TheoMax': turn_cube.max.sum(axis=1, dtype='int64')
+        })
+    else:
+        theo_max_per_game = (
+            df_filtered.groupby('GameNr')[turn_columns]
+            .max()
+            .sum(axis=1)
+            .reset_index(name='TheoMax')
+        )
     fig_max = px.bar(
         theo_max_per_game,
         x='GameNr',
@@ -827,6 +1074,17 @@ def make_graphs_tab(df_global):
         text_auto=True
     )
     fig_max.update_traces(texttemplate='%{text:.0f}')
+    return fig_players, fig_max
+
+def make_graphs_tab(df_global, turn_cube=None):
+    if df_global.empty:
+        return html.Div([
+            html.H3("Grafieken", className="mb-4", style={"color": "#2c3e50"}),
+            html.P("Geen data beschikbaar voor grafieken", className="text-muted")
+        ])
+    
+    df_filtered = df_global[~df_global['Naam'].str.upper().eq('MAXIMUM')]
+    fig_players, fig_max = make_season_figures(df_global, turn_cube)
 
     # 3. Line chart: Scores of selected players per game
     player_options = [
@@ -850,7 +1108,161 @@ def make_graphs_tab(df_global):
                 style={"width": "100%", "marginBottom": "20px"}
             ),
             dcc.Graph(id="score-player-graph")
+        ]),
+        make_ranking_evolution_section(),
+        make_hardest_turns_section()
+    ])
+
+# Rankings that can be followed in the ranking evolution chart: label, ranking table
+RANKING_EVOLUTION_OPTIONS = [("Ranking Percent", "pct"), ("Ranking RP", "rp"), ("Ranking Punten", "pts")]
+# Built ranking evolution figures per (data version, ranking table), used under season_views_lock
+ranking_evolution_figures = {}
+
+def make_ranking_evolution_section():
+    """Bump chart of the place of every player after every game"""
+    if season_standings is None:
+        return ""
+    return html.Div([
+        html.H4("Verloop van de ranking", className="mb-3 mt-4", style={"color": "#2c3e50"}),
+        html.P("Plaats van elke speler na elke wedstrijd. Gebruik de schuifbalk of ▶ om het seizoen af te spelen.",
+               className="text-muted"),
+        dcc.Dropdown(
+            id="ranking-evolution-dropdown",
+            options=[{"label": label, "value": kind} for label, kind in RANKING_EVOLUTION_OPTIONS],
+            value="pct",
+            clearable=False,
+            style={"width": "260px", "marginBottom": "10px"}
+        ),
+        dcc.Graph(id="ranking-evolution-graph")
+    ])
+
+def make_ranking_evolution_figure(season_standings, metric, title):
+    """
+    Bump chart with an animation frame per game, from the place matrix of the standings.
+
+    WebGL traces (one per player) keep it smooth with the whole field; frame k holds only
+    the places up to game k, the figure starts at the last game. The figure is built as a
+    plain dict: with a frame per game, validating every trace object takes seconds.
+    """
+    ranks = season_standings.ranks(metric)
+    game_numbers = season_standings.game_numbers.tolist()
+    n_games, n_players = ranks.shape
+    # JSON has no NaN: games before the first game of a player are gaps (None)
+    places = [[None if pd.isna(place) else int(place) for place in ranks[:, p]] for p in range(n_players)]
+    hover = [f"Wedstrijd {nr} - {date}" for nr, date in zip(game_numbers, season_standings.dates)]
+
+    data = [{
+        "type": "scattergl",
+        "x": game_numbers,
+        "y": places[p],
+        "mode": "lines+markers",
+        "name": str(season_standings.players[p]),
+        "text": hover,
+        "hovertemplate": "%{fullData.name}<br>%{text}<br>Plaats %{y}<extra></extra>",
+        "connectgaps": False,
+    } for p in range(n_players)]
+    # Frames only carry the coordinates, the other trace attributes stay as they are
+    frames = [{
+        "name": str(nr),
+        "data": [{"x": game_numbers[:g + 1], "y": places[p][:g + 1]} for p in range(n_players)],
+        "traces": list(range(n_players)),
+    } for g, nr in enumerate(game_numbers)]
+
+    animation = {"frame": {"duration": 400, "redraw": True}, "transition": {"duration": 0}, "mode": "immediate"}
+    layout = {
+        "title": {"text": title},
+        "height": max(450, 22 * n_players + 150),
+        "xaxis": {"title": {"text": "Wedstrijdnummer"}, "range": [game_numbers[0] - 0.5, game_numbers[-1] + 0.5], "dtick": 1},
+        "yaxis": {"title": {"text": "Plaats"}, "range": [n_players + 0.5, 0.5], "dtick": 1},
+        "legend": {"itemclick": "toggleothers"},
+        "updatemenus": [{
+            "type": "buttons",
+            "showactive": False,
+            "x": 0, "y": -0.12, "xanchor": "left", "yanchor": "top",
+            "buttons": [
+                {"label": "▶", "method": "animate", "args": [None, dict(animation, fromcurrent=False)]},
+                {"label": "❚❚", "method": "animate", "args": [[None], {"frame": {"duration": 0, "redraw": False}, "mode": "immediate"}]},
+            ],
+        }],
+        "sliders": [{
+            "active": n_games - 1,
+            "x": 0.08, "y": -0.12, "len": 0.92, "xanchor": "left", "yanchor": "top",
+            "currentvalue": {"prefix": "Na wedstrijd "},
+            "steps": [{"label": str(nr), "method": "animate", "args": [[str(nr)], animation]} for nr in game_numbers],
+        }],
+    }
+    return {"data": data, "layout": layout, "frames": frames}
+
+
+def make_hardest_turns_section():
+    """Table with the hardest turns of the season, answered from the turn cube"""
+    if season_turn_cube is None:
+        return ""
+    
+    df_hardest = season_turn_cube.hardest_turns(10)
+    return html.Div([
+        html.H4("Moeilijkste beurten van het seizoen", className="mb-3 mt-4", style={"color": "#2c3e50"}),
+        html.P("Beurten met het laagste gemiddelde percentage van de maximumscore.", className="text-muted"),
+        dash_table.DataTable(
+            id="hardest-turns-table",
+            columns=[{"name": col, "id": col} for col in df_hardest.columns],
+            data=df_hardest.to_dict("records"),
+            style_table={"overflowX": "auto"},
+            style_cell={
+                "padding": "8px",
+                "fontFamily": "Arial",
+                "fontSize": "14px",
+                "border": "1px solid #bdc3c7",
+                "textAlign": "center"
+            },
+            style_header={
+                "fontWeight": "bold",
+                "backgroundColor": "#2c3e50",
+                "color": "white",
+                "textAlign": "center"
+            },
+            style_data_conditional=[
+                {"if": {"row_index": "odd"}, "backgroundColor": "#f2f2f2"},
+                {"if": {"row_index": "even"}, "backgroundColor": "#fff9c4"},
+            ]
+        )
+    ])
+
+def make_simulation_tab():
+    if not (current_filename and current_filename.startswith('Zomer')) or df_global is None or df_global.empty:
+        return html.Div([
+            html.H3("Zomer simulatie", className="mb-4", style={"color": "#2c3e50"}),
+            html.P("De simulatie is enkel beschikbaar voor een zomercompetitie.", className="text-muted")
         ])
+    
+    games_played = df_global['Datum'].nunique()
+    remaining = max(summer_simulation.SUMMER_TOTAL_GAMES - games_played, 0)
+    return html.Div([
+        html.H3("Zomer simulatie", className="mb-4", style={"color": "#2c3e50"}),
+        html.P(f"Nog {remaining} van de {summer_simulation.SUMMER_TOTAL_GAMES} wedstrijden te spelen. "
+               f"De resterende wedstrijden worden duizenden keren gesimuleerd op basis van de eerdere resultaten van elke speler.",
+               className="text-muted mb-3"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Klasse:", style={"fontWeight": "bold"}),
+                dcc.Dropdown(
+                    id="sim-klasse-dropdown",
+                    options=[{"label": "Alle", "value": "Alle"}] + [{"label": klasse, "value": klasse} for klasse in standings.VALID_CLASSES],
+                    value="Alle",
+                    clearable=False
+                )
+            ], md=3),
+            dbc.Col([
+                html.Label("Doel (plaats):", style={"fontWeight": "bold"}),
+                dcc.Dropdown(
+                    id="sim-target-dropdown",
+                    options=[{"label": f"Top {i}", "value": i} for i in range(1, 11)],
+                    value=3,
+                    clearable=False
+                )
+            ], md=3),
+        ], className="mb-3"),
+        html.Div(id="sim-result")
     ])
 
 def make_upload_tab():
@@ -882,6 +1294,10 @@ def make_upload_tab():
         ),
         html.Div(id="upload-extra-form"),
         html.Div(id="upload-status", className="mt-3"),
+        html.Div(id="upload-job-status", className="mt-2"),
+        html.Button("Opnieuw proberen", id="upload-job-retry-btn", className="btn btn-warning mb-3", style={"display": "none"}),
+        dcc.Store(id="upload-job-store"),
+        dcc.Interval(id="upload-job-poll", interval=1000, disabled=True),
         
         # PDF Upload Section
         html.Hr(className="my-4"),
@@ -959,8 +1375,8 @@ def make_management_tab():
                 html.Li("📁 Open het Leden.xlsx bestand in je Dropbox folder"),
                 html.Li("📝 Bewerk de leden direct in Excel"),
                 html.Li("💾 Sla het bestand op in Dropbox"),
-                html.Li("🔄 Ververs de app om de wijzigingen te zien"),
-                html.Li("⚠️ Wijzig alleen klassen aan het begin van een nieuw seizoen")
+                html.Li("🔄 Wijzigingen worden binnen een minuut ingelezen, of meteen met 'Ververs leden data'"),
+                html.Li("📅 Een gewijzigde klasse geldt vanaf het begin van het huidige seizoen, of vanaf de datum in een kolom VANAF")
             ], className="text-muted mb-3")
         ]),
         
@@ -972,7 +1388,18 @@ def make_management_tab():
         
         html.Div(id="member-table-container"),
         
-        html.Div(id="member-management-status", className="mt-3")
+        html.Div(id="member-management-status", className="mt-3"),
+        
+        html.Hr(className="my-4"),
+        
+        # Callback performance metrics (admin only)
+        html.H4("⏱️ Prestaties", className="mb-3", style={"color": "#2c3e50"}),
+        html.P("Duur en payload-grootte van de callbacks sinds de laatste herstart (percentielen over de laatste oproepen).", className="text-muted mb-3"),
+        html.Button("Ververs statistieken", id="refresh-metrics-btn", className="btn btn-primary mb-3"),
+        html.Div(id="callback-metrics-container"),
+        html.H5("Geheugen", className="mt-4 mb-2", style={"color": "#2c3e50"}),
+        html.P("Gemeten geheugengebruik van de ingeladen seizoensgegevens.", className="text-muted mb-3"),
+        html.Div(id="memory-report-container")
     ])
 
 def get_season_filename(date_str):
@@ -997,6 +1424,105 @@ app = dash.Dash(__name__, external_stylesheets=[
     "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
 ], suppress_callback_exceptions=True, assets_folder='assets')
 
+# Timing and payload-size statistics for every callback, see instrument_app() at the bottom
+metrics = callback_metrics.CallbackMetrics()
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+@app.server.route("/reports/<sha256>.pdf")
+def serve_report(sha256):
+    """Serve a stored PDF report; supports range requests and conditional GET (ETag = content hash)"""
+    from flask import abort, send_file
+    path = report_store.find(sha256)
+    if path is None:
+        abort(404)
+    response = send_file(path, mimetype="application/pdf", conditional=True, etag=sha256, max_age=31536000)
+    # The URL contains the content hash, so the file behind it never changes
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def get_api_state():
+    """Views served by the read-only API, read together with the data version they belong to"""
+    with season_views_lock:
+        tables = {}
+        if df_global is not None and not df_global.empty:
+            tables = {
+                'overview': df_gen_info,
+                'percent': df_pct_final.drop(columns=get_summer_mask_columns(df_pct_final)),
+                'rp': df_rp_final,
+                'punten': df_pts_final,
+                'games': api.public_games(df_global),
+            }
+        return {
+            'version': data_version,
+            'season': current_filename,
+            'seasons': [season['value'] for season in available_seasons],
+            'tables': tables,
+        }
+
+# Read-only JSON/CSV API under /api
+api.register(app.server, get_api_state)
+
+# Static HTML/JSON bundle of the current season, for members who only read the standings
+static_site_dir = os.path.join(get_persistent_data_dir(), "static_site")
+_static_site_lock = threading.Lock()
+
+def publish_static_site():
+    """Render the rankings, graphs and report links of the current season to the static bundle"""
+    with _static_site_lock:
+        try:
+            with season_views_lock:
+                season, version = current_filename, data_version
+                views = {'overview': df_gen_info, 'percent': df_pct_final, 'rp': df_rp_final,
+                         'punten': df_pts_final, 'games': df_global, 'turn_cube': season_turn_cube}
+            # Only the views read under the lock from here on: df_global may be another season by now
+            if views['games'] is None or views['games'].empty:
+                return
+            reports = []
+            for date_str in views['games'].drop_duplicates('Datum').sort_values('GameNr')['Datum']:
+                entry = report_store.get(date_str)
+                if entry:
+                    reports.append({'date': date_str, 'filename': entry['filename'],
+                                    'path': report_store.object_path(entry['sha256'])})
+            tables = {name: view for name, view in views.items() if name != 'turn_cube'}
+            tables['games'] = api.public_games(views['games'])
+            static_export.build_bundle(static_site_dir, season, version, tables,
+                                       list(make_season_figures(views['games'], views['turn_cube'])),
+                                       reports, SUMMER_MASK_PREFIX)
+        except Exception:
+            logger.exception("Error building the static site")
+
+def start_static_site_build():
+    threading.Thread(target=publish_static_site, name="static-site", daemon=True).start()
+
+@app.server.route("/site/")
+@app.server.route("/site/<path:filename>")
+def serve_static_site(filename="index.html"):
+    """The static bundle; works just as well from any file server pointed at data/static_site"""
+    from flask import send_from_directory
+    response = send_from_directory(static_site_dir, filename)
+    # Revalidate every time, the bundle changes after an upload
+    response.cache_control.no_cache = True
+    return response
+
+# The bundle is rebuilt after every upload; build it now when there is none for the season being served
+if df_global is not None and not df_global.empty:
+    _static_manifest = static_export.read_manifest(static_site_dir)
+    if _static_manifest is None or _static_manifest['season'] != current_filename:
+        start_static_site_build()
+
+@app.server.route("/metrics")
+def prometheus_metrics():
+    """Prometheus text endpoint with the callback metrics, only with METRICS_TOKEN set (not found otherwise)"""
+    import hmac
+    from flask import Response, abort, request
+    if not METRICS_TOKEN:
+        abort(404)
+    token = request.args.get("token") or request.headers.get("Authorization", "").replace("Bearer ", "")
+    if not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return Response("Forbidden\n", status=403, mimetype="text/plain")
+    return Response(metrics.to_prometheus(), mimetype="text/plain; version=0.0.4")
+
 
 
 # Add print styles
@@ -1070,6 +1596,8 @@ app.layout = dbc.Container([
         dcc.Tab(label="Ranking RP", value="tab-rp", className="tab-label"),
         dcc.Tab(label="Ranking Punten", value="tab-pts", className="tab-label"),
         dcc.Tab(label="Grafieken", value="tab-graphs", className="tab-label"),
+        dcc.Tab(label="Zomer simulatie", value="tab-sim", className="tab-label"),
+        dcc.Tab(label="Seizoenen vergelijken", value="tab-compare", className="tab-label"),
         dcc.Tab(label="Upload", value="tab-upload", className="tab-label", disabled=True),
         dcc.Tab(label="Beheer", value="tab-management", className="tab-label", disabled=True),
     ], className="mb-4"),
@@ -1128,25 +1656,9 @@ def refresh_seasons(n_clicks):
     if n_clicks:
         logger.info("Refreshing seasons from Dropbox...")
         try:
-            # Re-run the Dropbox sync logic
-            dropbox_manager = dropbox_integration.get_dropbox_manager()
-            if dropbox_manager:
-                # Dynamically discover all season files from Dropbox
-                all_files = dropbox_manager.list_files()
-                season_files = []
-                
-                # Look for Globaal and Zomer files
-                for file_info in all_files:
-                    filename = file_info['name']
-                    if (filename.startswith('Globaal ') and filename.endswith('.xlsx')) or \
-                       (filename.startswith('Zomer ') and filename.endswith('.xlsx')):
-                        season_files.append(filename)
-                
-                logger.info(f"Found season files in Dropbox: {season_files}")
-                
-                # Sync all discovered season files
-                synced_files = dropbox_manager.sync_excel_files(season_files)
-                logger.info(f"Synced {len(synced_files)} files from Dropbox: {synced_files}")
+            # Re-run the Dropbox sync, clicks during a running sync wait for that one
+            if USE_DROPBOX:
+                sync_season_files()
             
             # Get updated available seasons
             return get_available_seasons()
@@ -1162,13 +1674,19 @@ def refresh_seasons(n_clicks):
      Input("season-selector", "value")],
 )
 def render_tab(tab, selected_season):
-    global df_global, df_gen_info, df_pct_final, df_rp_final, df_pts_final, current_filename
-    
     # Load data for selected season if it changed
     if selected_season and selected_season != current_filename:
-        current_filename = selected_season
-        load_data_for_season(selected_season)
+        load_season(selected_season)
     
+    if tab == "tab-info":
+        # The PDF sync downloads, it is done before the views are locked
+        get_available_pdf_reports()
+    # A season installed meanwhile is swapped in before or after this tab is built, never halfway
+    with season_views_lock:
+        return render_tab_content(tab)
+
+def render_tab_content(tab):
+    """Tab content built from the current season views"""
     if tab == "tab-info":
         # Get unique games for the current season
         if df_global is not None and not df_global.empty:
@@ -1195,7 +1713,19 @@ def render_tab(tab, selected_season):
                         style={"marginBottom": "20px"}
                     ),
                     html.Div(id="selected-game-pdf", className="mt-3")
-                ])
+                ]),
+                html.Div([
+                    html.Label("Zoek in alle verslagen (woord, speler, ...):", className="mb-2"),
+                    dcc.Input(
+                        id="report-search-input",
+                        type="search",
+                        debounce=True,
+                        placeholder="Bv. ZEEROOF of Torreele",
+                        className="form-control",
+                        style={"maxWidth": "400px"}
+                    ),
+                    html.Div(id="report-search-results", className="mt-2")
+                ], className="mt-4")
             ])
         else:
             pdf_section = ""
@@ -1203,29 +1733,25 @@ def render_tab(tab, selected_season):
         return html.Div([
             html.Div([
                 html.Button("Download Excel", id="download-info-btn", className="btn btn-success me-2"),
+                html.Button("Download volledig seizoen", id="download-season-btn", className="btn btn-outline-success me-2"),
                 html.Button("Print", id="print-info-btn", className="btn btn-primary", 
                           **{"data-print": "true"}),
             ], className="mb-3"),
             dcc.Download(id="download-info-xlsx"),
+            dcc.Download(id="download-season-xlsx"),
             make_table(df_gen_info, "table-info", "Globaal Overzicht"),
             pdf_section
         ])
     elif tab == "tab-pct":
-        # Add error handling for Ranking Percent tab
-        import logging
-        logging.info("=== DEBUG: Entering tab-pct rendering ===")
-        logging.info(f"=== DEBUG: df_pct_final is {'None' if df_pct_final is None else 'not None'}")
-        if df_pct_final is not None:
-            logging.info(f"=== DEBUG: df_pct_final shape: {df_pct_final.shape}")
-            logging.info(f"=== DEBUG: df_pct_final empty: {df_pct_final.empty}")
-        logging.info(f"=== DEBUG: current_filename: {current_filename}")
-        logging.info(f"=== DEBUG: df_global is {'None' if df_global is None else 'not None'}")
-        if df_global is not None:
-            logging.info(f"=== DEBUG: df_global shape: {df_global.shape}")
+        if ui_logger.isEnabledFor(logging.DEBUG):
+            ui_logger.debug("Rendering tab-pct", extra={
+                'season': current_filename,
+                'pct_shape': None if df_pct_final is None else df_pct_final.shape,
+                'global_shape': None if df_global is None else df_global.shape,
+            })
         
         try:
             if df_pct_final is None or df_pct_final.empty:
-                logging.info("=== DEBUG: df_pct_final is None or empty, returning error message ===")
                 return html.Div([
                     html.H3("Ranking Percent", className="mb-3", style={"color": "#2c3e50"}),
                     html.P("Geen data beschikbaar voor Ranking Percent", className="text-muted"),
@@ -1234,7 +1760,6 @@ def render_tab(tab, selected_season):
                     html.P(f"df_global shape: {df_global.shape if df_global is not None else 'None'}", className="text-danger")
                 ])
             else:
-                logging.info("=== DEBUG: df_pct_final exists, trying to create table ===")
                 return html.Div([
                     html.Div([
                         html.Button("Download Excel", id="download-pct-btn", className="btn btn-success me-2"),
@@ -1242,13 +1767,12 @@ def render_tab(tab, selected_season):
                                   **{"data-print": "true"}),
                     ], className="mb-3"),
                     dcc.Download(id="download-pct-xlsx"),
+                    make_standings_selector("pct"),
                     make_table(df_pct_final, "table-pct", "Ranking Percent", "filter-pct"),
                     html.Div(id="drilldown-content", className="mt-4")
                 ])
         except Exception as e:
-            logging.error(f"=== DEBUG: Exception in tab-pct: {str(e)} ===")
-            import traceback
-            logging.error(f"=== DEBUG: Full traceback: {traceback.format_exc()} ===")
+            ui_logger.exception("Error rendering tab-pct")
             return html.Div([
                 html.H3("Ranking Percent", className="mb-3", style={"color": "#2c3e50"}),
                 html.P(f"Fout bij het laden van Ranking Percent: {str(e)}", className="text-danger"),
@@ -1263,6 +1787,7 @@ def render_tab(tab, selected_season):
                           **{"data-print": "true"}),
             ], className="mb-3"),
             dcc.Download(id="download-rp-xlsx"),
+            make_standings_selector("rp"),
             make_table(df_rp_final, "table-rp", "Ranking RP", "filter-rp")
         ])
     elif tab == "tab-pts":
@@ -1273,27 +1798,54 @@ def render_tab(tab, selected_season):
                           **{"data-print": "true"}),
             ], className="mb-3"),
             dcc.Download(id="download-pts-xlsx"),
+            make_standings_selector("pts"),
             make_table(df_pts_final, "table-pts", "Ranking Punten", "filter-pts")
         ])
     elif tab == "tab-graphs":
-        return make_graphs_tab(df_global)
+        with season_views_lock:
+            df_season, cube = df_global, season_turn_cube
+        return make_graphs_tab(df_season, cube)
+    elif tab == "tab-sim":
+        return make_simulation_tab()
+    elif tab == "tab-compare":
+        return make_compare_tab()
     elif tab == "tab-upload":
         return make_upload_tab()
     elif tab == "tab-management":
         return make_management_tab()
     return "Onbekend tabblad"
 
-# Excel export callbacks for each table
-def dataframe_to_xlsx_bytes(df):
-    import io
-    output = io.BytesIO()
-    df.to_excel(output, index=False)
-    output.seek(0)
-    return output.read()
-
+# Excel export callbacks for each table, the workbooks are built once per data version
+exports = export_cache.ExportCache()
+
+def get_export_sheets():
+    """Sheets of every season export, from the views of the current data version"""
+    return {
+        'Overzicht': df_gen_info,
+        'Percent': df_pct_final.drop(columns=get_summer_mask_columns(df_pct_final)),
+        'RP': df_rp_final,
+        'Punten': df_pts_final,
+        # The published games table, without internal ids like PlayerId
+        'Wedstrijden': api.public_games(df_global),
+    }
 
+def get_season_export(name, sheet_names):
+    """Export bytes of the current season with the given sheets, cached per data version"""
+    with season_views_lock:
+        version, sheets, filename = data_version, get_export_sheets(), current_filename
+    return exports.get(f"{name}-{filename}", version,
+                       lambda: export_cache.workbook_bytes({sheet: sheets[sheet] for sheet in sheet_names}))
 
+def get_full_season_filename():
+    return f"Seizoen_{os.path.basename(current_filename or 'onbekend').replace('.xlsx', '')}.xlsx"
 
+def prebuild_full_season_export():
+    """Build the full season export in the background, after an upload the first download is then instant"""
+    with season_views_lock:
+        if df_global is None or df_global.empty:
+            return
+        version, sheets, filename = data_version, get_export_sheets(), current_filename
+    exports.prebuild(f"season-{filename}", version, lambda: export_cache.workbook_bytes(sheets))
 
 @app.callback(
     Output("download-info-xlsx", "data"),
@@ -1301,9 +1853,15 @@ def dataframe_to_xlsx_bytes(df):
     prevent_initial_call=True,
 )
 def download_info(n):
-    def writer(buf):
-        df_gen_info.to_excel(buf, index=False)
-    return dcc.send_bytes(writer, "Globaal_Overzicht.xlsx")
+    return dcc.send_bytes(get_season_export("info", ['Overzicht']), "Globaal_Overzicht.xlsx")
+
+@app.callback(
+    Output("download-season-xlsx", "data"),
+    Input("download-season-btn", "n_clicks"),
+    prevent_initial_call=True,
+)
+def download_season(n):
+    return dcc.send_bytes(get_season_export("season", list(get_export_sheets())), get_full_season_filename())
 
 @app.callback(
     Output("download-pct-xlsx", "data"),
@@ -1311,9 +1869,7 @@ def download_info(n):
     prevent_initial_call=True,
 )
 def download_pct(n):
-    def writer(buf):
-        df_pct_final.to_excel(buf, index=False)
-    return dcc.send_bytes(writer, "Ranking_Percent.xlsx")
+    return dcc.send_bytes(get_season_export("pct", ['Percent']), "Ranking_Percent.xlsx")
 
 @app.callback(
     Output("download-rp-xlsx", "data"),
@@ -1321,9 +1877,7 @@ def download_pct(n):
     prevent_initial_call=True,
 )
 def download_rp(n):
-    def writer(buf):
-        df_rp_final.to_excel(buf, index=False)
-    return dcc.send_bytes(writer, "Ranking_RP.xlsx")
+    return dcc.send_bytes(get_season_export("rp", ['RP']), "Ranking_RP.xlsx")
 
 @app.callback(
     Output("download-pts-xlsx", "data"),
@@ -1331,76 +1885,82 @@ def download_rp(n):
     prevent_initial_call=True,
 )
 def download_pts(n):
-    def writer(buf):
-        df_pts_final.to_excel(buf, index=False)
-    return dcc.send_bytes(writer, "Ranking_Punten.xlsx")
+    return dcc.send_bytes(get_season_export("pts", ['Punten']), "Ranking_Punten.xlsx")
 
 @app.callback(
     Output("table-pct", "data"),
     [Input("filter-pct-A", "n_clicks"),
      Input("filter-pct-B", "n_clicks"),
-     Input("filter-pct-All", "n_clicks")],
+     Input("filter-pct-All", "n_clicks"),
+     Input("standings-asof-pct", "value")],
     State("table-pct", "data"),
     prevent_initial_call=True
 )
-def filter_klasse_pct(n_a, n_b, n_all, current_data):
+def filter_klasse_pct(n_a, n_b, n_all, asof_date, current_data):
     ctx = dash.callback_context
+    df_ranking = get_ranking_as_of("pct", asof_date)
     if not ctx.triggered:
-        return df_pct_final.to_dict("records")
+        return df_ranking.to_dict("records")
     button_id = ctx.triggered[0]["prop_id"].split(".")[0]
     if button_id.endswith("-A"):
-        return df_pct_final[df_pct_final["Klasse"] == "A"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "A"].to_dict("records")
     elif button_id.endswith("-B"):
-        return df_pct_final[df_pct_final["Klasse"] == "B"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "B"].to_dict("records")
     else:
-        return df_pct_final.to_dict("records")
+        return df_ranking.to_dict("records")
 
 @app.callback(
     Output("table-rp", "data"),
     [Input("filter-rp-A", "n_clicks"),
      Input("filter-rp-B", "n_clicks"),
-     Input("filter-rp-All", "n_clicks")],
+     Input("filter-rp-All", "n_clicks"),
+     Input("standings-asof-rp", "value")],
     State("table-rp", "data"),
     prevent_initial_call=True
 )
-def filter_klasse_rp(n_a, n_b, n_all, current_data):
+def filter_klasse_rp(n_a, n_b, n_all, asof_date, current_data):
     ctx = dash.callback_context
+    df_ranking = get_ranking_as_of("rp", asof_date)
     if not ctx.triggered:
-        return df_rp_final.to_dict("records")
+        return df_ranking.to_dict("records")
     button_id = ctx.triggered[0]["prop_id"].split(".")[0]
     if button_id.endswith("-A"):
-        return df_rp_final[df_rp_final["Klasse"] == "A"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "A"].to_dict("records")
     elif button_id.endswith("-B"):
-        return df_rp_final[df_rp_final["Klasse"] == "B"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "B"].to_dict("records")
     else:
-        return df_rp_final.to_dict("records")
+        return df_ranking.to_dict("records")
 
 @app.callback(
     Output("table-pts", "data"),
     [Input("filter-pts-A", "n_clicks"),
      Input("filter-pts-B", "n_clicks"),
-     Input("filter-pts-All", "n_clicks")],
+     Input("filter-pts-All", "n_clicks"),
+     Input("standings-asof-pts", "value")],
     State("table-pts", "data"),
     prevent_initial_call=True
 )
-def filter_klasse_pts(n_a, n_b, n_all, current_data):
+def filter_klasse_pts(n_a, n_b, n_all, asof_date, current_data):
     ctx = dash.callback_context
+    df_ranking = get_ranking_as_of("pts", asof_date)
     if not ctx.triggered:
-        return df_pts_final.to_dict("records")
+        return df_ranking.to_dict("records")
     button_id = ctx.triggered[0]["prop_id"].split(".")[0]
     if button_id.endswith("-A"):
-        return df_pts_final[df_pts_final["Klasse"] == "A"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "A"].to_dict("records")
     elif button_id.endswith("-B"):
-        return df_pts_final[df_pts_final["Klasse"] == "B"].to_dict("records")
+        return df_ranking[df_ranking["Klasse"] == "B"].to_dict("records")
     else:
-        return df_pts_final.to_dict("records")
+        return df_ranking.to_dict("records")
 
 @app.callback(
     Output("drilldown-content", "children"),
     Input("table-pct", "active_cell"),
     State("table-pct", "data"),
+    State("standings-asof-pct", "value"),
 )
-def update_drilldown(active_cell, table_data):
+def update_drilldown(active_cell, table_data, asof_date=None):
+    import plotly.express as px
     if not active_cell or not table_data:
         return ""
     
@@ -1412,59 +1972,23 @@ def update_drilldown(active_cell, table_data):
     player_name = table_data[row_idx]['Naam']
     column_name = list(table_data[row_idx].keys())[col_idx]
     
-    # Only show drilldown for date columns (not for player name, class, etc.)
-    if column_name in ['Naam', 'Klasse', 'Tot. T. MAX', 'Tot. Score', '%']:
+    with season_views_lock:
+        cube, season = season_turn_cube, season_standings
+    # Only show drilldown for the game (date) columns, not for the name, class, totals, ± etc.
+    if season is None or season.game_index(column_name) is None:
+        return ""
+    # A ranking as it stood after an earlier game shows no later games
+    asof_index = season.game_index(asof_date) if asof_date else None
+    if asof_index is not None and season.game_index(column_name) > asof_index:
         return ""
     
-    # Extract date from column name (assuming format like "05/09/2024")
     try:
         date_str = column_name
-        # Find the game data for this player and date
-        game_data = df_global[(df_global['Naam'] == player_name) & (df_global['Datum'] == date_str)]
-        
-        if game_data.empty:
+        # Turn scores and per-turn maxima come from the precomputed turn cube
+        if cube is None or cube.game_index(date_str) is None or cube.player_index(player_name) is None:
             return html.Div(f"Geen data gevonden voor {player_name} op {date_str}.")
         
-        # Get the single row for this player and date
-        game_row = game_data.iloc[0]
-        
-        # Get turn columns (B1, B2, B3, etc.) and sort them properly
-        turn_columns = [col for col in df_global.columns if col.startswith('B') and col[1:].isdigit()]
-        turn_columns.sort(key=lambda x: int(x[1:]))  # Sort by turn number (B1, B2, B3, etc.)
-        
-        # Filter to only include turns that have data for this player
-        available_turns = []
-        for turn_col in turn_columns:
-            if turn_col in game_row and pd.notna(game_row[turn_col]):
-                available_turns.append(turn_col)
-        
-        # Get maximum scores for each turn from the same game
-        # Since MAXIMUM row is removed during processing, we need to get max scores differently
-        # Get all data for this specific date/game
-        game_data_all = df_global[df_global['Datum'] == date_str]
-        
-        # Calculate maximum scores for each turn from all players in this game
-        max_scores = {}
-        for turn_col in turn_columns:
-            if turn_col in game_data_all.columns:
-                # Get the maximum score for this turn from all players in this game
-                max_score = game_data_all[turn_col].max()
-                if pd.notna(max_score):
-                    max_scores[turn_col] = max_score
-        
-        # Create turn-by-turn data
-        turn_data = []
-        for turn_col in available_turns:
-            player_score = game_row[turn_col]
-            max_score = max_scores.get(turn_col, 0)
-            percentage = (player_score / max_score * 100) if max_score > 0 else 0
-            
-            turn_data.append({
-                'Beurt': turn_col,
-                'Score': player_score,
-                'Max Score': max_score,
-                'Percentage': round(percentage, 2)
-            })
+        turn_data = cube.player_turns(player_name, date_str).to_dict('records')
         
         if not turn_data:
             last_drilldown_turn_data = None
@@ -1546,11 +2070,35 @@ def update_drilldown(active_cell, table_data):
     except Exception as e:
         return html.Div(f"Fout bij het laden van de data: {e}")
 
+@app.callback(
+    Output("ranking-evolution-graph", "figure"),
+    Input("ranking-evolution-dropdown", "value"),
+)
+def update_ranking_evolution(kind):
+    import plotly.express as px
+    # The version, the standings and the table must be of the same season, and the cache is
+    # shared by the request threads: all under the lock (building a figure takes a few ms)
+    with season_views_lock:
+        if season_standings is None or not kind:
+            return px.line(title="Geen data beschikbaar")
+        # The figure only changes with the season data, so it is built once per data version
+        key = (data_version, kind)
+        if key not in ranking_evolution_figures:
+            df_final = globals()[RANKING_TABLES[kind][0]]
+            label = dict((kind, label) for label, kind in RANKING_EVOLUTION_OPTIONS)[kind]
+            # Figures of older data are dropped
+            for old_key in [k for k in ranking_evolution_figures if k[0] != data_version]:
+                del ranking_evolution_figures[old_key]
+            ranking_evolution_figures[key] = make_ranking_evolution_figure(
+                season_standings, get_ranking_metric(kind, df_final), f"Verloop {label}")
+        return ranking_evolution_figures[key]
+
 @app.callback(
     Output("score-player-graph", "figure"),
     Input("score-player-dropdown", "value"),
 )
 def update_score_line_chart(selected_players):
+    import plotly.express as px
     if df_global.empty:
         return px.line(title="Geen data beschikbaar")
     
@@ -1607,6 +2155,113 @@ def update_score_line_chart(selected_players):
     fig.update_layout(yaxis_tickformat='.2f')
     return fig
 
+@app.callback(
+    Output("sim-result", "children"),
+    [Input("sim-klasse-dropdown", "value"),
+     Input("sim-target-dropdown", "value")],
+)
+def update_summer_simulation(klasse, target_place):
+    with season_views_lock:
+        df_season = df_global
+    if df_season is None or df_season.empty:
+        return ""
+    
+    df_sim = df_season if klasse in (None, "Alle") else df_season[df_season['KLASSE'] == klasse]
+    # The games of the competition, also those no player of the class played
+    df_result = summer_simulation.simulate_summer_standings(df_sim, target_place=target_place or 3,
+                                                            games_so_far=df_season['Datum'].nunique())
+    if df_result.empty:
+        return html.P("Geen spelers om te simuleren", className="text-muted")
+    
+    # Only show the first places, the full distribution is too wide for the screen
+    place_columns = [col for col in df_result.columns if col.startswith('Plaats ')]
+    df_result = df_result.drop(columns=place_columns[max(target_place or 3, 5):])
+    return make_table(df_result, "table-sim", "Kans op eindplaats (%)")
+
+def make_compare_tab():
+    season_options = available_seasons or get_available_seasons()
+    if not season_options:
+        return html.Div([
+            html.H3("Seizoenen vergelijken", className="mb-4", style={"color": "#2c3e50"}),
+            html.P("Geen seizoenen beschikbaar.", className="text-muted")
+        ])
+    
+    return html.Div([
+        html.H3("Seizoenen vergelijken", className="mb-4", style={"color": "#2c3e50"}),
+        html.P("Vergelijk de resultaten van de spelers over meerdere seizoenen. "
+               "Δ is het verschil met het vorige gekozen seizoen.", className="text-muted mb-3"),
+        dbc.Row([
+            dbc.Col([
+                html.Label("Seizoenen:", style={"fontWeight": "bold"}),
+                dcc.Dropdown(
+                    id="compare-seasons-dropdown",
+                    options=season_options,
+                    value=sorted((season["value"] for season in season_options), key=season_store.season_sort_key)[-2:],
+                    multi=True
+                )
+            ], md=6),
+            dbc.Col([
+                html.Label("Vergelijk op:", style={"fontWeight": "bold"}),
+                dcc.Dropdown(
+                    id="compare-metric-dropdown",
+                    options=[{"label": metric, "value": metric} for metric in season_store.METRICS],
+                    value="%",
+                    clearable=False
+                )
+            ], md=3),
+        ], className="mb-3"),
+        html.Div(id="compare-result")
+    ])
+
+def get_season_aggregates(filename):
+    """Player aggregates of a season from the store, computed once per version of the file"""
+    return season_aggregate_store.get(filename, lambda f: compute_gen_info(read_season_frame(f), f))
+
+@app.callback(
+    Output("compare-result", "children"),
+    [Input("compare-seasons-dropdown", "value"),
+     Input("compare-metric-dropdown", "value")],
+)
+def update_season_comparison(seasons, metric):
+    if not seasons:
+        return html.P("Kies een of meer seizoenen.", className="text-muted")
+    
+    labels = {season["value"]: season["label"] for season in (available_seasons or get_available_seasons())}
+    aggregates = {}
+    # Oldest season first, so Δ is the change from one season to the next
+    for filename in sorted(seasons, key=season_store.season_sort_key):
+        df_aggregates = get_season_aggregates(filename)
+        if df_aggregates is not None:
+            aggregates[labels.get(filename, filename)] = df_aggregates
+    if not aggregates:
+        return html.P("Geen gegevens voor de gekozen seizoenen.", className="text-muted")
+    
+    children = [make_table(season_store.compare_seasons(aggregates, metric), "table-compare", f"Vergelijking: {metric}")]
+    if len(aggregates) >= 2:
+        before, after = list(aggregates)[-2:]
+        df_deltas = season_store.season_deltas(aggregates[before], aggregates[after])
+        children.append(make_table(df_deltas, "table-compare-delta", f"Verschil {before} → {after}"))
+    return html.Div(children)
+
+def read_uploaded_csv(decoded):
+    """Parse an uploaded Uitgebreid CSV, trying several encodings and separators (None when it can not be decoded)"""
+    encodings = ['utf-8', 'iso-8859-1', 'windows-1252', 'cp1252']
+    for encoding in encodings:
+        try:
+            decoded_str = decoded.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        # Try semicolon separator first
+        try:
+            return pd.read_csv(io.StringIO(decoded_str), sep=';')
+        except Exception:
+            # Try comma separator
+            try:
+                return pd.read_csv(io.StringIO(decoded_str), sep=',')
+            except Exception:
+                continue
+    return None
+
 @app.callback(
     Output('upload-extra-form', 'children'),
     [Input('upload-csv', 'contents')],
@@ -1618,27 +2273,7 @@ def handle_csv_upload(contents, filename):
     content_type, content_string = contents.split(',')
     decoded = base64.b64decode(content_string)
     try:
-        # Try to read as CSV with different encodings
-        df = None
-        encodings = ['utf-8', 'iso-8859-1', 'windows-1252', 'cp1252']
-        
-        for encoding in encodings:
-            try:
-                decoded_str = decoded.decode(encoding)
-                # Try semicolon separator first
-                try:
-                    df = pd.read_csv(io.StringIO(decoded_str), sep=';')
-                    break
-                except Exception:
-                    # Try comma separator
-                    try:
-                        df = pd.read_csv(io.StringIO(decoded_str), sep=',')
-                        break
-                    except Exception:
-                        continue
-            except UnicodeDecodeError:
-                continue
-        
+        df = read_uploaded_csv(decoded)
         if df is None:
             return f'Fout bij het lezen van het CSV-bestand: Kan het bestand niet decoderen met ondersteunde encodings (utf-8, windows-1252, iso-8859-1, cp1252)'
             
@@ -1669,152 +2304,204 @@ def handle_csv_upload(contents, filename):
     ])
     return form
 
-@app.callback(
-    Output('upload-status', 'children'),
-    [Input('upload-date-picker-visible', 'date')],
-    [State('upload-csv', 'contents'), State('upload-csv', 'filename')]
-)
-def process_upload(date, contents, filename):
-    if not date or not contents:
-        return ''
-    
-    try:
-        # Convert date from ISO to DD/MM/YYYY
-        dt = datetime.strptime(date[:10], '%Y-%m-%d')
-        date_str = dt.strftime('%d/%m/%Y')
-        logger.info(f"Processing upload for date: {date_str}")
-        
-        # Read uploaded CSV
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
+# Upload pipeline stages, run in the background by upload_runner. Each stage reads and
+# extends the job context; a StageError message is shown to the user.
+def upload_validate(context):
+    """Decode the CSV, take the current members and check the season file for a duplicate date"""
+    date_str = context['date_str']
+    # A retry of a job that failed later in this stage has the parsed CSV already
+    if 'df' not in context:
+        content_type, content_string = context['contents'].split(',')
         try:
-            # Try to read as CSV with different encodings
-            df = None
-            encodings = ['utf-8', 'iso-8859-1', 'windows-1252', 'cp1252']
-            
-            for encoding in encodings:
-                try:
-                    decoded_str = decoded.decode(encoding)
-                    # Try semicolon separator first
-                    try:
-                        df = pd.read_csv(io.StringIO(decoded_str), sep=';')
-                        break
-                    except Exception:
-                        # Try comma separator
-                        try:
-                            df = pd.read_csv(io.StringIO(decoded_str), sep=',')
-                            break
-                        except Exception:
-                            continue
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
-                logger.error("CSV read error: Could not decode with any supported encoding")
-                return f'Fout bij het lezen van het CSV-bestand: Kan het bestand niet decoderen met ondersteunde encodings (utf-8, windows-1252, iso-8859-1, cp1252)'
-                
+            df = read_uploaded_csv(base64.b64decode(content_string))
         except Exception as e:
-            logger.error(f"CSV read error: {e}")
-            return f'Fout bij het lezen van het CSV-bestand: {e}'
-        
-        # Read supporting Excel file for leden
-        global df_leden  # Move global declaration to the top
+            raise upload_jobs.StageError(f'Fout bij het lezen van het CSV-bestand: {e}')
+        if df is None:
+            raise upload_jobs.StageError('Fout bij het lezen van het CSV-bestand: Kan het bestand niet decoderen met ondersteunde encodings (utf-8, windows-1252, iso-8859-1, cp1252)')
+        if 'Ntsvnr' in df.columns:
+            # The CSV reader turns '0548' into 548, the member table and the registry have '0548'
+            df['Ntsvnr'] = df['Ntsvnr'].map(players.normalize_ntsvnr)
+        context['df'] = df
+        # The (base64) upload is not needed anymore once it is parsed
+        del context['contents']
+    df = context['df']
+    
+    # Members of Leden.xlsx and Info.xlsx, kept current by the member service
+    context['df_leden'] = member_data.table()
+    if context['df_leden'].empty:
+        logger.warning("No member data, the classes of the players stay empty")
+    
+    # Always determine the season filename based on the uploaded date
+    context['season_filename'] = get_season_filename(date_str)
+    read_season_for_upload(context)
+    return f"{len(df)} rijen, {context['season_filename']}"
+
+def read_season_for_upload(context):
+    """Read the season the game is added to, check it for the date and number the game"""
+    season_filename = context['season_filename']
+    date_str = context['date_str']
+    # Recorded before the read: when the file changes after it, the upload reads it again
+    context['season_signature'] = season_files.signature(season_filename)
+    
+    # Check for duplicates and assign volgnummer
+    if os.path.exists(season_filename):
         try:
-            if os.path.exists('Info.xlsx'):
-                df_leden = pd.read_excel('Info.xlsx', sheet_name='Leden')
-                df_leden.rename(columns={'NAAM': 'Naam'}, inplace=True)
-            else:
-                # Use global member data if Info.xlsx doesn't exist
-                logger.warning("Info.xlsx not found, using global member data")
-                # df_leden is already global, so we can use it directly
+            df_season = pd.read_excel(season_filename, sheet_name='Globaal')
         except Exception as e:
-            logger.error(f"Error reading member data: {e}")
-            return f'Fout bij het lezen van leden data: {e}'
-        
-        # Always determine the season filename based on the uploaded date
-        season_filename = get_season_filename(date_str)
-        logger.info(f"Season filename: {season_filename}")
-        
-        # Check for duplicates and assign volgnummer
-        if os.path.exists(season_filename):
-            try:
-                df_season = pd.read_excel(season_filename, sheet_name='Globaal')
-                logger.info(f"Loaded existing season file with {len(df_season)} rows")
-            except Exception as e:
-                logger.error(f"Error reading season file: {e}")
-                return f'Fout bij het lezen van {season_filename}: {e}'
-            # Check if this date already exists
-            if (df_season['Datum'] == date_str).any():
-                return f'Deze uitslag voor {date_str} werd al ingelezen in {season_filename}.'
-            # Assign volgnummer as one more than the number of unique dates (sorted chronologically)
-            unique_dates = sorted(pd.to_datetime(df_season['Datum'], dayfirst=True).unique())
-            volgnummer = len(unique_dates) + 1
-        else:
-            df_season = None
-            volgnummer = 1
-            logger.info(f"Creating new season file: {season_filename}")
-        
-        # Prepare row_wedstrijdinfo
-        row_wedstrijdinfo = {'Datum': date_str, 'Beurten': len([col for col in df.columns if col.startswith('B') and col[1:].isdigit()])}
-        
-        # Process the data
+            raise upload_jobs.StageError(f'Fout bij het lezen van {season_filename}: {e}')
+        # Check if this date already exists
+        if (df_season['Datum'] == date_str).any():
+            raise upload_jobs.StageError(f'Deze uitslag voor {date_str} werd al ingelezen in {season_filename}.')
+        # Assign volgnummer as one more than the number of unique dates (sorted chronologically)
+        context['volgnummer'] = df_season['Datum'].nunique() + 1
+    else:
+        df_season = None
+        context['volgnummer'] = 1
+        logger.info(f"Creating new season file: {season_filename}")
+    context['df_season'] = df_season
+
+def upload_compute(context):
+    """Process the uploaded game and append it to the season"""
+    df = context['df']
+    row_wedstrijdinfo = {'Datum': context['date_str'], 'Beurten': len([col for col in df.columns if col.startswith('B') and col[1:].isdigit()])}
+    try:
+        df_processed = tools.process_uitgebreid(df, row_wedstrijdinfo, context['df_leden'], context['volgnummer'])
+    except Exception as e:
+        raise upload_jobs.StageError(f'Fout bij verwerken van de uitslag: {e}')
+    
+    # Append and apply smart numbering to the new dataset
+    if context['df_season'] is not None:
+        df_new = pd.concat([context['df_season'], df_processed.reset_index()], ignore_index=True)
+    else:
+        df_new = df_processed.reset_index()
+    df_new['Datum_dt'] = pd.to_datetime(df_new['Datum'], dayfirst=True)
+    context['df_new'] = assign_smart_game_numbers(df_new)
+    return f"{len(df_processed)} spelers"
+
+def upload_persist(context):
+    """Write the season workbook"""
+    season_filename = context['season_filename']
+    with season_files.season_lock(season_filename):
+        # Another upload or a delete wrote the season since it was read: add the game to that version
+        if season_files.signature(season_filename) != context['season_signature']:
+            logger.info(f"{season_filename} changed since it was read, reading it again")
+            read_season_for_upload(context)
+            upload_compute(context)
         try:
-            df_processed = tools.process_uitgebreid(df, row_wedstrijdinfo, df_leden, volgnummer)
-            logger.info(f"Processed data with {len(df_processed)} rows")
+            context['written_signature'] = write_season_file(season_filename, context['df_new'])
         except Exception as e:
-            logger.error(f"Data processing error: {e}")
-            return f'Fout bij verwerken van de uitslag: {e}'
-        
-        # Append and save
-        if df_season is not None:
-            df_new = pd.concat([df_season, df_processed.reset_index()], ignore_index=True)
-        else:
-            df_new = df_processed.reset_index()
-        
-        # Apply smart numbering to the new dataset
-        df_new['Datum_dt'] = pd.to_datetime(df_new['Datum'], dayfirst=True)
-        df_new = assign_smart_game_numbers(df_new)
-        
-        # Remove processing columns before saving to Excel
-        df_new_clean = df_new.drop(columns=['Datum_dt', 'GameNr'], errors='ignore')
-        
-        try:
-            df_new_clean.to_excel(season_filename, sheet_name='Globaal', index=False)
-            logger.info(f"Successfully saved {len(df_new)} rows to {season_filename}")
-            
-            # Backup to Dropbox - required for online app
-            if USE_DROPBOX:
-                try:
-                    dropbox_manager = dropbox_integration.get_dropbox_manager()
-                    if dropbox_manager:
-                        if dropbox_manager.backup_excel_file(season_filename):
-                            logger.info(f"Successfully backed up {season_filename} to Dropbox")
-                        else:
-                            logger.error(f"Failed to backup {season_filename} to Dropbox - data may be lost on restart")
-                    else:
-                        logger.error("Dropbox manager not available for backup - data may be lost on restart")
-                except Exception as e:
-                    logger.error(f"Dropbox backup error: {e} - data may be lost on restart")
-            else:
-                logger.error("No Dropbox integration - data will be lost on restart")
-            
-        except Exception as e:
-            logger.error(f"Error saving file: {e}")
-            return f'Fout bij het opslaan van {season_filename}: {e}'
-        
-        # Reload data
-        load_current_data()
-        
-        # Get the actual game number that was assigned
-        actual_game_nr = df_new[df_new['Datum'] == date_str]['GameNr'].iloc[0]
-        
-        return f'Uitslag voor {date_str} (wedstrijd {actual_game_nr}) succesvol toegevoegd aan {season_filename}!'
-        
-    except Exception as e:
-        logger.error(f"Unexpected error in upload processing: {e}")
-        import traceback
-        traceback.print_exc()
-        return f'Onverwachte fout bij upload: {e}'
+            raise upload_jobs.StageError(f'Fout bij het opslaan van {season_filename}: {e}')
+    logger.info(f"Successfully saved {len(context['df_new'])} rows to {season_filename}")
+
+def upload_backup(context):
+    """Back up the season workbook to Dropbox - required for online app"""
+    season_filename = context['season_filename']
+    if not USE_DROPBOX:
+        logger.error("No Dropbox integration - data will be lost on restart")
+        return "overgeslagen (geen Dropbox)"
+    dropbox_manager = dropbox_integration.get_dropbox_manager()
+    if not dropbox_manager or not dropbox_manager.backup_excel_file(season_filename):
+        # Retrying resumes here; refreshing first would sync the old file back from Dropbox
+        raise upload_jobs.StageError(f'Back-up van {season_filename} naar Dropbox mislukt. De uitslag is lokaal opgeslagen, probeer opnieuw.')
+    logger.info(f"Successfully backed up {season_filename} to Dropbox")
+
+def upload_refresh(context):
+    """Rebuild the views of the changed season from the frame that was written"""
+    df_new = context['df_new']
+    refresh_written_season(context['season_filename'], df_new, context['written_signature'])
+    if context['season_filename'] == current_filename:
+        prebuild_full_season_export()
+        start_static_site_build()
+    
+    actual_game_nr = df_new[df_new['Datum'] == context['date_str']]['GameNr'].iloc[0]
+    context['result'] = f"Uitslag voor {context['date_str']} (wedstrijd {actual_game_nr}) succesvol toegevoegd aan {context['season_filename']}!"
+    # The upload itself is no longer needed once the job is done
+    for key in ('df', 'df_season'):
+        context.pop(key, None)
+
+UPLOAD_STAGES = [
+    ("valideren", upload_validate),
+    ("verwerken", upload_compute),
+    ("opslaan", upload_persist),
+    ("back-up", upload_backup),
+    ("vernieuwen", upload_refresh),
+]
+
+UPLOAD_STAGE_LABELS = {
+    upload_jobs.QUEUED: "⏳ wachtend",
+    upload_jobs.RUNNING: "🔄 bezig",
+    upload_jobs.DONE: "✅ klaar",
+    upload_jobs.FAILED: "❌ mislukt",
+}
+
+upload_runner = upload_jobs.JobRunner()
+
+@app.server.route("/jobs/<job_id>")
+def upload_job_status(job_id):
+    """JSON status of an upload job"""
+    from flask import jsonify
+    job = upload_runner.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown job'}), 404
+    return jsonify(job.to_dict())
+
+@app.callback(
+    [Output('upload-status', 'children'),
+     Output('upload-job-store', 'data')],
+    [Input('upload-date-picker-visible', 'date'),
+     Input('upload-job-retry-btn', 'n_clicks')],
+    [State('upload-csv', 'contents'), State('upload-csv', 'filename'), State('upload-job-store', 'data')]
+)
+def process_upload(date, retry_clicks, contents, filename, job_data):
+    if ctx.triggered_id == 'upload-job-retry-btn':
+        job = upload_runner.retry((job_data or {}).get('job_id'))
+        if job is None:
+            return no_update, no_update
+        return f'Opnieuw proberen (poging {job.attempts + 1})...', {'job_id': job.id, 'attempt': job.attempts + 1}
+    
+    if not date or not contents:
+        return '', no_update
+    
+    # Convert date from ISO to DD/MM/YYYY
+    dt = datetime.strptime(date[:10], '%Y-%m-%d')
+    date_str = dt.strftime('%d/%m/%Y')
+    logger.info(f"Processing upload for date: {date_str}")
+    
+    job = upload_runner.submit(UPLOAD_STAGES, {'date_str': date_str, 'contents': contents, 'filename': filename},
+                               description=f"{filename} ({date_str})")
+    return f'Uitslag voor {date_str} wordt verwerkt...', {'job_id': job.id, 'attempt': 1}
+
+@app.callback(
+    [Output('upload-job-status', 'children'),
+     Output('upload-job-poll', 'disabled'),
+     Output('upload-job-retry-btn', 'style')],
+    [Input('upload-job-poll', 'n_intervals'),
+     Input('upload-job-store', 'data')],
+)
+def poll_upload_job(n_intervals, job_data):
+    hidden = {'display': 'none'}
+    job = upload_runner.get((job_data or {}).get('job_id'))
+    if job is None:
+        return '', True, hidden
+    
+    stage_rows = [
+        html.Tr([html.Td(stage['name']), html.Td(UPLOAD_STAGE_LABELS[stage['status']]),
+                 html.Td(f"{stage['duration_ms']:.0f} ms" if stage['duration_ms'] is not None else ''),
+                 html.Td(stage['note'] or '')])
+        for stage in job.stages
+    ]
+    children = [
+        html.P(f"Job {job.id}: {job.description}", className="text-muted mb-2"),
+        html.Table([html.Tbody(stage_rows)], className="table table-sm", style={"maxWidth": "700px"}),
+    ]
+    if job.status == upload_jobs.DONE:
+        children.append(html.P(job.result, className="text-success"))
+    elif job.status == upload_jobs.FAILED:
+        children.append(html.P(job.error, className="text-danger"))
+    
+    finished = job.status in (upload_jobs.DONE, upload_jobs.FAILED)
+    retry_style = {'display': 'inline-block'} if job.retryable else hidden
+    return html.Div(children), finished, retry_style
 
 # PDF Upload Callbacks
 @app.callback(
@@ -1898,52 +2585,22 @@ def process_pdf_upload(n_clicks, contents, filename):
             # Regular season - use DD-M-YYYY format like existing files
             filename_new = f"wedstrijd van {dt_obj.day}-{dt_obj.month}-{dt_obj.year}.pdf"
         
-        # Save PDF to assets folder
+        # Save PDF to the report store
         try:
             # Decode base64 content
             content_type, content_string = contents.split(',')
             decoded = base64.b64decode(content_string)
             
-            # Ensure assets directory exists
-            assets_dir = "assets/Wedstrijdverslagen"
-            if not os.path.exists(assets_dir):
-                os.makedirs(assets_dir)
-                logger.info(f"Created assets directory: {assets_dir}")
-            
-            # Save file
-            pdf_path = os.path.join(assets_dir, filename_new)
-            logger.info(f"Saving to assets: {pdf_path}")
-            with open(pdf_path, 'wb') as f:
-                f.write(decoded)
-            
-            # Also save to main Wedstrijdverslagen folder for consistency
-            main_dir = "Wedstrijdverslagen"
-            if not os.path.exists(main_dir):
-                os.makedirs(main_dir)
-                logger.info(f"Created main directory: {main_dir}")
-            
-            main_pdf_path = os.path.join(main_dir, filename_new)
-            logger.info(f"Saving to main: {main_pdf_path}")
-            with open(main_pdf_path, 'wb') as f:
-                f.write(decoded)
-            
-            # Also save to assets folder for immediate web serving
-            assets_dir = "assets/Wedstrijdverslagen"
-            if not os.path.exists(assets_dir):
-                os.makedirs(assets_dir)
-                logger.info(f"Created assets directory: {assets_dir}")
-            
-            assets_pdf_path = os.path.join(assets_dir, filename_new)
-            logger.info(f"Saving to assets: {assets_pdf_path}")
-            with open(assets_pdf_path, 'wb') as f:
-                f.write(decoded)
+            sha256 = report_store.add(decoded, date_str, filename_new)
+            pdf_path = report_store.object_path(sha256)
+            logger.info(f"Saved PDF {filename_new} as {pdf_path}")
             
             # Upload to Dropbox - required for online app
             if USE_DROPBOX:
                 try:
                     dropbox_manager = dropbox_integration.get_dropbox_manager()
                     if dropbox_manager:
-                        if dropbox_manager.upload_pdf_report(main_pdf_path, date_str):
+                        if dropbox_manager.upload_pdf_report(pdf_path, date_str):
                             logger.info(f"Successfully uploaded PDF to Dropbox")
                         else:
                             logger.error(f"Failed to upload PDF to Dropbox - file may be lost on restart")
@@ -1954,16 +2611,8 @@ def process_pdf_upload(n_clicks, contents, filename):
             else:
                 logger.error("No Dropbox integration - PDF will be lost on restart")
             
-            # Verify files were saved correctly
-            if not os.path.exists(pdf_path):
-                logger.error(f"PDF not found in assets after save: {pdf_path}")
-                return f'❌ Fout: PDF kon niet worden opgeslagen in assets folder'
-            if not os.path.exists(main_pdf_path):
-                logger.error(f"PDF not found in main after save: {main_pdf_path}")
-                return f'❌ Fout: PDF kon niet worden opgeslagen in hoofdmap'
-            
-            # Note: PDF mapping will be refreshed on next app load
-            logger.info("PDF files saved successfully")
+            # Make the new report searchable (only this report is read)
+            threading.Thread(target=update_report_index, name="report-index", daemon=True).start()
             
             logger.info(f"PDF upload successful: {date_str} -> {filename_new}")
             
@@ -2004,31 +2653,45 @@ def delete_game(n_clicks, game_nr):
     if not n_clicks or game_nr is None:
         return '', None, []
     
+    if not current_filename:
+        return 'Geen bestand geselecteerd voor opslag.', None, []
+    
     try:
-        # Remove all rows for this game
-        df_updated = df_global[df_global['GameNr'] != game_nr].copy()
-        
-        # Renumber remaining games using smart numbering
-        df_updated['Datum_dt'] = pd.to_datetime(df_updated['Datum'], dayfirst=True)
-        df_updated = assign_smart_game_numbers(df_updated)
-        
-        # Remove processing columns before saving to Excel
-        df_updated_clean = df_updated.drop(columns=['Datum_dt', 'GameNr'], errors='ignore')
+        with season_views_lock:
+            filename = current_filename
+            date_str = df_global.loc[df_global['GameNr'] == game_nr, 'Datum'].astype(str).iloc[0]
+        
+        with season_files.season_lock(filename):
+            # Remove all rows for this game from the workbook as it is now: an upload may have
+            # added a game since the views were built. The raw sheet is read, never the prepared
+            # view frame (compact dtypes, current names and classes must not reach the workbook)
+            df_season = pd.read_excel(filename, sheet_name='Globaal')
+            dates = pd.to_datetime(df_season['Datum'].astype(str), dayfirst=True)
+            df_updated = df_season[dates != pd.to_datetime(date_str, dayfirst=True)].copy()
+
+            # Renumber remaining games using smart numbering
+            df_updated['Datum_dt'] = dates[df_updated.index]
+            df_updated = assign_smart_game_numbers(df_updated)
+            
+            # Save updated file
+            written = write_season_file(filename, df_updated)
         
-        # Save updated file
-        if current_filename:
-            df_updated_clean.to_excel(current_filename, sheet_name='Globaal', index=False)
-        else:
-            return 'Geen bestand geselecteerd voor opslag.', None, []
+        # Backup to Dropbox, otherwise the next sync brings the deleted game back
+        if USE_DROPBOX:
+            dropbox_manager = dropbox_integration.get_dropbox_manager()
+            if not dropbox_manager or not dropbox_manager.backup_excel_file(filename):
+                logger.error(f"Failed to backup {filename} to Dropbox - data may be lost on restart")
         
-        # Reload data
-        load_current_data()
+        # Rebuild the views of this season from the updated frame
+        refresh_written_season(filename, df_updated, written)
         
-        # Update dropdown options with the fresh data
-        if df_global is None or df_global.empty:
+        # Update dropdown options with the fresh data, from the views installed under the lock
+        with season_views_lock:
+            df_season = df_global
+        if df_season is None or df_season.empty:
             game_options = []
         else:
-            games = df_global[['Datum', 'GameNr']].drop_duplicates().sort_values('GameNr')
+            games = df_season[['Datum', 'GameNr']].drop_duplicates().sort_values('GameNr')
             game_options = [
                 {"label": f"Wedstrijd {row['GameNr']} - {row['Datum']}", "value": row['GameNr']}
                 for _, row in games.iterrows()
@@ -2056,6 +2719,46 @@ def download_drilldown(n):
 
 
 
+@app.callback(
+    Output("report-search-results", "children"),
+    Input("report-search-input", "value"),
+    prevent_initial_call=True
+)
+def search_reports(query):
+    if not query or not report_search.tokenize(query):
+        return ""
+    
+    ensure_report_tasks()
+    hits = report_index.search(query)
+    # Reports with the same content are stored (and indexed) once
+    indexed, total = len(report_index), len({entry['sha256'] for entry in report_store.entries().values()})
+    status = f"Index wordt nog opgebouwd ({indexed} van {total} verslagen). " if indexed < total else ""
+    if not hits:
+        return html.P(f"{status}Geen verslagen gevonden voor '{query}'.", className="text-muted")
+    
+    return html.Div([
+        html.Small(f"{status}{len(hits)} verslag(en) gevonden, klik om te openen:", className="text-muted"),
+        html.Ul([
+            html.Li([
+                html.Button(hit['Datum'], id={"type": "report-search-hit", "index": hit['Datum']},
+                            className="btn btn-link p-0 me-2"),
+                html.Small(f"({hit['Treffers']}×) {hit['Fragment']}", className="text-muted")
+            ])
+            for hit in hits
+        ], className="list-unstyled mt-2")
+    ])
+
+@app.callback(
+    Output("game-pdf-dropdown", "value"),
+    Input({"type": "report-search-hit", "index": ALL}, "n_clicks"),
+    prevent_initial_call=True
+)
+def open_report_search_hit(n_clicks):
+    # The hit buttons are created with the results, only react to a real click
+    if not ctx.triggered_id or not any(n_clicks):
+        return no_update
+    return ctx.triggered_id["index"]
+
 # Callback to handle game PDF dropdown selection
 @app.callback(
     Output("selected-game-pdf", "children"),
@@ -2070,15 +2773,14 @@ def handle_game_pdf_selection(selected_date):
     pdf_mapping = get_available_pdf_reports()
     
     if selected_date in pdf_mapping:
-        pdf_filename = pdf_mapping[selected_date]
-        pdf_path = f"Wedstrijdverslagen/{pdf_filename}"
+        report_url = get_report_url(selected_date)
         
-        if os.path.exists(pdf_path):
-            # Create a download link for the PDF
+        if report_url:
+            # Show the PDF, served by the /reports route
             return html.Div([
                 html.H5(f"Wedstrijdverslag voor {selected_date}", className="mb-3"),
                 html.Iframe(
-                    src=f"/assets/Wedstrijdverslagen/{pdf_filename}",
+                    src=report_url,
                     width="100%",
                     height="600px",
                     style={"border": "1px solid #ddd", "borderRadius": "5px"}
@@ -2089,7 +2791,7 @@ def handle_game_pdf_selection(selected_date):
         else:
             return html.Div([
                 html.H5(f"Wedstrijd {selected_date}", className="mb-3"),
-                html.P(f"PDF bestand niet gevonden: {pdf_path}", className="text-danger")
+                html.P(f"PDF bestand niet gevonden: {pdf_mapping[selected_date]}", className="text-danger")
             ])
     else:
         return html.Div([
@@ -2191,6 +2893,8 @@ def update_tab_access(login_clicks, password_submit, password):
             dcc.Tab(label="Ranking RP", value="tab-rp", className="tab-label"),
             dcc.Tab(label="Ranking Punten", value="tab-pts", className="tab-label"),
             dcc.Tab(label="Grafieken", value="tab-graphs", className="tab-label"),
+            dcc.Tab(label="Zomer simulatie", value="tab-sim", className="tab-label"),
+            dcc.Tab(label="Seizoenen vergelijken", value="tab-compare", className="tab-label"),
             dcc.Tab(label="Upload", value="tab-upload", className="tab-label"),
             dcc.Tab(label="Beheer", value="tab-management", className="tab-label"),
         ]
@@ -2244,6 +2948,8 @@ def handle_logout(logout_clicks):
             dcc.Tab(label="Ranking RP", value="tab-rp", className="tab-label"),
             dcc.Tab(label="Ranking Punten", value="tab-pts", className="tab-label"),
             dcc.Tab(label="Grafieken", value="tab-graphs", className="tab-label"),
+            dcc.Tab(label="Zomer simulatie", value="tab-sim", className="tab-label"),
+            dcc.Tab(label="Seizoenen vergelijken", value="tab-compare", className="tab-label"),
             dcc.Tab(label="Upload Uitslag", value="tab-upload", className="tab-label", disabled=True),
             dcc.Tab(label="Wedstrijd Beheer", value="tab-management", className="tab-label", disabled=True),
         ]
@@ -2264,12 +2970,9 @@ def update_member_table(tab_value, refresh_clicks):
     if tab_value != "tab-management":
         return no_update
     
-    global df_leden
-    
-    # Reload member data from Dropbox if refresh button was clicked
+    # Check the member sources now instead of at the next background check
     if refresh_clicks:
-        df_leden = load_member_data()
-        print(f"Refreshed member data: {len(df_leden)} members")
+        member_data.check()
     
     if df_leden.empty:
         return html.P("Geen leden data beschikbaar. Controleer of Leden.xlsx in Dropbox bestaat.", className="text-muted")
@@ -2280,7 +2983,7 @@ def update_member_table(tab_value, refresh_clicks):
         {"name": "Klasse", "id": "KLASSE"}
     ]
     
-    print(f"Creating member table with {len(df_leden)} members from Leden.xlsx")
+    ui_logger.debug("Creating member table with %s members", len(df_leden))
     
     return dash_table.DataTable(
         id="member-table",
@@ -2324,18 +3027,101 @@ def export_members(export_clicks):
     if not export_clicks:
         return no_update
     
-    def writer(buf):
-        df_leden.to_excel(buf, index=False)
-    return dcc.send_bytes(writer, "Leden_Export.xlsx")
+    data = exports.get("members", members_version, lambda: export_cache.workbook_bytes({'Sheet1': df_leden}))
+    return dcc.send_bytes(data, "Leden_Export.xlsx")
+
+
+@app.callback(
+    Output("callback-metrics-container", "children"),
+    [Input("tabs", "value"), Input("refresh-metrics-btn", "n_clicks")],
+)
+def update_callback_metrics(tab_value, refresh_clicks):
+    if tab_value != "tab-management" or not is_authenticated:
+        return no_update
+    
+    rows = metrics.snapshot()
+    if not rows:
+        return html.P("Nog geen callbacks uitgevoerd.", className="text-muted")
+    
+    columns = ['callback', 'calls', 'errors', 'prevented', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms',
+               'avg_request_kb', 'avg_response_kb', 'last_error']
+    return dash_table.DataTable(
+        id="callback-metrics-table",
+        columns=[{"name": col, "id": col} for col in columns],
+        data=[{col: row[col] for col in columns} for row in rows],
+        sort_action="native",
+        style_table={"overflowX": "auto"},
+        style_cell={
+            "padding": "8px",
+            "fontFamily": "Arial",
+            "fontSize": "14px",
+            "border": "1px solid #bdc3c7",
+            "textAlign": "left"
+        },
+        style_header={
+            "fontWeight": "bold",
+            "backgroundColor": "#2c3e50",
+            "color": "white",
+            "textAlign": "center"
+        },
+    )
+
+def get_memory_report():
+    """Memory used by the loaded season: the season frame, the computed views and the turn cube"""
+    df_report = tools.memory_report({
+        'df_global': df_global,
+        'df_gen_info': df_gen_info,
+        'df_pct_final': df_pct_final,
+        'df_rp_final': df_rp_final,
+        'df_pts_final': df_pts_final,
+    })
+    if season_turn_cube is not None:
+        n_games, n_turns, n_players = season_turn_cube.shape
+        df_report.loc[len(df_report)] = ['season_turn_cube', n_games * n_players, n_turns,
+                                         round(season_turn_cube.nbytes / 1024, 1)]
+    df_report.loc[len(df_report)] = ['Totaal', '', '', round(df_report['KB'].sum(), 1)]
+    return df_report
 
+@app.callback(
+    Output("memory-report-container", "children"),
+    [Input("tabs", "value"), Input("refresh-metrics-btn", "n_clicks")],
+)
+def update_memory_report(tab_value, refresh_clicks):
+    if tab_value != "tab-management" or not is_authenticated:
+        return no_update
+    
+    df_report = get_memory_report()
+    return dash_table.DataTable(
+        id="memory-report-table",
+        columns=[{"name": col, "id": col} for col in df_report.columns],
+        data=df_report.to_dict('records'),
+        style_table={"overflowX": "auto", "maxWidth": "600px"},
+        style_cell={
+            "padding": "8px",
+            "fontFamily": "Arial",
+            "fontSize": "14px",
+            "border": "1px solid #bdc3c7",
+            "textAlign": "left"
+        },
+        style_header={
+            "fontWeight": "bold",
+            "backgroundColor": "#2c3e50",
+            "color": "white",
+            "textAlign": "center"
+        },
+    )
 
 # Print functionality is now handled by JavaScript in the HTML template
 
+# Instrument all callbacks registered above
+callback_metrics.instrument_app(app, metrics)
+
 if __name__ == "__main__":
     print("Starting Dash app...")
     # Use environment variable for port (Render requirement)
     port = int(os.environ.get("PORT", 8050))
     debug = os.environ.get("DEBUG", "False").lower() == "true"  # Default to False for production
     
+    ensure_report_tasks()
     print(f"Starting server on port {port}")
     app.run(debug=debug, host="0.0.0.0", port=port)
\ No newline at end of file
@@ -1,12 +1,34 @@
-import dropbox
+import hashlib
 import os
-import tempfile
-import logging
 from datetime import datetime
-import pandas as pd
-import json
+import app_logging
+import season_files
 
-logger = logging.getLogger(__name__)
+logger = app_logging.get_logger('dropbox')
+
+CONTENT_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+def content_hash(path):
+    """
+    Dropbox content hash of a local file, None when it does not exist.
+
+    The sha256 of the concatenated sha256 digests of every 4 MB block, so a local copy
+    can be compared with the content_hash of the metadata without downloading the file.
+    """
+    if not os.path.exists(path):
+        return None
+    block_digests = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CONTENT_HASH_BLOCK_SIZE), b''):
+            block_digests.update(hashlib.sha256(block).digest())
+    return block_digests.hexdigest()
+
+
+def _dropbox():
+    """Import the Dropbox SDK on first use, it is slow to import and not needed without credentials"""
+    import dropbox
+    return dropbox
 
 class DropboxManager:
     def __init__(self, app_key, app_secret, refresh_token=None, access_token=None):
@@ -20,10 +42,10 @@ class DropboxManager:
         # Initialize connection
         if access_token:
             # Use existing access token (for backward compatibility)
-            self.dbx = dropbox.Dropbox(access_token)
+            self.dbx = _dropbox().Dropbox(access_token)
         elif refresh_token:
             # Use refresh token for long-term access
-            self.dbx = dropbox.Dropbox(oauth2_refresh_token=refresh_token, app_key=app_key, app_secret=app_secret)
+            self.dbx = _dropbox().Dropbox(oauth2_refresh_token=refresh_token, app_key=app_key, app_secret=app_secret)
         else:
             raise ValueError("Either access_token or refresh_token must be provided")
         
@@ -32,7 +54,7 @@ class DropboxManager:
         try:
             if self.refresh_token:
                 # Create new Dropbox instance with refresh token
-                self.dbx = dropbox.Dropbox(oauth2_refresh_token=self.refresh_token, app_key=self.app_key, app_secret=self.app_secret)
+                self.dbx = _dropbox().Dropbox(oauth2_refresh_token=self.refresh_token, app_key=self.app_key, app_secret=self.app_secret)
                 logger.info("Access token refreshed successfully")
                 return True
             else:
@@ -48,7 +70,7 @@ class DropboxManager:
             self.dbx.users_get_current_account()
             logger.info("Dropbox connection successful")
             return True
-        except dropbox.exceptions.AuthError as e:
+        except _dropbox().exceptions.AuthError as e:
             if "expired_access_token" in str(e):
                 logger.info("Access token expired, attempting to refresh...")
                 if self.refresh_access_token():
@@ -76,7 +98,7 @@ class DropboxManager:
             # Test current connection
             self.dbx.users_get_current_account()
             return True
-        except dropbox.exceptions.AuthError as e:
+        except _dropbox().exceptions.AuthError as e:
             if "expired_access_token" in str(e):
                 logger.info("Access token expired, refreshing...")
                 return self.refresh_access_token()
@@ -108,9 +130,9 @@ class DropboxManager:
         """Download a file from Dropbox to local path"""
         try:
             self._ensure_valid_connection()
-            with open(local_path, 'wb') as f:
-                metadata, response = self.dbx.files_download(dropbox_path)
-                f.write(response.content)
+            metadata, response = self.dbx.files_download(dropbox_path)
+            # Replaced atomically: a reader of the local file never sees a half downloaded one
+            season_files.atomic_write(local_path, lambda f: f.write(response.content))
             logger.info(f"Downloaded {dropbox_path} to {local_path}")
             return True
         except Exception as e:
@@ -122,7 +144,7 @@ class DropboxManager:
         try:
             self._ensure_valid_connection()
             with open(local_path, 'rb') as f:
-                self.dbx.files_upload(f.read(), dropbox_path, mode=dropbox.files.WriteMode.overwrite)
+                self.dbx.files_upload(f.read(), dropbox_path, mode=_dropbox().files.WriteMode.overwrite)
             logger.info(f"Uploaded {local_path} to {dropbox_path}")
             return True
         except Exception as e:
@@ -135,12 +157,22 @@ class DropboxManager:
             self._ensure_valid_connection()
             self.dbx.files_get_metadata(dropbox_path)
             return True
-        except dropbox.exceptions.ApiError as e:
+        except _dropbox().exceptions.ApiError as e:
             if e.error.is_not_found():
                 return False
             else:
                 raise e
     
+    def get_file_metadata(self, dropbox_path):
+        """Metadata of a file in Dropbox (rev, content_hash, server_modified), None when it does not exist"""
+        try:
+            self._ensure_valid_connection()
+            return self.dbx.files_get_metadata(dropbox_path)
+        except _dropbox().exceptions.ApiError as e:
+            if e.error.is_path() and e.error.get_path().is_not_found():
+                return None
+            raise e
+    
     def sync_excel_files(self, required_files):
         """Sync Excel files from Dropbox to local storage"""
         synced_files = []
@@ -150,7 +182,10 @@ class DropboxManager:
             local_path = filename
             
             if self.file_exists(dropbox_path):
-                if self.download_file(dropbox_path, local_path):
+                # Not while an upload or delete is writing the season
+                with season_files.season_lock(local_path):
+                    downloaded = self.download_file(dropbox_path, local_path)
+                if downloaded:
                     synced_files.append(filename)
                     logger.info(f"Synced {filename} from Dropbox")
             else:
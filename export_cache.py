@@ -0,0 +1,95 @@
+import io
+import threading
+import time
+
+import app_logging
+
+logger = app_logging.get_logger('export')
+
+
+def excel_engine():
+    """xlsxwriter when it is installed (several times faster than openpyxl), otherwise openpyxl"""
+    try:
+        import xlsxwriter  # noqa: F401
+        return 'xlsxwriter'
+    except ImportError:
+        return 'openpyxl'
+
+
+def workbook_bytes(sheets):
+    """
+    Write dataframes to an Excel workbook in memory.
+
+    Args:
+        sheets (dict): Sheet name -> dataframe, in sheet order.
+
+    Returns:
+        bytes: The .xlsx file.
+    """
+    import pandas as pd
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine=excel_engine()) as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
+
+
+class ExportCache:
+    """
+    Export files built once per data version.
+
+    Every export has a name; the bytes are kept together with the version of the data
+    they were built from and only rebuilt when a newer version is asked for. Concurrent
+    requests for the same export wait for one build instead of each building it.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._build_locks = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, name, version):
+        entry = self._entries.get(name)
+        return entry['data'] if entry is not None and entry['version'] == version else None
+
+    def get(self, name, version, build):
+        """
+        Return the export bytes for a data version.
+
+        Args:
+            name (str): Name of the export.
+            version (int): Version of the data the export is built from.
+            build (callable): build() -> bytes, called when there are no bytes for this version.
+        """
+        with self._lock:
+            data = self._cached(name, version)
+            if data is not None:
+                return data
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                data = self._cached(name, version)
+            if data is not None:
+                return data
+            start = time.perf_counter()
+            data = build()
+            logger.info("Built export %s", name, extra={
+                'version': version, 'bytes': len(data),
+                'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+            with self._lock:
+                # A build of older data never replaces a newer one
+                entry = self._entries.get(name)
+                if entry is None or entry['version'] <= version:
+                    self._entries[name] = {'version': version, 'data': data}
+        return data
+
+    def prebuild(self, name, version, build):
+        """Build an export in a background thread so the first download is served from the cache"""
+        def run():
+            try:
+                self.get(name, version, build)
+            except Exception:
+                logger.exception("Error building export %s", name)
+
+        threading.Thread(target=run, name=f"export-{name}", daemon=True).start()
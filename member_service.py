@@ -0,0 +1,192 @@
+"""
+The member table, kept up to date in the background.
+
+The members come from two workbooks with a Leden sheet: Leden.xlsx, managed by the admins
+in Dropbox, and Info.xlsx next to the app. A background thread checks them for changes by
+their fingerprint only (the content hash of the Dropbox file, the modification time and
+size of a local file), so a check downloads and reads nothing. A changed source is read,
+the sources are reconciled into one table and requests always get that table from memory.
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+import app_logging
+import dropbox_integration
+import players
+import season_files
+
+logger = app_logging.get_logger('members')
+
+MEMBER_SHEET = 'Leden'
+CHECK_INTERVAL = 60
+
+# Other spellings of the member columns in the workbooks
+COLUMN_NAMES = {'NAAM': 'Naam', 'Club': 'CLUB', 'Klasse': 'KLASSE', 'Vanaf': 'VANAF', 'NTSVNR': 'Ntsvnr'}
+
+
+def read_member_table(path):
+    """Read the Leden sheet of a workbook with the column names the app uses"""
+    df = pd.read_excel(path, sheet_name=MEMBER_SHEET)
+    df = df.rename(columns={column: name for column, name in COLUMN_NAMES.items()
+                            if column in df.columns and name not in df.columns})
+    if 'Naam' not in df.columns:
+        raise ValueError(f"No column Naam in the {MEMBER_SHEET} sheet of {path}")
+    df = df.dropna(subset=['Naam'])
+    df['Naam'] = df['Naam'].astype(str).str.strip()
+    if 'Ntsvnr' in df.columns:
+        df['Ntsvnr'] = df['Ntsvnr'].map(players.normalize_ntsvnr)
+    return df.reset_index(drop=True)
+
+
+def _missing(value):
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+def reconcile(tables):
+    """
+    Merge the member tables of the sources into one.
+
+    Members are matched on Ntsvnr, else on name. The values of the first table a member is
+    in are kept; later tables fill in what it does not have (e.g. Ntsvnr) and add the
+    members that are only in them.
+
+    Args:
+        tables (list): (source name, member table) pairs, in order of precedence.
+
+    Returns:
+        pd.DataFrame: The member table.
+    """
+    members = []
+    by_ntsvnr = {}
+    by_name = {}
+    conflicts = []
+    for source, df in tables:
+        for member in df.to_dict('records'):
+            ntsvnr = None if _missing(member.get('Ntsvnr')) else member['Ntsvnr']
+            index = by_ntsvnr.get(ntsvnr) if ntsvnr else None
+            if index is None:
+                index = by_name.get(member['Naam'])
+            if index is None:
+                members.append(dict(member))
+                index = len(members) - 1
+            else:
+                kept = members[index]
+                for column, value in member.items():
+                    if _missing(kept.get(column)):
+                        kept[column] = value
+                    elif column == 'KLASSE' and not _missing(value) and str(value) != str(kept[column]):
+                        conflicts.append(f"{kept['Naam']} ({kept[column]}, {source}: {value})")
+            if ntsvnr:
+                by_ntsvnr.setdefault(ntsvnr, index)
+            by_name.setdefault(member['Naam'], index)
+    if conflicts:
+        logger.warning("Members with another class in a later source, the first is kept: %s", ", ".join(conflicts))
+    return pd.DataFrame(members)
+
+
+class MemberSource:
+    """A workbook with a Leden sheet, optionally kept in Dropbox and downloaded when it changed"""
+
+    def __init__(self, filename, in_dropbox=False):
+        self.filename = filename
+        self.in_dropbox = in_dropbox
+
+    def fingerprint(self, dropbox_manager):
+        """
+        What identifies the current content, without reading it: ('dropbox', content hash)
+        or ('file', mtime, size) of the local file. None when there is no file.
+        """
+        if self.in_dropbox and dropbox_manager is not None:
+            metadata = dropbox_manager.get_file_metadata(f"{dropbox_manager.app_folder}/{self.filename}")
+            if metadata is not None:
+                return ('dropbox', metadata.content_hash)
+        local = season_files.signature(self.filename)
+        return ('file',) + local if local is not None else None
+
+    def read(self, dropbox_manager, fingerprint):
+        """Read the member table of a fingerprint, downloading the file when the local copy differs"""
+        if fingerprint[0] == 'dropbox' and dropbox_integration.content_hash(self.filename) != fingerprint[1]:
+            if not dropbox_manager.download_file(f"{dropbox_manager.app_folder}/{self.filename}", self.filename):
+                raise RuntimeError(f"Could not download {self.filename}")
+        return read_member_table(self.filename)
+
+
+class MemberService:
+    """
+    The current member table of a list of sources (in order of precedence).
+
+    check() reads the sources that changed since the last check and calls on_change(table)
+    when the reconciled table changed; start() runs it every interval seconds.
+    """
+
+    def __init__(self, sources, get_dropbox=None, on_change=None, interval=CHECK_INTERVAL):
+        self.sources = sources
+        self.get_dropbox = get_dropbox or (lambda: None)
+        self.on_change = on_change
+        self.interval = interval
+        self.version = 0
+        self._table = pd.DataFrame()
+        self._fingerprints = {}
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def table(self):
+        """The current member table (never reads or downloads)"""
+        return self._table
+
+    def check(self):
+        """Read the sources that changed and update the table, True when the table changed"""
+        with self._lock:
+            start = time.perf_counter()
+            dropbox_manager = self.get_dropbox()
+            changed = []
+            for source in self.sources:
+                try:
+                    fingerprint = source.fingerprint(dropbox_manager)
+                    if source.filename in self._fingerprints and self._fingerprints[source.filename] == fingerprint:
+                        continue
+                    self._tables[source.filename] = source.read(dropbox_manager, fingerprint) if fingerprint else None
+                    self._fingerprints[source.filename] = fingerprint
+                    changed.append(source.filename)
+                except Exception:
+                    # The previous table of the source is kept, the next check tries again
+                    logger.exception("Could not check member source %s", source.filename)
+            if not changed:
+                return False
+
+            table = reconcile([(source.filename, self._tables[source.filename]) for source in self.sources
+                               if self._tables.get(source.filename) is not None])
+            if table.equals(self._table):
+                return False
+            self._table = table
+            self.version += 1
+            logger.info("Loaded members", extra={
+                'members': len(table), 'sources': changed,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+            if self.on_change is not None:
+                try:
+                    self.on_change(table)
+                except Exception:
+                    logger.exception("Error applying the new member table")
+            return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Error checking the member sources")
+
+    def start(self):
+        """Check the sources every interval seconds in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="member-service", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,147 @@
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import app_logging
+
+logger = app_logging.get_logger('pdf')
+
+# Header of every match report: "Clubwedstrijd - COXHYDE, Koksijde - DD/MM/YYYY"
+DATE_PATTERN = re.compile(r'Clubwedstrijd - COXHYDE, Koksijde - (\d{2})/(\d{2})/(\d{4})')
+FALLBACK_PATTERN = re.compile(r'(\d{2})/(\d{2})/(\d{4})')
+# Bytes of the page content read after the first text object to find the header
+HEADER_BYTES = 2048
+
+# Dates of the most recently seen PDFs, keyed by the sha256 of their content
+CACHE_SIZE = 64
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _format(match):
+    day, month, year = match.groups()
+    return f"{day}/{month}/{year}"
+
+
+def _search(text):
+    match = DATE_PATTERN.search(text) or FALLBACK_PATTERN.search(text)
+    return _format(match) if match else None
+
+
+def _header_text(page):
+    """
+    Text at the start of the page: the content stream up to HEADER_BYTES after the first
+    text object. Parsing the whole stream (the game board, all the tables) is what makes
+    extract_text slow, the header is the first text on the page.
+    """
+    from PyPDF2.generic import DecodedStreamObject, NameObject
+    data = page.get_contents().get_data()
+    start = data.find(b'BT')
+    if start < 0:
+        return ""
+    prefix = data[:start + HEADER_BYTES]
+    # Cut after the last complete line so no operator is split
+    prefix = prefix[:prefix.rfind(b'\n') + 1]
+    header_stream = DecodedStreamObject()
+    header_stream.set_data(prefix)
+    page[NameObject('/Contents')] = header_stream
+    return page.extract_text()
+
+
+def extract_date(data):
+    """
+    Extract the match date (DD/MM/YYYY) from the first page of a report.
+
+    Only the start of the page is parsed; the full text of the first page is only
+    extracted when no date is found there.
+
+    Args:
+        data (bytes): PDF content.
+
+    Returns:
+        str: The date, or None when no date was found.
+    """
+    import PyPDF2  # Imported on first use to keep the cold start fast
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    if len(reader.pages) == 0:
+        return None
+
+    try:
+        date_str = _search(_header_text(reader.pages[0]))
+    except Exception:
+        logger.warning("Could not read the header of the PDF, using the full text", exc_info=True)
+        date_str = None
+    if date_str:
+        return date_str
+
+    # _header_text replaced the page content, read the page again
+    return _search(PyPDF2.PdfReader(io.BytesIO(data)).pages[0].extract_text())
+
+
+def cached_extract_date(data):
+    """extract_date with the result cached by content hash (the upload callbacks see the same PDF twice)"""
+    key = hashlib.sha256(data).hexdigest()
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    date_str = extract_date(data)
+    with _cache_lock:
+        _cache[key] = date_str
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return date_str
+
+
+def extract_file_date(path):
+    """Date of a report file, or None when it can not be read"""
+    try:
+        with open(path, 'rb') as f:
+            return extract_date(f.read())
+    except Exception:
+        logger.exception("Could not extract the date of %s", path)
+        return None
+
+
+def extract_dates(paths, max_workers=None):
+    """
+    Extract the dates of many report files in parallel.
+
+    Text extraction is pure Python, so the files are spread over worker processes.
+
+    Returns:
+        dict: path -> date (or None).
+    """
+    paths = list(paths)
+    if not paths:
+        return {}
+    max_workers = max_workers or min(4, os.cpu_count() or 1)
+    if max_workers == 1 or len(paths) == 1:
+        return {path: extract_file_date(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(paths, executor.map(extract_file_date, paths, chunksize=4)))
+
+
+def validate_report_index(index, object_path, max_workers=None):
+    """
+    Check the date index of the report store against the dates in the PDFs.
+
+    Args:
+        index (dict): Date -> index entry with the sha256 and original file name.
+        object_path (callable): sha256 -> path of the stored PDF.
+
+    Returns:
+        list: One dict (Datum, Bestand, Datum in PDF) per report whose date does not match.
+    """
+    paths = {date_str: object_path(entry['sha256']) for date_str, entry in index.items()}
+    dates = extract_dates(paths.values(), max_workers)
+    mismatches = []
+    for date_str, path in sorted(paths.items()):
+        pdf_date = dates.get(path)
+        if pdf_date != date_str:
+            mismatches.append({'Datum': date_str, 'Bestand': index[date_str]['filename'], 'Datum in PDF': pdf_date})
+    return mismatches
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+
+import app_logging
+
+logger = app_logging.get_logger('pdf')
+
+INDEX_FILENAME = "index.json"
+
+
+def parse_report_date(filename):
+    """
+    Return the date (DD/MM/YYYY) of a report file name like "zomerwedstrijd 1 van 3-7-25.pdf".
+
+    Returns None when the name does not contain a date.
+    """
+    if not filename.endswith('.pdf') or "van " not in filename:
+        return None
+    # Extract date part after "van "
+    date_part = filename.split("van ")[1].replace('.pdf', '')
+    parts = date_part.split('-')
+    if len(parts) != 3:
+        return None
+    day, month, year = parts
+    # Handle different year formats
+    if len(year) == 2:
+        year = '20' + year
+    elif len(year) != 4:
+        return None
+    if not (day.isdigit() and month.isdigit() and year.isdigit()):
+        return None
+    return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
+
+
+class PdfStore:
+    """
+    Content-addressed storage of the match reports.
+
+    Every PDF is stored once under objects/<sha256[:2]>/<sha256>.pdf, index.json maps the
+    date of the match to the object and the original file name. Other files of the same
+    date found in the report folder are kept as aliases of the date (file name and size),
+    so they are recognised as imported without being read again.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._index = self._read_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, INDEX_FILENAME)
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            logger.exception("Could not read PDF index %s", self.index_path)
+            return {}
+
+    def _write_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def object_path(self, sha256):
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.pdf")
+
+    def add(self, data, date_str, filename, source_path=None):
+        """
+        Store a report and index it under its date.
+
+        Args:
+            data (bytes): PDF content.
+            date_str (str): Date of the match (DD/MM/YYYY).
+            filename (str): Original file name, used for downloads and the Dropbox backup.
+            source_path (str): Optional file with the same content, hard-linked instead of
+                written when possible.
+
+        Returns:
+            str: sha256 of the content.
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha256)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                try:
+                    if source_path is None:
+                        raise OSError("no source file")
+                    os.link(source_path, tmp_path)
+                except OSError:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(data)
+                os.replace(tmp_path, path)
+            entry = {'sha256': sha256, 'filename': filename, 'size': len(data)}
+            aliases = [alias for alias in (self._index.get(date_str) or {}).get('aliases', []) if alias['filename'] != filename]
+            if aliases:
+                entry['aliases'] = aliases
+            if self._index.get(date_str) != entry:
+                self._index[date_str] = entry
+                self._write_index()
+        return sha256
+
+    def add_file(self, path, date_str=None):
+        """Store a report file, the date defaults to the one in its name. Returns the sha256 or None"""
+        filename = os.path.basename(path)
+        date_str = date_str or parse_report_date(filename)
+        if date_str is None:
+            logger.warning("No date in PDF file name %s, skipped", filename)
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        return self.add(data, date_str, filename, source_path=path)
+
+    def import_folder(self, folder):
+        """Index all reports of a folder (reports already in the store are not copied again)"""
+        if not os.path.isdir(folder):
+            return 0
+        imported = 0
+        for filename in sorted(os.listdir(folder)):
+            path = os.path.join(folder, filename)
+            if not filename.endswith('.pdf') or self.has(filename, os.path.getsize(path)):
+                continue
+            # A second file of a date that already has a report (e.g. "wedstrijd 1 van 5-9-24.pdf"
+            # next to "wedstrijd van 5-9-2024.pdf") does not replace it
+            date_str = parse_report_date(filename)
+            entry = self.get(date_str) if date_str else None
+            if entry is not None and entry['filename'] != filename:
+                self.add_alias(date_str, filename, os.path.getsize(path))
+                continue
+            if self.add_file(path):
+                imported += 1
+        if imported:
+            logger.info("Imported %s PDF reports from %s", imported, folder)
+        return imported
+
+    def add_alias(self, date_str, filename, size):
+        """Record another file of the report of a date, so the folder import skips it from then on"""
+        with self._lock:
+            entry = self._index[date_str]
+            aliases = [alias for alias in entry.get('aliases', []) if alias['filename'] != filename]
+            entry['aliases'] = sorted(aliases + [{'filename': filename, 'size': size}], key=lambda alias: alias['filename'])
+            self._write_index()
+
+    def has(self, filename, size):
+        """True when a report with this file name and size is stored or recorded as an alias"""
+        with self._lock:
+            return any((entry['filename'] == filename and entry['size'] == size)
+                       or {'filename': filename, 'size': size} in entry.get('aliases', [])
+                       for entry in self._index.values())
+
+    def get(self, date_str):
+        """Index entry (sha256, filename, size) of the report of a date, or None"""
+        with self._lock:
+            entry = self._index.get(date_str)
+        return dict(entry) if entry else None
+
+    def entries(self):
+        """Copy of the date index: date -> sha256, filename and size"""
+        with self._lock:
+            return {date_str: dict(entry) for date_str, entry in self._index.items()}
+
+    def mapping(self):
+        """Date -> original file name of every stored report"""
+        with self._lock:
+            return {date_str: entry['filename'] for date_str, entry in self._index.items()}
+
+    def find(self, sha256):
+        """Path of a stored object, or None when it does not exist"""
+        if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+            return None
+        path = self.object_path(sha256)
+        return path if os.path.exists(path) else None
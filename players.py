@@ -0,0 +1,276 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+import app_logging
+import season_files
+
+logger = app_logging.get_logger('players')
+
+REGISTRY_FILENAME = "players.json"
+DIMENSION_COLUMNS = ['PlayerId', 'Ntsvnr', 'Naam', 'Klasse', 'Club', 'Aliassen']
+CLASS_HISTORY_COLUMNS = ['PlayerId', 'Vanaf', 'Klasse']
+
+
+def normalize_date(value):
+    """ISO date ('2024-09-01') of a date cell (dd/mm/yyyy text or a date), None when missing"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    date = pd.to_datetime(value, dayfirst=True, errors='coerce')
+    return None if pd.isna(date) else date.strftime('%Y-%m-%d')
+
+
+def normalize_ntsvnr(value):
+    """
+    Federation number as a string ('0548'), None when missing.
+
+    Excel and CSV readers turn '0548' into 548 or 548.0, numbers are padded back to 4 digits.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    if not text:
+        return None
+    return text.zfill(4) if text.isdigit() else text
+
+
+class PlayerRegistry:
+    """
+    Player dimension: one integer PlayerId per player, keyed by federation number (Ntsvnr).
+
+    A player keeps every spelling of their name as an alias (with the last date it was
+    used); the current name is the alias used most recently. Players from seasons without
+    Ntsvnr are matched on their aliases and get the number once a result carries it.
+    The class of a player is kept as a history with effective dates, so a class change
+    applies to the games from that date on without rewriting the season files.
+    The registry is kept in path as JSON. Reading a season assigns ids in memory only;
+    save() writes them, from the paths that write season data.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._players = {}
+        self._by_ntsvnr = {}
+        self._by_name = {}
+        self._class_history = None
+        self._unsaved = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                records = json.load(f)
+        except Exception:
+            logger.exception("Could not read player registry %s", self.path)
+            return
+        for record in records:
+            self._index(record)
+
+    def _index(self, player):
+        player.setdefault('Klassen', [])
+        self._players[player['PlayerId']] = player
+        if player['Ntsvnr']:
+            self._by_ntsvnr[player['Ntsvnr']] = player['PlayerId']
+        for name in player['Aliassen']:
+            self._by_name[name] = player['PlayerId']
+
+    def _save(self):
+        records = sorted(self._players.values(), key=lambda player: player['PlayerId'])
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = json.dumps(records, ensure_ascii=False, indent=1).encode('utf-8')
+        season_files.atomic_write(self.path, lambda f: f.write(data))
+
+    def _persist(self):
+        try:
+            self._save()
+            self._unsaved = False
+        except Exception:
+            logger.exception("Could not write player registry %s", self.path)
+
+    def save(self):
+        """Write the players and aliases registered since the last write, if any"""
+        with self._lock:
+            if self._unsaved:
+                self._persist()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._players)
+
+    def _resolve(self, name, ntsvnr, seen):
+        """PlayerId of a (name, Ntsvnr) pair, registering the player or the alias when new"""
+        player_id = self._by_ntsvnr.get(ntsvnr) if ntsvnr else None
+        if player_id is None:
+            player_id = self._by_name.get(name)
+            # The same name with another federation number is another player
+            if player_id is not None and ntsvnr and self._players[player_id]['Ntsvnr'] not in (None, ntsvnr):
+                player_id = None
+        if player_id is None:
+            player_id = max(self._players, default=0) + 1
+            self._players[player_id] = {'PlayerId': player_id, 'Ntsvnr': None, 'Naam': name,
+                                        'Klasse': None, 'Club': None, 'Aliassen': {}, 'Klassen': []}
+            logger.info("New player %s", name, extra={'player_id': player_id, 'ntsvnr': ntsvnr})
+
+        player = self._players[player_id]
+        if ntsvnr and player['Ntsvnr'] is None:
+            player['Ntsvnr'] = ntsvnr
+            self._by_ntsvnr[ntsvnr] = player_id
+        aliases = player['Aliassen']
+        if name not in aliases:
+            if aliases:
+                logger.info("New name %s for %s", name, player['Naam'], extra={'player_id': player_id})
+            aliases[name] = seen
+            self._by_name[name] = player_id
+        elif seen and (aliases[name] is None or seen > aliases[name]):
+            aliases[name] = seen
+        # The current name is the spelling used most recently
+        player['Naam'] = max(aliases, key=lambda alias: aliases[alias] or '')
+        return player_id
+
+    def identify(self, df_season):
+        """
+        Add PlayerId to a season frame and show every player under their current name.
+
+        New players and aliases are registered in memory only, see save().
+
+        Args:
+            df_season (pd.DataFrame): Season frame with Naam, Datum_dt and optionally Ntsvnr.
+
+        Returns:
+            pd.DataFrame: The frame with PlayerId (int32), Naam the current name of the
+                player and Ntsvnr filled in where the player's number is known.
+        """
+        df = df_season.copy()
+        names = df['Naam'].astype(str).str.strip()
+        # '' for rows without a federation number
+        numbers = (df['Ntsvnr'].astype(object).map(normalize_ntsvnr).fillna('') if 'Ntsvnr' in df.columns
+                   else pd.Series('', index=df.index))
+        seen = df['Datum_dt'].dt.strftime('%Y-%m-%d')
+
+        # One lookup per (name, number) pair, in date order so the latest spelling wins
+        pairs = (pd.DataFrame({'Naam': names, 'Ntsvnr': numbers, 'seen': seen})
+                 .groupby(['Naam', 'Ntsvnr'], sort=False)['seen'].max()
+                 .sort_values(kind='stable'))
+        with self._lock:
+            before = json.dumps(self._players, sort_keys=True)
+            pair_ids = {(name, ntsvnr): self._resolve(name, ntsvnr or None, last_seen if isinstance(last_seen, str) else None)
+                        for (name, ntsvnr), last_seen in pairs.items()}
+            players = {player_id: dict(player) for player_id, player in self._players.items()}
+            # Kept in memory, save() writes them
+            if json.dumps(self._players, sort_keys=True) != before:
+                self._unsaved = True
+
+        player_ids = pd.Series([pair_ids[pair] for pair in zip(names, numbers)], index=df.index)
+        # Always the last columns, whether or not the workbook had Ntsvnr
+        df = df.drop(columns=['PlayerId', 'Ntsvnr'], errors='ignore')
+        df['PlayerId'] = player_ids.astype('int32')
+        df['Naam'] = player_ids.map(lambda player_id: players[player_id]['Naam'])
+        df['Ntsvnr'] = player_ids.map(lambda player_id: players[player_id]['Ntsvnr'])
+        return df
+
+    def update_members(self, df_leden, effective=None):
+        """
+        Take the class and club of the players from the member table (matched on Ntsvnr, else on name).
+
+        A class that differs from the last one in the class history is added to the history,
+        effective from the date in the VANAF column of the member or else from effective.
+
+        Args:
+            df_leden (pd.DataFrame): Member table (Naam, KLASSE, CLUB, optionally Ntsvnr and VANAF).
+            effective (str): ISO date a class change applies from when the member has no VANAF.
+
+        Returns:
+            bool: True when the class history changed.
+        """
+        if df_leden is None or df_leden.empty or 'Naam' not in df_leden.columns:
+            return False
+        columns = {'KLASSE': 'Klasse', 'CLUB': 'Club'}
+        with self._lock:
+            changed = history_changed = False
+            for member in df_leden.to_dict('records'):
+                ntsvnr = normalize_ntsvnr(member.get('Ntsvnr'))
+                player_id = self._by_ntsvnr.get(ntsvnr) if ntsvnr else None
+                if player_id is None:
+                    player_id = self._by_name.get(str(member['Naam']).strip())
+                if player_id is None:
+                    continue
+                player = self._players[player_id]
+                for member_column, column in columns.items():
+                    value = member.get(member_column)
+                    value = None if value is None or pd.isna(value) else str(value)
+                    if player[column] != value:
+                        player[column] = value
+                        changed = True
+                if player['Klasse'] is not None and self._add_class(player, player['Klasse'],
+                                                                    normalize_date(member.get('VANAF', member.get('Vanaf'))) or effective):
+                    changed = history_changed = True
+            if history_changed:
+                self._class_history = None
+            if changed:
+                self._persist()
+        return history_changed
+
+    def _add_class(self, player, klasse, vanaf):
+        """Add a class to the class history of a player, True when the history changed"""
+        history = player['Klassen']
+        current = [entry for entry in history if vanaf is None or entry[0] is None or entry[0] <= vanaf]
+        if current and current[-1][1] == klasse:
+            return False
+        # A new class from the same date replaces the old one
+        history[:] = sorted([entry for entry in history if entry[0] != vanaf] + [[vanaf, klasse]],
+                            key=lambda entry: entry[0] or '')
+        logger.info("Class %s for %s from %s", klasse, player['Naam'], vanaf or 'the start',
+                    extra={'player_id': player['PlayerId']})
+        return True
+
+    def class_history(self):
+        """
+        The class history: PlayerId, Vanaf (date the class applies from) and Klasse, sorted on Vanaf.
+
+        Built once per version of the history.
+        """
+        with self._lock:
+            if self._class_history is None:
+                rows = [(player_id, vanaf or '1900-01-01', klasse)
+                        for player_id, player in self._players.items() for vanaf, klasse in player['Klassen']]
+                history = pd.DataFrame(rows, columns=CLASS_HISTORY_COLUMNS)
+                history['PlayerId'] = history['PlayerId'].astype('int32')
+                history['Vanaf'] = pd.to_datetime(history['Vanaf'], format='%Y-%m-%d')
+                self._class_history = history.sort_values('Vanaf', kind='stable').reset_index(drop=True)
+            return self._class_history
+
+    def classes_as_of(self, df_season):
+        """
+        Class of every row of a season frame from the class history, as of the date of the game.
+
+        One as-of join of the rows (PlayerId, Datum_dt) with the history.
+
+        Returns:
+            pd.Series: Class per row (index of df_season), None where the history has no
+                class for the player at that date.
+        """
+        classes = pd.Series(None, index=df_season.index, dtype=object)
+        history = self.class_history()
+        if history.empty:
+            return classes
+        rows = pd.DataFrame({'PlayerId': df_season['PlayerId'].to_numpy(dtype='int32'),
+                             'Datum_dt': df_season['Datum_dt'].to_numpy(dtype='datetime64[ns]'),
+                             'row': range(len(df_season))})
+        rows = rows[rows['Datum_dt'].notna()].sort_values('Datum_dt', kind='stable')
+        joined = pd.merge_asof(rows, history, left_on='Datum_dt', right_on='Vanaf', by='PlayerId', direction='backward')
+        classes.iloc[joined['row'].to_numpy()] = joined['Klasse'].to_numpy()
+        return classes
+
+    def dimension(self):
+        """The player dimension table: PlayerId, Ntsvnr, Naam, Klasse, Club and the other spellings"""
+        with self._lock:
+            rows = [dict(player, Aliassen=", ".join(alias for alias in player['Aliassen'] if alias != player['Naam']))
+                    for player in self._players.values()]
+        return pd.DataFrame(rows, columns=DIMENSION_COLUMNS).sort_values('PlayerId').reset_index(drop=True)
@@ -0,0 +1,200 @@
+import bisect
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import app_logging
+
+logger = app_logging.get_logger('search')
+
+# Bump when the tokenizer or the stored index changes, the index is then rebuilt
+INDEX_VERSION = 1
+INDEX_FILENAME = "index.pkl"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+MIN_TOKEN_LENGTH = 2
+FRAGMENT_CHARS = 60
+
+
+def tokenize(text):
+    """Lowercase words of a text (letters and digits), shorter than MIN_TOKEN_LENGTH are skipped"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+def extract_report_text(path):
+    """Text of all pages of a report, or None when it can not be read"""
+    import PyPDF2  # Imported on first use to keep the cold start fast
+    try:
+        reader = PyPDF2.PdfReader(path)
+        return "\n".join(page.extract_text() for page in reader.pages)
+    except Exception:
+        logger.exception("Could not extract the text of %s", path)
+        return None
+
+
+class ReportIndex:
+    """
+    Inverted index over the text of the match reports.
+
+    Documents are the stored PDFs (keyed by sha256); the postings map every token to the
+    documents it occurs in with its count. The index is kept in index_dir and updated
+    incrementally: only reports that are not indexed yet are read.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._documents = {}
+        self._postings = {}
+        self._vocabulary = []
+        self._load()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.index_dir, INDEX_FILENAME)
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'rb') as f:
+                stored = pickle.load(f)
+        except Exception:
+            logger.exception("Could not read report index %s", self.index_path)
+            return
+        if stored.get('version') != INDEX_VERSION:
+            logger.info("Ignoring report index with version %s", stored.get('version'))
+            return
+        self._documents = stored['documents']
+        self._postings = stored['postings']
+        self._vocabulary = sorted(self._postings)
+
+    def _save(self):
+        with self._lock:
+            stored = {'version': INDEX_VERSION, 'documents': self._documents, 'postings': self._postings}
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._documents)
+
+    def add_document(self, sha256, date_str, filename, text):
+        """Index the text of one report"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(sha256)
+            self._documents[sha256] = {'date': date_str, 'filename': filename, 'text': text}
+            for token, count in counts.items():
+                self._postings.setdefault(token, {})[sha256] = count
+            self._vocabulary = sorted(self._postings)
+
+    def _remove(self, sha256):
+        document = self._documents.pop(sha256, None)
+        if document is None:
+            return
+        for token in set(tokenize(document['text'])):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(sha256, None)
+                if not postings:
+                    del self._postings[token]
+
+    def update(self, entries, object_path, max_workers=None):
+        """
+        Bring the index in line with the report store.
+
+        Args:
+            entries (dict): Date -> store entry (sha256, filename, size).
+            object_path (callable): sha256 -> path of the stored PDF.
+            max_workers (int): Worker processes for the text extraction (default: up to 4).
+
+        Returns:
+            int: Number of reports that were indexed.
+        """
+        with self._update_lock:
+            start = time.perf_counter()
+            wanted = {entry['sha256']: (date_str, entry['filename']) for date_str, entry in entries.items()}
+            with self._lock:
+                removed = [sha256 for sha256 in self._documents if sha256 not in wanted]
+                for sha256 in removed:
+                    self._remove(sha256)
+                # A report that moved to another date keeps its text, only the date changes
+                for sha256, document in self._documents.items():
+                    document['date'], document['filename'] = wanted[sha256]
+                missing = [sha256 for sha256 in wanted if sha256 not in self._documents]
+
+            if missing:
+                paths = [object_path(sha256) for sha256 in missing]
+                max_workers = max_workers or min(4, os.cpu_count() or 1)
+                if max_workers == 1 or len(paths) == 1:
+                    texts = map(extract_report_text, paths)
+                    self._add_texts(missing, texts, wanted)
+                else:
+                    # Text extraction is pure Python, so the reports are spread over worker processes
+                    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                        self._add_texts(missing, executor.map(extract_report_text, paths), wanted)
+
+            if missing or removed:
+                self._save()
+                logger.info("Updated report index", extra={
+                    'indexed': len(missing), 'removed': len(removed), 'documents': len(self),
+                    'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+            return len(missing)
+
+    def _add_texts(self, shas, texts, wanted):
+        for sha256, text in zip(shas, texts):
+            if text is not None:
+                self.add_document(sha256, *wanted[sha256], text)
+
+    def _matching_documents(self, term):
+        """Documents containing a token that starts with term, with the summed counts"""
+        matches = Counter()
+        position = bisect.bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(term):
+            matches.update(self._postings[self._vocabulary[position]])
+            position += 1
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Find the reports containing all words of the query (a word also matches longer words it starts).
+
+        Returns:
+            list: Dicts with Datum, Bestand, Treffers and Fragment, best match first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores = None
+            for term in terms:
+                matches = self._matching_documents(term)
+                scores = matches if scores is None else Counter(
+                    {sha256: scores[sha256] + count for sha256, count in matches.items() if sha256 in scores})
+                if not scores:
+                    return []
+            hits = sorted(scores.items(), key=lambda item: (-item[1], self._documents[item[0]]['date']))[:limit]
+            return [{'Datum': self._documents[sha256]['date'],
+                     'Bestand': self._documents[sha256]['filename'],
+                     'Treffers': count,
+                     'Fragment': fragment(self._documents[sha256]['text'], terms[0])}
+                    for sha256, count in hits]
+
+
+def fragment(text, term):
+    """Text around the first occurrence of term, on one line"""
+    position = text.lower().find(term)
+    if position < 0:
+        return ""
+    start = max(0, position - FRAGMENT_CHARS)
+    snippet = " ".join(text[start:position + len(term) + FRAGMENT_CHARS].split())
+    return ("…" if start > 0 else "") + snippet + "…"
@@ -0,0 +1,148 @@
+"""
+Crash-safe writes of the season workbooks.
+
+A season file is never written in place: the new workbook is written to a temporary file
+in the same folder, flushed to disk and then renamed over the old one, so a reader sees
+either the old or the new workbook and a crash never leaves a truncated one.
+
+Writers of a season (uploads, deletes, the Dropbox sync) hold its lock from reading the
+file until it is written, so one write never loses another. The lock is a lock file next
+to the season (flock, so it also holds between worker processes) and is re-entrant
+within a thread.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+import app_logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock only holds within the process
+    fcntl = None
+
+logger = app_logging.get_logger('store')
+
+SEASON_SHEET = 'Globaal'
+
+
+class SeasonLock:
+    """Exclusive lock of one season file, between threads and between processes"""
+
+    def __init__(self, filename):
+        path = os.path.abspath(filename)
+        self.filename = filename
+        self.lock_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.lock")
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self):
+        start = time.perf_counter()
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.lock_path, 'a+')
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except Exception:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        waited_ms = round((time.perf_counter() - start) * 1000, 1)
+        if waited_ms >= 100:
+            logger.info("Waited for the lock of %s", self.filename, extra={'duration_ms': waited_ms})
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.release()
+
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def season_lock(filename):
+    """The lock of a season file (one per file in this process)"""
+    key = os.path.abspath(filename)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = SeasonLock(filename)
+        return lock
+
+
+def signature(filename):
+    """(modification time, size) of a file, None when it does not exist; changes with every write"""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _fsync_directory(directory):
+    # Makes the rename itself durable; not possible on Windows
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, write):
+    """
+    Replace a file atomically.
+
+    Args:
+        path (str): File to write.
+        write (callable): write(f) writes the new content to the binary file object f.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def write_season(filename, df_season):
+    """
+    Write a season frame to its workbook (sheet Globaal) under the season lock.
+
+    Returns:
+        tuple: Signature of the written file.
+    """
+    start = time.perf_counter()
+    with season_lock(filename):
+        atomic_write(filename, lambda f: df_season.to_excel(f, sheet_name=SEASON_SHEET, index=False))
+        written = signature(filename)
+    logger.info("Wrote season %s", filename, extra={
+        'rows': len(df_season), 'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+    return written
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import pickle
+import time
+
+import app_logging
+
+logger = app_logging.get_logger('snapshot')
+
+# Bump when the content of the snapshot changes, older snapshots are then ignored
+SNAPSHOT_VERSION = 4
+SNAPSHOT_FILENAME = "current_season.pkl"
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """Return the sha256 hex digest of a file, or None when it does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path(data_dir):
+    return os.path.join(data_dir, "snapshots", SNAPSHOT_FILENAME)
+
+
+def save_snapshot(data_dir, season_filename, views, source_hash):
+    """
+    Write the computed views of a season to the persistent data dir.
+
+    Args:
+        data_dir (str): Persistent data directory.
+        season_filename (str): Season workbook the views were computed from.
+        views (dict): Computed views (dataframes, PDF index, game list, ...).
+        source_hash (str): sha256 of the season workbook, used to validate the snapshot later.
+
+    Returns:
+        bool: True when the snapshot was written.
+    """
+    path = snapshot_path(data_dir)
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'created': time.time(),
+        'season_filename': season_filename,
+        'source_hash': source_hash,
+        'views': views,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logger.info("Saved snapshot of %s", season_filename, extra={'bytes': os.path.getsize(path)})
+        return True
+    except Exception:
+        logger.exception("Could not save snapshot of %s", season_filename)
+        return False
+
+
+def load_snapshot(data_dir):
+    """Return the stored snapshot dict, or None when there is no usable snapshot"""
+    path = snapshot_path(data_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        logger.exception("Could not read snapshot %s", path)
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.info("Ignoring snapshot with version %s", snapshot.get('version'))
+        return None
+    return snapshot
+
+
+def is_valid(snapshot, season_filename, source_hash):
+    """A snapshot is valid when it was computed from the same season file with the same content"""
+    return (snapshot is not None
+            and snapshot.get('season_filename') == season_filename
+            and source_hash is not None
+            and snapshot.get('source_hash') == source_hash)
@@ -0,0 +1,180 @@
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+import app_logging
+import season_snapshot
+
+logger = app_logging.get_logger('store')
+
+# Bump when the stored aggregates change, older entries are then recomputed
+STORE_VERSION = 2
+
+AGGREGATE_COLUMNS = ['Naam', 'Klasse', 'Wedstrijden', '%', 'Gem. RP', 'Tot. punten']
+METRICS = ['%', 'Gem. RP', 'Tot. punten']
+
+
+def season_sort_key(filename):
+    """Chronological sort key of a season file: a season starts in September, a summer in July"""
+    name = os.path.basename(filename).replace('.xlsx', '')
+    try:
+        if name.startswith('Zomer '):
+            return int(name.split(' ')[1]), 7
+        if name.startswith('Globaal '):
+            return int(name.split(' ')[1].split('-')[0]), 9
+    except ValueError:
+        pass
+    return 0, 0
+
+
+def season_aggregates(df_gen_info):
+    """
+    Reduce the general info table of a season to the player aggregates kept in the store.
+
+    For a summer season the ranking percentage is the best-5 percentage.
+    """
+    df = df_gen_info.copy()
+    if '% (Beste 5)' in df.columns:
+        df['%'] = df['% (Beste 5)']
+    df = df[AGGREGATE_COLUMNS].copy()
+    df['Naam'] = df['Naam'].astype(str)
+    df['Klasse'] = df['Klasse'].astype(str)
+    df['Plaats'] = df['%'].rank(ascending=False, method='min').astype(int)
+    return df.sort_values('Plaats', kind='stable').reset_index(drop=True)
+
+
+class SeasonStore:
+    """
+    Per-season player aggregates, computed once per version of a season file.
+
+    Entries are kept in memory and in store_dir (one pickle per season) and are only
+    used while the sha256 of the season file still matches.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, filename):
+        return os.path.join(self.store_dir, os.path.basename(filename) + ".pkl")
+
+    def _read(self, filename):
+        path = self._path(filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            logger.exception("Could not read store entry %s", path)
+            return None
+        return entry if entry.get('version') == STORE_VERSION else None
+
+    def put(self, filename, df_gen_info, source_hash=None):
+        """Store the aggregates of a season from its general info table"""
+        source_hash = source_hash or season_snapshot.file_hash(filename)
+        entry = {'version': STORE_VERSION, 'source_hash': source_hash,
+                 'aggregates': season_aggregates(df_gen_info)}
+        with self._lock:
+            self._entries[filename] = entry
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            tmp_path = self._path(filename) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(filename))
+        except Exception:
+            logger.exception("Could not write store entry for %s", filename)
+        return entry['aggregates']
+
+    def invalidate(self):
+        """Drop all entries, the aggregates are computed again when asked for (the classes changed)"""
+        with self._lock:
+            self._entries.clear()
+        if not os.path.isdir(self.store_dir):
+            return
+        for name in os.listdir(self.store_dir):
+            if name.endswith(".pkl"):
+                try:
+                    os.remove(os.path.join(self.store_dir, name))
+                except OSError:
+                    logger.exception("Could not remove store entry %s", name)
+
+    def get(self, filename, compute=None):
+        """
+        Return the aggregates of a season.
+
+        Args:
+            filename (str): Season workbook.
+            compute (callable): Optional compute(filename) -> general info table, used
+                when there is no valid entry yet.
+
+        Returns:
+            pd.DataFrame: Player aggregates, or None when unavailable.
+        """
+        source_hash = season_snapshot.file_hash(filename)
+        with self._lock:
+            entry = self._entries.get(filename)
+        if entry is None:
+            entry = self._read(filename)
+            if entry is not None:
+                with self._lock:
+                    self._entries[filename] = entry
+        if entry is not None and (source_hash is None or entry['source_hash'] == source_hash):
+            return entry['aggregates']
+        if compute is None or source_hash is None:
+            return None
+        logger.info("Computing aggregates of %s", filename)
+        return self.put(filename, compute(filename), source_hash)
+
+
+def compare_seasons(aggregates, metric):
+    """
+    Put one metric of several seasons side by side, with the change between consecutive seasons.
+
+    Args:
+        aggregates (dict): Season label -> aggregates, in the order to compare.
+        metric (str): One of METRICS.
+
+    Returns:
+        pd.DataFrame: Naam, Klasse (of the last season), one column per season and a
+            'Δ <label>' column per later season.
+    """
+    labels = list(aggregates)
+    df_compare = None
+    for label in labels:
+        df = aggregates[label][['Naam', 'Klasse', metric]].rename(columns={metric: label, 'Klasse': f'Klasse {label}'})
+        df_compare = df if df_compare is None else df_compare.merge(df, on='Naam', how='outer')
+    if df_compare is None:
+        return pd.DataFrame()
+
+    klasse_columns = [f'Klasse {label}' for label in labels]
+    # Class of the most recent season the player played in
+    df_compare['Klasse'] = df_compare[klasse_columns[::-1]].bfill(axis=1).iloc[:, 0]
+    df_compare = df_compare.drop(columns=klasse_columns)
+
+    for previous, label in zip(labels, labels[1:]):
+        df_compare[f'Δ {label}'] = (df_compare[label] - df_compare[previous]).round(2)
+
+    df_compare = df_compare.sort_values(labels[-1], ascending=False, na_position='last', kind='stable')
+    if all(pd.api.types.is_integer_dtype(aggregates[label][metric]) for label in labels):
+        # Like make_pivot(force_int=True): whole numbers, blank where the player did not play
+        value_columns = [col for col in df_compare.columns if col not in ('Naam', 'Klasse') and not col.startswith('Klasse ')]
+        df_compare[value_columns] = df_compare[value_columns].apply(
+            lambda col: col.map(lambda x: int(x) if pd.notna(x) else ''))
+
+    return (df_compare[['Naam', 'Klasse'] + [col for col in df_compare.columns if col not in ('Naam', 'Klasse')]]
+            .reset_index(drop=True))
+
+
+def season_deltas(df_before, df_after):
+    """Change of every metric per player between two seasons (players of both seasons only)"""
+    df = df_before[['Naam'] + METRICS].merge(df_after[['Naam', 'Klasse'] + METRICS], on='Naam',
+                                             suffixes=(' voor', ' na'))
+    for metric in METRICS:
+        df[f'Δ {metric}'] = (df[f'{metric} na'] - df[f'{metric} voor']).round(2)
+    return df[['Naam', 'Klasse'] + [f'Δ {metric}' for metric in METRICS]].sort_values('Δ %', ascending=False) \
+        .reset_index(drop=True)
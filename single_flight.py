@@ -0,0 +1,79 @@
+import threading
+import time
+
+import app_logging
+
+logger = app_logging.get_logger('flight')
+
+
+class _Call:
+    """One running call: its result or error and the callers waiting for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.thread = threading.get_ident()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls per key: one call runs, callers that arrive meanwhile wait for it.
+
+    Used for expensive work that gives the same result for everyone asking at the same
+    time (loading a season, syncing with Dropbox). A caller that arrives after the call
+    finished starts a new one, results are not cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for key is running, then return the result of that call.
+
+        An exception of the running call is raised in every waiting caller. A call for a key
+        made from inside the running call for that key (same thread) runs directly.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            elif call.thread == threading.get_ident():
+                call, leader = None, True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if call is None:
+            return fn(*args, **kwargs)
+
+        if not leader:
+            start = time.perf_counter()
+            call.done.wait()
+            logger.debug("Waited for %s", key, extra={'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            call.done.set()
+            if waiters:
+                logger.info("Coalesced %s", key, extra={'waiters': waiters})
+
+    def running(self):
+        """Keys of the calls that are running"""
+        with self._lock:
+            return list(self._calls)
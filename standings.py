@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+VALID_CLASSES = ['A', 'B', 'C']
+
+
+def _best_n_percentages(totals, maxima, played, best_n):
+    """
+    Summer percentage after every game, updated game by game.
+
+    A players x best_n array keeps the best game percentages so far; every game only
+    replaces the lowest kept percentage of the players that played it. Players with
+    best_n games or fewer get their overall percentage, like tools.calculate_summer_percentage.
+    """
+    n_games, n_players = totals.shape
+    with np.errstate(divide='ignore', invalid='ignore'):
+        game_pct = np.where(maxima > 0, totals / maxima * 100, 0.0)
+
+    best = np.full((n_players, best_n), -np.inf)
+    best_mean = np.full((n_games, n_players), np.nan)
+    for g in range(n_games):
+        lowest = best.argmin(axis=1)
+        rows = np.nonzero(played[g] & (game_pct[g] > best[np.arange(n_players), lowest]))[0]
+        best[rows, lowest[rows]] = game_pct[g, rows]
+        best_mean[g] = np.where(np.isfinite(best), best, 0).sum(axis=1) / best_n
+
+    games_played = np.cumsum(played, axis=0)
+    cum_totals = np.cumsum(totals, axis=0)
+    cum_maxima = np.cumsum(maxima, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overall = np.where(cum_maxima > 0, cum_totals / cum_maxima * 100, 0.0)
+    return np.where(games_played > best_n, best_mean, overall)
+
+
+class Standings:
+    """
+    Cumulative standings of a season: the aggregates of every player after every game.
+
+    All measures are numpy arrays indexed [game, player] and hold the running totals up
+    to and including that game (games in GameNr order), so the standings as of any game
+    are a row of the arrays instead of a recomputation of the season.
+    """
+
+    def __init__(self, game_numbers, dates, players, classes, played, totaal, theomax, rp, punten, best_n=None):
+        self.game_numbers = np.asarray(game_numbers)
+        self.dates = list(dates)
+        self.players = np.asarray(players, dtype=object)
+        self.classes = np.asarray(classes, dtype=object)
+        self.best_n = best_n
+
+        self.games_played = np.cumsum(played, axis=0)
+        self.total_score = np.cumsum(totaal, axis=0)
+        self.total_max = np.cumsum(theomax, axis=0)
+        self.total_points = np.cumsum(punten, axis=0)
+        total_rp = np.cumsum(rp, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.pct = np.round(np.where(self.total_max > 0, self.total_score / self.total_max * 100, np.nan), 2)
+            self.avg_rp = np.where(self.games_played > 0, total_rp / self.games_played, np.nan)
+        self.best_pct = (np.round(_best_n_percentages(totaal, theomax, played, best_n), 2)
+                         if best_n else None)
+
+        self._game_index = {date: i for i, date in enumerate(self.dates)}
+        self._ranks = {}
+
+    def game_index(self, date_str):
+        return self._game_index.get(date_str)
+
+    def metric(self, name):
+        """Array [game, player] of a ranking metric: '%', '% (Beste 5)', 'Gem. RP' or 'Tot. punten'"""
+        if name == '% (Beste 5)':
+            return self.best_pct if self.best_pct is not None else self.pct
+        return {'%': self.pct, '% (Alle)': self.pct, 'Gem. RP': self.avg_rp, 'Tot. punten': self.total_points}[name]
+
+    def table(self, g):
+        """Aggregates of the players that played up to and including game index g"""
+        active = self.games_played[g] > 0
+        df = pd.DataFrame({
+            'Naam': self.players[active],
+            'Klasse': self.classes[active],
+            'Wedstrijden': self.games_played[g, active],
+            'Tot. T. MAX': self.total_max[g, active].astype(np.int64),
+            'Tot. Score': self.total_score[g, active].astype(np.int64),
+            '%': self.pct[g, active],
+            'Gem. RP': self.avg_rp[g, active],
+            'Tot. punten': self.total_points[g, active].astype(np.int64),
+        })
+        if self.best_pct is not None:
+            df.insert(df.columns.get_loc('%'), '% (Alle)', df.pop('%'))
+            df.insert(df.columns.get_loc('% (Alle)') + 1, '% (Beste 5)', self.best_pct[g, active])
+        return df
+
+    def ranks(self, metric):
+        """
+        Place of every player after every game (array [game, player], NaN before their first game).
+
+        Computed once per metric for all games at the same time.
+        """
+        if metric not in self._ranks:
+            active = self.games_played > 0
+            # Players without a value come after the others, players that did not play yet last
+            values = np.where(active, np.nan_to_num(self.metric(metric), nan=np.finfo(np.float64).min), -np.inf)
+            # Players are in alphabetical order, the stable sort keeps that order on ties
+            order = np.argsort(-values, axis=1, kind='stable')
+            places = np.empty(values.shape)
+            np.put_along_axis(places, order, np.arange(1, values.shape[1] + 1)[np.newaxis, :], axis=1)
+            self._ranks[metric] = np.where(active, places, np.nan)
+        return self._ranks[metric]
+
+    def places(self, g, metric):
+        """Place (1 = first) of every player that played up to game index g, ranked on metric"""
+        if g < 0:
+            return pd.Series(dtype='int64')
+        active = self.games_played[g] > 0
+        values = pd.Series(self.metric(metric)[g, active], index=self.players[active])
+        # Ties keep the alphabetical order, like the stable sort of tools.process_final_df
+        ordered = values.sort_values(ascending=False, kind='stable', na_position='last')
+        return pd.Series(np.arange(1, len(ordered) + 1), index=ordered.index)
+
+
+def build_standings(df_season, best_n=None):
+    """
+    Build the cumulative Standings of a season in one pass over the season frame.
+
+    Args:
+        df_season (pd.DataFrame): Season frame (one row per player per game).
+        best_n (int): For summer seasons, the number of best games that count.
+
+    Returns:
+        Standings: or None when there is no data.
+    """
+    if df_season is None or df_season.empty:
+        return None
+    df = df_season[df_season['KLASSE'].isin(VALID_CLASSES)]
+    if df.empty:
+        return None
+
+    games = df_season[['GameNr', 'Datum']].drop_duplicates('GameNr').sort_values('GameNr')
+    game_codes = pd.Categorical(df['GameNr'], categories=games['GameNr']).codes
+    player_cat = pd.Categorical(df['Naam'].astype(str))
+    player_codes = player_cat.codes
+
+    shape = (len(games), len(player_cat.categories))
+    played = np.zeros(shape, dtype=bool)
+    played[game_codes, player_codes] = True
+    arrays = {}
+    for column in ['Totaal', 'TheoMax', 'RP', 'Punten']:
+        values = np.zeros(shape, dtype=np.float64)
+        values[game_codes, player_codes] = df[column].to_numpy(dtype=np.float64, na_value=0)
+        arrays[column] = values
+
+    # Class of a player: the one of their most recent game
+    classes = (pd.DataFrame({'Naam': player_codes, 'GameNr': df['GameNr'].to_numpy(), 'Klasse': df['KLASSE'].astype(str).to_numpy()})
+               .sort_values('GameNr', kind='stable')
+               .groupby('Naam')['Klasse'].last()
+               .reindex(range(len(player_cat.categories))).to_numpy())
+
+    return Standings(games['GameNr'].to_numpy(), games['Datum'].astype(str).tolist(), player_cat.categories.to_numpy(),
+                     classes, played, arrays['Totaal'], arrays['TheoMax'], arrays['RP'], arrays['Punten'], best_n)
+
+
+def movement(previous_places, names):
+    """
+    Change of place since the previous game, as shown in the ranking tables.
+
+    Args:
+        previous_places (pd.Series): Place per player after the previous game.
+        names (iterable): Players in their current order (the first is in first place).
+
+    Returns:
+        list: '▲ n' for players that went up, '▼ n' for down, '=' for no change and
+            'nieuw' for players without a previous place; all '' when there is no previous game.
+    """
+    names = list(names)
+    if previous_places.empty:
+        return [''] * len(names)
+    result = []
+    for place, name in enumerate(names, start=1):
+        previous = previous_places.get(name)
+        if previous is None:
+            result.append('nieuw')
+        elif previous > place:
+            result.append(f'▲ {previous - place}')
+        elif previous < place:
+            result.append(f'▼ {place - previous}')
+        else:
+            result.append('=')
+    return result
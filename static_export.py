@@ -0,0 +1,231 @@
+import html
+import json
+import os
+import shutil
+import time
+import uuid
+
+import pandas as pd
+
+import api
+import app_logging
+
+logger = app_logging.get_logger('export')
+
+MANIFEST_FILENAME = "manifest.json"
+
+# Columns shown as whole numbers and as numbers with 2 decimals, like make_table
+INT_COLUMNS = ['Tot. T. MAX', 'Tot. Score', 'Tot. punten', 'Wedstrijden', 'Scrabbles',
+               "Solo's", 'S.scr', 'Nulscores', 'Tot. beurten', 'Max. scores']
+
+STYLE = """
+body { font-family: Arial, sans-serif; margin: 20px; color: #2c3e50; }
+nav a { margin-right: 16px; font-weight: bold; color: #2c3e50; }
+h1 { font-size: 24px; } h2 { font-size: 20px; margin-top: 28px; }
+table { border-collapse: collapse; font-size: 14px; margin-bottom: 24px; }
+th { background: #2c3e50; color: white; padding: 6px 8px; border: 1px solid #34495e; position: sticky; top: 0; }
+td { padding: 6px 8px; border: 1px solid #bdc3c7; text-align: right; white-space: nowrap; }
+td.text { text-align: left; font-weight: bold; }
+tr:nth-child(even) td { background: #f8f9fa; }
+td.telt-niet { color: #999999; font-style: italic; }
+.filters button { margin: 0 6px 12px 0; padding: 4px 12px; }
+.generated { color: #7f8c8d; font-size: 12px; }
+@media print { nav, .filters { display: none; } }
+"""
+
+# Show only the rows of one class (rows carry data-klasse)
+FILTER_SCRIPT = """
+function filterKlasse(klasse) {
+  document.querySelectorAll('tr[data-klasse]').forEach(function (row) {
+    row.style.display = (!klasse || row.dataset.klasse === klasse) ? '' : 'none';
+  });
+}
+"""
+
+PAGES = [
+    ('index.html', 'Overzicht'),
+    ('percent.html', 'Ranking Percent'),
+    ('rp.html', 'Ranking RP'),
+    ('punten.html', 'Ranking Punten'),
+    ('grafieken.html', 'Grafieken'),
+]
+
+
+def format_cell(value, column):
+    if value is None or value == '' or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    if isinstance(value, float):
+        return f"{value:.0f}" if column in INT_COLUMNS else f"{value:.2f}"
+    return str(value)
+
+
+def table_html(df, mask_prefix=None):
+    """
+    HTML table of a ranking.
+
+    Args:
+        df (pd.DataFrame): The table as shown in the app.
+        mask_prefix (str): Prefix of hidden mask columns: a cell is shown as not counting
+            when the mask column of its column is 1 (summer best-5 rule).
+    """
+    mask_columns = [col for col in df.columns if mask_prefix and str(col).startswith(mask_prefix)]
+    columns = [col for col in df.columns if col not in mask_columns]
+    masked = {col[len(mask_prefix):]: col for col in mask_columns}
+    has_klasse = 'Klasse' in df.columns
+
+    lines = ["<table>", "<thead><tr>" + "".join(f"<th>{html.escape(str(col))}</th>" for col in columns) + "</tr></thead>",
+             "<tbody>"]
+    for row in df.to_dict('records'):
+        klasse = f' data-klasse="{html.escape(str(row["Klasse"]))}"' if has_klasse else ""
+        cells = []
+        for col in columns:
+            value = row[col]
+            classes = []
+            if isinstance(value, str) and col in ('Naam', 'Klasse'):
+                classes.append("text")
+            if col in masked and row[masked[col]] == 1:
+                classes.append("telt-niet")
+            class_attr = f' class="{" ".join(classes)}"' if classes else ""
+            cells.append(f"<td{class_attr}>{html.escape(format_cell(value, col))}</td>")
+        lines.append(f"<tr{klasse}>" + "".join(cells) + "</tr>")
+    lines.append("</tbody></table>")
+    return "\n".join(lines)
+
+
+def klasse_filter_html(df):
+    if 'Klasse' not in df.columns:
+        return ""
+    buttons = [f'<button onclick="filterKlasse(\'{html.escape(str(klasse))}\')">Klasse {html.escape(str(klasse))}</button>'
+               for klasse in sorted(df['Klasse'].dropna().astype(str).unique())]
+    return '<div class="filters">' + "".join(buttons) + '<button onclick="filterKlasse(null)">Alle</button></div>'
+
+
+def page_html(title, season_label, body, generated):
+    nav = "".join(f'<a href="{filename}">{html.escape(label)}</a>' for filename, label in PAGES)
+    return f"""<!DOCTYPE html>
+<html lang="nl">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)} - {html.escape(season_label)}</title>
+<link rel="stylesheet" href="style.css">
+<script>{FILTER_SCRIPT}</script>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{html.escape(title)} <small>{html.escape(season_label)}</small></h1>
+{body}
+<p class="generated">Bijgewerkt op {html.escape(generated)}</p>
+</body>
+</html>
+"""
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def build_bundle(target_dir, season, version, tables, figures, reports, mask_prefix=None):
+    """
+    Render the rankings of a season to a static HTML/JSON bundle.
+
+    The bundle is written next to target_dir and then swapped in, so a file server
+    never serves a half written bundle. All links are relative.
+
+    Args:
+        target_dir (str): Directory of the bundle.
+        season (str): Season file name.
+        version (int): Data version the tables belong to (written to the manifest).
+        tables (dict): overview, percent, rp, punten and games dataframes.
+        figures (list): Plotly figures for the graphs page.
+        reports (list): Dicts with date, filename and path of the PDF reports.
+        mask_prefix (str): Prefix of the hidden summer mask columns of the percent table.
+
+    Returns:
+        dict: The manifest of the bundle.
+    """
+    start = time.perf_counter()
+    season_label = os.path.basename(season).replace('.xlsx', '')
+    generated = time.strftime('%d/%m/%Y %H:%M')
+    parent = os.path.dirname(os.path.abspath(target_dir))
+    os.makedirs(parent, exist_ok=True)
+    build_dir = os.path.join(parent, f".{os.path.basename(target_dir)}-{uuid.uuid4().hex[:8]}")
+    os.makedirs(os.path.join(build_dir, "data"))
+    os.makedirs(os.path.join(build_dir, "reports"))
+
+    try:
+        _write(os.path.join(build_dir, "style.css"), STYLE)
+
+        # JSON of every table, the same rows as the API serves
+        for name, df in tables.items():
+            if mask_prefix:
+                df = df.drop(columns=[col for col in df.columns if str(col).startswith(mask_prefix)])
+            _write(os.path.join(build_dir, "data", f"{name}.json"), "".join(api.iter_json(api.plain_floats(df))))
+
+        report_links = []
+        for report in reports:
+            target_name = os.path.basename(report['path'])
+            _link_or_copy(report['path'], os.path.join(build_dir, "reports", target_name))
+            report_links.append(f'<li><a href="reports/{html.escape(target_name)}">{html.escape(report["date"])}</a> '
+                                f'({html.escape(report["filename"])})</li>')
+        reports_html = ("<h2>Wedstrijdverslagen</h2><ul>" + "".join(report_links) + "</ul>") if report_links else ""
+
+        pages = {
+            'index.html': ('Overzicht', klasse_filter_html(tables['overview']) + table_html(tables['overview']) + reports_html),
+            'percent.html': ('Ranking Percent', klasse_filter_html(tables['percent']) + table_html(tables['percent'], mask_prefix)),
+            'rp.html': ('Ranking RP', klasse_filter_html(tables['rp']) + table_html(tables['rp'])),
+            'punten.html': ('Ranking Punten', klasse_filter_html(tables['punten']) + table_html(tables['punten'])),
+            'grafieken.html': ('Grafieken', "\n".join(
+                figure.to_html(full_html=False, include_plotlyjs='cdn' if i == 0 else False)
+                for i, figure in enumerate(figures))),
+        }
+        for filename, (title, body) in pages.items():
+            _write(os.path.join(build_dir, filename), page_html(title, season_label, body, generated))
+
+        manifest = {
+            'season': season,
+            'version': version,
+            'generated': time.time(),
+            'pages': list(pages),
+            'data': [f"data/{name}.json" for name in tables],
+            'reports': len(report_links),
+        }
+        _write(os.path.join(build_dir, MANIFEST_FILENAME), json.dumps(manifest, indent=1))
+
+        # Swap the new bundle in
+        old_dir = None
+        if os.path.exists(target_dir):
+            old_dir = build_dir + "-old"
+            os.replace(target_dir, old_dir)
+        os.replace(build_dir, target_dir)
+        if old_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    logger.info("Built static site of %s", season_label, extra={
+        'version': version, 'reports': len(reports),
+        'duration_ms': round((time.perf_counter() - start) * 1000, 1)})
+    return manifest
+
+
+def read_manifest(target_dir):
+    """Manifest of the bundle in target_dir, or None when there is no bundle"""
+    path = os.path.join(target_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        logger.exception("Could not read static site manifest %s", path)
+        return None
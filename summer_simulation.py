@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Summer competition: best 5 of 9 games count (see tools.calculate_summer_percentage)
+SUMMER_TOTAL_GAMES = 9
+SUMMER_BEST_N = 5
+
+
+def _player_histories(df_received):
+    """Return names, classes and padded (players x games) arrays of Totaal and TheoMax"""
+    valid_classes = ['A', 'B', 'C']
+    df_filtered = df_received[df_received['KLASSE'].isin(valid_classes)]
+    df_filtered = df_filtered[df_filtered['TheoMax'] > 0]
+
+    grouped = df_filtered.groupby('Naam', sort=True, observed=True)
+    names = np.array(list(grouped.groups.keys()), dtype=object)
+    classes = grouped['KLASSE'].first().reindex(names).to_numpy()
+    n_games = grouped.size().reindex(names).to_numpy()
+
+    # Position of each row inside its player's history, to scatter into a dense array
+    player_idx = pd.Categorical(df_filtered['Naam'], categories=names).codes
+    game_idx = grouped.cumcount().to_numpy()
+
+    max_games = int(n_games.max()) if len(n_games) else 0
+    totals = np.zeros((len(names), max_games))
+    maxima = np.zeros((len(names), max_games))
+    totals[player_idx, game_idx] = df_filtered['Totaal'].to_numpy(dtype=float)
+    maxima[player_idx, game_idx] = df_filtered['TheoMax'].to_numpy(dtype=float)
+
+    return names, classes, n_games, totals, maxima
+
+
+def _summer_scores(totals, maxima, valid, best_n):
+    """
+    Apply the summer rule on the last axis of the given arrays.
+
+    Players with best_n games or fewer get their overall percentage (total score / total max),
+    players with more games get the average percentage of their best_n games.
+    """
+    n_played = valid.sum(axis=-1)
+    sum_tot = np.where(valid, totals, 0).sum(axis=-1)
+    sum_max = np.where(valid, maxima, 0).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overall = np.where(sum_max > 0, sum_tot / sum_max * 100, 0)
+        game_pct = np.where(valid, totals / np.where(maxima > 0, maxima, 1) * 100, -np.inf)
+
+    # Sort descending and average the best_n games
+    best = -np.sort(-game_pct, axis=-1)[..., :best_n]
+    best_mean = np.where(np.isfinite(best), best, 0).sum(axis=-1) / best_n
+
+    return np.where(n_played <= best_n, overall, best_mean)
+
+
+def simulate_summer_standings(df_received, n_runs=5000, total_games=SUMMER_TOTAL_GAMES,
+                              best_n=SUMMER_BEST_N, target_place=3, seed=None, games_so_far=None):
+    """
+    Simulate the remaining summer games and return finishing-position probabilities.
+
+    Future games are sampled per player from their own history (score and theoretical
+    maximum of a random earlier game), and a player shows up for a future game with the
+    probability given by their attendance so far. Every run recomputes the best-N
+    standings, all runs are evaluated at once with numpy.
+
+    Args:
+        df_received (pd.DataFrame): Season dataframe (one row per player per game).
+        n_runs (int): Number of simulated seasons.
+        total_games (int): Total number of games in the competition.
+        best_n (int): Number of best games that count.
+        target_place (int): Place used for the 'Kans top N' and 'Nodig voor top N' columns.
+        seed (int): Optional seed for reproducible results.
+        games_so_far (int): Games played in the competition so far, by default the number of
+            dates in df_received (pass it when df_received holds only some of the players).
+
+    Returns:
+        pd.DataFrame: One row per player with the current summer percentage, the expected
+        place, the chance to finish at or above target_place, the average game percentage
+        needed in the remaining games in the runs where that happened, and a 'Plaats k'
+        column with the probability (in %) for every finishing position.
+    """
+    names, classes, n_games, totals, maxima = _player_histories(df_received)
+    n_players = len(names)
+    if n_players == 0:
+        return pd.DataFrame()
+
+    if games_so_far is None:
+        games_so_far = df_received['Datum'].nunique()
+    remaining = max(total_games - games_so_far, 0)
+    valid = np.arange(totals.shape[1])[np.newaxis, :] < n_games[:, np.newaxis]
+    current = _summer_scores(totals, maxima, valid, best_n)
+
+    rng = np.random.default_rng(seed)
+    attendance = n_games / max(games_so_far, 1)
+
+    # Sample future games: (runs, players, remaining)
+    shape = (n_runs, n_players, remaining)
+    attends = rng.random(shape) < attendance[np.newaxis, :, np.newaxis]
+    picks = (rng.random(shape) * n_games[np.newaxis, :, np.newaxis]).astype(int)
+    player_axis = np.arange(n_players)[np.newaxis, :, np.newaxis]
+    sim_totals = totals[player_axis, picks]
+    sim_maxima = maxima[player_axis, picks]
+
+    all_totals = np.concatenate([np.broadcast_to(totals, (n_runs,) + totals.shape), sim_totals], axis=-1)
+    all_maxima = np.concatenate([np.broadcast_to(maxima, (n_runs,) + maxima.shape), sim_maxima], axis=-1)
+    all_valid = np.concatenate([np.broadcast_to(valid, (n_runs,) + valid.shape), attends], axis=-1)
+    scores = _summer_scores(all_totals, all_maxima, all_valid, best_n)
+
+    # Rank per run (0 = first place), then count how often each player ends on each place
+    ranks = (-scores).argsort(axis=1, kind='stable').argsort(axis=1, kind='stable')
+    counts = np.bincount((np.arange(n_players)[np.newaxis, :] * n_players + ranks).ravel(),
+                         minlength=n_players * n_players).reshape(n_players, n_players)
+    probabilities = counts / n_runs * 100
+
+    # Average percentage in the simulated games for the runs where the target place was reached
+    reached = ranks < target_place
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sim_pct = np.where(attends, sim_totals / np.where(sim_maxima > 0, sim_maxima, 1) * 100, 0)
+        run_avg = np.where(attends.any(axis=-1), sim_pct.sum(axis=-1) / attends.sum(axis=-1), np.nan)
+    needed = np.where(reached & ~np.isnan(run_avg), run_avg, 0).sum(axis=0)
+    needed_runs = (reached & ~np.isnan(run_avg)).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        needed = np.where(needed_runs > 0, needed / needed_runs, np.nan)
+
+    df_result = pd.DataFrame({
+        'Naam': names,
+        'Klasse': classes,
+        'Wedstrijden': n_games,
+        f'% (Beste {best_n})': np.round(current, 2),
+        'Gem. plaats': np.round(ranks.mean(axis=0) + 1, 2),
+        f'Kans top {target_place}': np.round(probabilities[:, :target_place].sum(axis=1), 1),
+        f'Nodig voor top {target_place}': np.round(needed, 2) if remaining else np.nan,
+    })
+    place_columns = pd.DataFrame(np.round(probabilities, 1), columns=[f'Plaats {i + 1}' for i in range(n_players)])
+    df_result = pd.concat([df_result, place_columns], axis=1)
+
+    return df_result.sort_values('Gem. plaats').reset_index(drop=True)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Synthetic season generator for benchmarks.
+
+Produces Uitgebreid CSVs in the same layout as the exports of the federation
+(Nr;Ntsvnr;Naam;B1..B22;Totaal;Scrabbles;Nulscores;Solo's;Soloscrabbles, with a
+MAXIMUM row on top) and a season workbook built with tools.process_uitgebreid.
+"""
+
+import argparse
+import io
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import players
+import tools
+
+FIRST_NAMES = ['Ronald', 'Kurt', 'Rita', 'Dominique', 'Annelies', 'Kristof', 'Riet', 'Luc', 'Ann', 'John',
+               'Viv', 'Dave', 'William', 'Marc', 'Greta', 'Hilde', 'Johan', 'Linda', 'Patrick', 'Sonja']
+LAST_NAMES = ['TORREELE', 'FARASYN', 'MEURRENS', 'COENE', 'CLOETENS', "D'HONDT", 'VANDENBERGHE', 'CLAERHOUT',
+              'DEFOUR', 'VERLINDEN', 'BOSGAERD', 'DE SCHACHT', 'CALLEWAERT', 'PEETERS', 'JANSSENS', 'MAES',
+              'WILLEMS', 'DE SMET', 'GOOSSENS', 'WOUTERS']
+
+
+def make_members(n_players, rng):
+    """Return a member table (Naam, CLUB, KLASSE, Ntsvnr) with n_players unique players"""
+    names = []
+    for i in range(n_players):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        suffix = i // (len(FIRST_NAMES) * len(LAST_NAMES))
+        names.append(f"{last} {first}" + (f" {suffix + 1}" if suffix else ""))
+
+    # Roughly 40% A players, the rest B, a few without class (guests)
+    klasse = rng.choice(['A', 'B', None], size=n_players, p=[0.4, 0.55, 0.05])
+    return pd.DataFrame({
+        'Naam': names,
+        'CLUB': 'COXHYDE, Koksijde',
+        'KLASSE': klasse,
+        'Ntsvnr': [f"{1000 + i:04d}" for i in range(n_players)],
+    })
+
+
+def make_uitgebreid(df_players, skill, rng, n_turns=22):
+    """
+    Return one game in the Uitgebreid CSV layout for the given players.
+
+    Each player finds the top score of a turn with a probability given by their skill,
+    otherwise scores a fraction of it (or zero).
+    """
+    n_players = len(df_players)
+    turn_max = rng.integers(10, 90, size=n_turns)
+    bingo = rng.random(n_turns) < 0.15
+    turn_max = np.where(bingo, turn_max + 50, turn_max)
+
+    found = rng.random((n_players, n_turns)) < skill[:, np.newaxis]
+    fraction = rng.uniform(0.3, 0.95, size=(n_players, n_turns))
+    zero = rng.random((n_players, n_turns)) < 0.04
+    scores = np.where(found, turn_max, np.floor(turn_max * fraction)).astype(int)
+    scores = np.where(zero & ~found, 0, scores)
+
+    top = scores == turn_max
+    solo = top & (top.sum(axis=0) == 1)
+
+    turn_columns = [f"B{i + 1}" for i in range(n_turns)]
+    df_game = pd.DataFrame(scores, columns=turn_columns)
+    df_game.insert(0, 'Naam', df_players['Naam'].to_numpy())
+    df_game.insert(0, 'Ntsvnr', df_players['Ntsvnr'].to_numpy())
+    df_game['Totaal'] = scores.sum(axis=1)
+    df_game['Scrabbles'] = (top & bingo).sum(axis=1)
+    df_game['Nulscores'] = (scores == 0).sum(axis=1)
+    df_game["Solo's"] = solo.sum(axis=1)
+    df_game['Soloscrabbles'] = (solo & bingo).sum(axis=1)
+
+    df_game = df_game.sort_values('Totaal', ascending=False).reset_index(drop=True)
+    df_game.insert(0, 'Nr', (df_game.index + 1).astype(str))
+
+    maximum = {'Nr': ' ', 'Ntsvnr': '', 'Naam': 'MAXIMUM', 'Totaal': int(turn_max.sum()),
+               'Scrabbles': '', 'Nulscores': '', "Solo's": '', 'Soloscrabbles': ''}
+    maximum.update({col: int(value) for col, value in zip(turn_columns, turn_max)})
+    return pd.concat([pd.DataFrame([maximum]), df_game], ignore_index=True)[
+        ['Nr', 'Ntsvnr', 'Naam'] + turn_columns + ['Totaal', 'Scrabbles', 'Nulscores', "Solo's", 'Soloscrabbles']]
+
+
+def as_uploaded(df_game):
+    """Round-trip a game through the CSV format, so it has the dtypes of a real upload"""
+    return pd.read_csv(io.StringIO(df_game.to_csv(sep=';', index=False)), sep=';')
+
+
+def game_dates(n_games, start=datetime(2099, 9, 3)):
+    """Return n_games unique game dates (DD/MM/YYYY), one per week as long as possible"""
+    step = timedelta(days=7) if n_games <= 60 else timedelta(days=1)
+    return [(start + i * step).strftime('%d/%m/%Y') for i in range(n_games)]
+
+
+def generate_games(n_games, n_players, seed=0, attendance=0.7):
+    """Return (member table, list of (date, Uitgebreid dataframe)) for a synthetic season"""
+    rng = np.random.default_rng(seed)
+    df_members = make_members(n_players, rng)
+    skill = rng.beta(4, 4, size=n_players) * 0.8
+
+    games = []
+    for date_str in game_dates(n_games):
+        present = rng.random(n_players) < attendance
+        present[rng.integers(n_players)] = True
+        n_turns = 22 if rng.random() < 0.8 else 18
+        df_game = make_uitgebreid(df_members[present].reset_index(drop=True), skill[present], rng, n_turns)
+        games.append((date_str, df_game))
+    return df_members, games
+
+
+def process_games(games, df_members):
+    """Run tools.process_uitgebreid on every (already parsed) game and return the season dataframe"""
+    processed = []
+    for volgnummer, (date_str, df_csv) in enumerate(games, start=1):
+        row_wedstrijdinfo = {'Datum': date_str,
+                             'Beurten': len([col for col in df_csv.columns if col.startswith('B') and col[1:].isdigit()])}
+        df_csv = df_csv.assign(Ntsvnr=df_csv['Ntsvnr'].map(players.normalize_ntsvnr))
+        processed.append(tools.process_uitgebreid(df_csv, row_wedstrijdinfo, df_members, volgnummer).reset_index())
+    return pd.concat(processed, ignore_index=True)
+
+
+def write_season(out_dir, n_games, n_players, seed=0, write_csv=True):
+    """
+    Write a synthetic season to out_dir.
+
+    Returns:
+        dict: Paths of the written files ('csv_files', 'workbook', 'members').
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    df_members, games = generate_games(n_games, n_players, seed)
+
+    csv_files = []
+    if write_csv:
+        for i, (date_str, df_game) in enumerate(games, start=1):
+            path = os.path.join(out_dir, f"Uitgebreid-{i:02d}.csv")
+            df_game.to_csv(path, sep=';', index=False)
+            csv_files.append(path)
+
+    df_season = process_games([(date_str, as_uploaded(df_game)) for date_str, df_game in games], df_members)
+    workbook = os.path.join(out_dir, 'Globaal 2099-2100.xlsx')
+    df_season.to_excel(workbook, sheet_name='Globaal', index=False)
+
+    members = os.path.join(out_dir, 'Leden.xlsx')
+    df_members.to_excel(members, sheet_name='Leden', index=False)
+
+    return {'csv_files': csv_files, 'workbook': workbook, 'members': members}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Scrabble season")
+    parser.add_argument("--games", type=int, default=40)
+    parser.add_argument("--players", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_season")
+    args = parser.parse_args()
+
+    paths = write_season(args.out, args.games, args.players, args.seed)
+    print(f"Wrote {len(paths['csv_files'])} CSV files and {paths['workbook']}")
@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-from numpy.ma.extras import row_stack
-from setuptools.command.bdist_egg import walk_egg
+
+import app_logging
+
+logger = app_logging.get_logger('data')
 
 # General settings
 pd.options.display.float_format = '{:.2f}'.format
@@ -16,10 +18,13 @@ def calculate_summer_percentage(df_received):
     # Filter out players without valid class (A, B, or C)
     valid_classes = ['A', 'B', 'C']
     df_filtered = df_received[df_received['KLASSE'].isin(valid_classes)].copy()
+    # Games in order, so the last row of a player is their latest game
+    if 'GameNr' in df_filtered.columns:
+        df_filtered = df_filtered.sort_values('GameNr', kind='stable')
     
     summer_percentages = []
     
-    for _, player_data in df_filtered.groupby('Naam'):
+    for _, player_data in df_filtered.groupby('Naam', observed=True):
         games_played = len(player_data)
         
         # Calculate normal percentage (all games)
@@ -39,7 +44,8 @@ def calculate_summer_percentage(df_received):
         
         summer_percentages.append({
             'Naam': player_data['Naam'].iloc[0],
-            'Klasse': player_data['KLASSE'].iloc[0],
+            # A player whose class changed during the season is ranked in their latest class
+            'Klasse': player_data['KLASSE'].iloc[-1],
             'Wedstrijden': games_played,
             'Tot. T. MAX': player_data['TheoMax'].sum(),
             'Tot. Score': player_data['Totaal'].sum(),
@@ -59,6 +65,42 @@ def calculate_summer_percentage(df_received):
     return pd.DataFrame(summer_percentages)
 
 
+def summer_dropped_games(df_received, best_n=5):
+    """
+    Mark the games that do not count for the summer best-5 rule.
+
+    Players with more than best_n games only keep their best_n percentages, the other
+    games are dropped. Computed for all players at once.
+
+    Args:
+        df_received (pd.DataFrame): Season frame (one row per player per game).
+        best_n (int): Number of games that count.
+
+    Returns:
+        pd.DataFrame: Boolean table with a row per player (Naam) and a column per date,
+            True where the player played the game but it does not count.
+    """
+    valid_classes = ['A', 'B', 'C']
+    df_filtered = df_received[df_received['KLASSE'].isin(valid_classes)]
+    if df_filtered.empty:
+        return pd.DataFrame()
+
+    game_percentages = (df_filtered['Totaal'] / df_filtered['TheoMax'] * 100).fillna(0)
+    by_player = game_percentages.groupby(df_filtered['Naam'], observed=True)
+    # rank 'first' keeps the earlier game on ties, like the stable sort of calculate_summer_percentage
+    place = by_player.rank(method='first', ascending=False)
+    games_played = by_player.transform('size')
+    dropped = (games_played > best_n) & (place > best_n)
+
+    mask = (pd.DataFrame({'Naam': df_filtered['Naam'].astype(str), 'Datum': df_filtered['Datum'].astype(str),
+                          'dropped': dropped.astype(float)})
+            .pivot(index='Naam', columns='Datum', values='dropped'))
+    mask.columns = pd.to_datetime(mask.columns, dayfirst=True)
+    mask = mask.sort_index(axis=1)
+    mask.columns = mask.columns.strftime('%d/%m/%Y')
+    return mask.fillna(0).astype(bool)
+
+
 def process_uitgebreid(dfp_uitgebreid,row_wedstrijdinfo, dfp_leden, pwedstrijd):
 
     df_to_return = dfp_uitgebreid.copy()
@@ -95,8 +137,26 @@ def process_uitgebreid(dfp_uitgebreid,row_wedstrijdinfo, dfp_leden, pwedstrijd):
     winnaar_vs_mediaan = pct_winnaar - mediaan
     df_to_return['RP'] = 100 - ((pct_winnaar - df_to_return['Percent']) * 22 / winnaar_vs_mediaan )
 
-    # We add column 'KLASSE' from dfp_leden
-    df_to_return = df_to_return.merge(dfp_leden[['Naam', 'KLASSE']], on='Naam', how='left')
+    # We keep column Ntsvnr: the federation number identifies the player (see players.py).
+    # The caller passes it normalized, like the member table has it ('0548')
+
+    # We add column 'KLASSE' from dfp_leden, on the federation number when the member table has it
+    # (a player whose name is spelled differently in the results still gets their class) and
+    # on the name for the players whose number is not in the member table
+    klasse_by_naam = dfp_leden.drop_duplicates('Naam').set_index('Naam')['KLASSE']
+    klasse = pd.Series(df_to_return.index.map(klasse_by_naam), index=df_to_return.index, dtype=object)
+    if 'Ntsvnr' in dfp_leden.columns and 'Ntsvnr' in df_to_return.columns:
+        klasse_by_ntsvnr = dfp_leden.dropna(subset=['Ntsvnr']).drop_duplicates('Ntsvnr').set_index('Ntsvnr')['KLASSE']
+        on_ntsvnr = df_to_return['Ntsvnr'].map(klasse_by_ntsvnr)
+        unmatched = on_ntsvnr.isna()
+        if unmatched.any():
+            logger.warning("Players not found on Ntsvnr in the member table, matched on name: %s",
+                           ", ".join(f"{naam} ({ntsvnr or 'no Ntsvnr'}{'' if pd.notna(naam_klasse) else ', no class'})"
+                                     for naam, ntsvnr, naam_klasse in zip(df_to_return.index[unmatched],
+                                                                          df_to_return.loc[unmatched, 'Ntsvnr'],
+                                                                          klasse[unmatched])))
+        klasse = on_ntsvnr.astype(object).where(~unmatched, klasse)
+    df_to_return['KLASSE'] = klasse
 
     # We add 'Volgnummer' to the dataframe to return
     df_to_return['Volgnummer'] = pwedstrijd
@@ -108,19 +168,22 @@ def process_uitgebreid(dfp_uitgebreid,row_wedstrijdinfo, dfp_leden, pwedstrijd):
     df_to_return['Nr'] = df_to_return['Nr'].astype('int')
     df_to_return['Punten'] = df_to_return['Nr'].max() - df_to_return['Nr'] + 1
 
-    # We delete column Ntsvnr, since we don't need it for further analysis.
-    del df_to_return['Ntsvnr']
-
     return df_to_return
 
 def give_gen_info(df_received):
     # Filter out players without valid class (A, B, or C)
     valid_classes = ['A', 'B', 'C']
     df_filtered = df_received[df_received['KLASSE'].isin(valid_classes)].copy()
+    # Games in order, so the last row of a player is their latest game
+    if 'GameNr' in df_filtered.columns:
+        df_filtered = df_filtered.sort_values('GameNr', kind='stable')
     
+    # One row per player: a player whose class changed during the season gets the class
+    # of their latest game (like the cumulative standings)
     df_grouped_algemeen = (df_filtered
-                           .groupby(['Naam', 'KLASSE'])
-                           .agg(games_played = ('Totaal', 'count'),
+                           .groupby('Naam', observed=True)
+                           .agg(KLASSE = ('KLASSE', 'last'),
+                                games_played = ('Totaal', 'count'),
                                 total_max = ('TheoMax', 'sum'),
                                 total_score = ('Totaal', 'sum'),
                                 scrabbles_found = ('Scrabbles', 'sum'),
@@ -200,9 +263,114 @@ def make_pivot(dfp, pindex, pcols, pvalues, force_int=False, fill_blank=True):
 def process_final_df(df_global, pivot_df, columns, sort_by):
     df_for_processing = df_global[columns]
     result = (pd.merge(df_for_processing, pivot_df, on='Naam', how='left')
-              .sort_values(by=sort_by, ascending=False)
+              .sort_values(by=sort_by, ascending=False, kind='stable')
               .reset_index(drop=True)
               .assign(index=lambda dfx: dfx.index + 1)
               .set_index('index')
               .rename(columns={'index':'P'}))
-    return result
\ No newline at end of file
+    return result
+
+# Canonical in-memory schema of a season frame (one row per player per game)
+CATEGORY_COLUMNS = ['Naam', 'Ntsvnr', 'KLASSE', 'Club', 'CLUB']
+TURN_DTYPE = 'Int16'
+# Counters that stay far below 32767, row-wise arithmetic on them is done after aggregating
+SMALL_INT_COLUMNS = ['Nr', 'Scrabbles', 'Nulscores', "Solo's", 'Soloscrabbles', 'Maxes', 'Volgnummer', 'Beurten',
+                     'Punten', 'GameNr']
+# Game totals are multiplied by 100 for percentages, so they get 32 bits (like the player ids)
+INT_COLUMNS = ['Totaal', 'TheoMax', 'PlayerId']
+FLOAT32_COLUMNS = ['Percent', 'RP']
+# The precision float32 columns are guaranteed to keep
+FLOAT32_DECIMALS = 2
+
+
+def _is_turn_column(col):
+    return isinstance(col, str) and col.startswith('B') and col[1:].isdigit()
+
+
+def _float32_at_precision(series, decimals=FLOAT32_DECIMALS):
+    """
+    Return the series as float32 when every value rounds to the same number of decimals as before.
+
+    Not an exact check: float32 keeps about 7 significant digits, so a percentage can move
+    by up to about 1e-5. That is far below the 2 decimals the app shows and exports (see
+    api.plain_floats); a value that would round differently keeps the series float64.
+    """
+    values = series.astype('float64')
+    narrowed = values.astype('float32')
+    same = (values.round(decimals) == narrowed.astype('float64').round(decimals)) | values.isna()
+    return narrowed if same.all() else values
+
+
+def compact_season_frame(df):
+    """
+    Convert a season frame to the compact in-memory schema.
+
+    Names and classes become categoricals, Datum an ordered categorical in game order
+    (Datum_dt is dropped, the date is only stored once), turn scores nullable Int16 and
+    the counters small integers. Percent and RP become float32 when that does not change
+    any value at 2 decimals.
+
+    Args:
+        df (pd.DataFrame): Season frame as read from the season workbook.
+
+    Returns:
+        pd.DataFrame: Compact copy of the frame.
+    """
+    df_compact = df.copy()
+
+    for col in CATEGORY_COLUMNS:
+        if col in df_compact.columns:
+            df_compact[col] = df_compact[col].astype('category').cat.remove_unused_categories()
+
+    if 'Datum' in df_compact.columns:
+        if 'Datum_dt' in df_compact.columns:
+            dates = df_compact['Datum_dt']
+        else:
+            dates = pd.to_datetime(df_compact['Datum'], dayfirst=True)
+        ordered_dates = dates.drop_duplicates().sort_values().dt.strftime('%d/%m/%Y')
+        df_compact['Datum'] = pd.Categorical(dates.dt.strftime('%d/%m/%Y'), categories=ordered_dates, ordered=True)
+        df_compact = df_compact.drop(columns=['Datum_dt'], errors='ignore')
+
+    for col in df_compact.columns:
+        if _is_turn_column(col):
+            df_compact[col] = pd.to_numeric(df_compact[col], errors='coerce').round().astype(TURN_DTYPE)
+    for col in SMALL_INT_COLUMNS:
+        if col in df_compact.columns and df_compact[col].notna().all():
+            df_compact[col] = df_compact[col].astype('int16')
+    for col in INT_COLUMNS:
+        if col in df_compact.columns and df_compact[col].notna().all():
+            df_compact[col] = df_compact[col].astype('int32')
+    for col in FLOAT32_COLUMNS:
+        if col in df_compact.columns:
+            df_compact[col] = _float32_at_precision(df_compact[col])
+
+    return df_compact
+
+
+def compact_columns(df):
+    """Columns of a frame that are in the compact in-memory schema (categoricals, float32), see compact_season_frame"""
+    return [col for col, dtype in df.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype) or (col in FLOAT32_COLUMNS and dtype == 'float32')]
+
+
+def memory_report(frames):
+    """
+    Measure the memory used by a set of dataframes.
+
+    Args:
+        frames (dict): Name -> dataframe (None or non-dataframes are skipped).
+
+    Returns:
+        pd.DataFrame: One row per frame with rows, columns and deep memory usage in KB.
+    """
+    rows = []
+    for name, frame in frames.items():
+        if not isinstance(frame, pd.DataFrame):
+            continue
+        rows.append({
+            'Tabel': name,
+            'Rijen': len(frame),
+            'Kolommen': len(frame.columns),
+            'KB': round(frame.memory_usage(deep=True).sum() / 1024, 1),
+        })
+    return pd.DataFrame(rows, columns=['Tabel', 'Rijen', 'Kolommen', 'KB'])
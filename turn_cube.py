@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+
+def _masked_mean(values, where, axis):
+    """Mean of values over axis, only counting cells where `where` is True (NaN when there are none)"""
+    counts = where.sum(axis=axis)
+    totals = np.where(where, values, 0).sum(axis=axis, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, totals / counts, np.nan)
+
+
+def get_turn_columns(df):
+    """Return the turn columns (B1, B2, ...) of a dataframe, sorted by turn number"""
+    turn_columns = [col for col in df.columns if col.startswith('B') and col[1:].isdigit()]
+    return sorted(turn_columns, key=lambda x: int(x[1:]))
+
+
+class TurnCube:
+    """
+    Turn level statistics for a whole season, stored as a game x turn x player cube.
+
+    All measures are numpy arrays indexed [game, turn, player]; per-turn measures
+    (the best score of a turn) are indexed [game, turn]. The cube is built once per
+    season load, aggregate questions are answered by slicing and reducing the arrays.
+    """
+
+    def __init__(self, game_numbers, dates, turns, players, score, mask):
+        self.game_numbers = np.asarray(game_numbers)
+        self.dates = list(dates)
+        self.turns = list(turns)
+        self.players = np.asarray(players, dtype=object)
+
+        # score: int16 turn scores, mask: True where the player has a score for that turn
+        self.score = score
+        self.mask = mask
+
+        # Best score any player found on a turn (0 when the turn was not played)
+        self.max = np.where(mask, score, -1).max(axis=2, initial=-1).clip(min=0).astype(np.int16)
+        self.turn_played = mask.any(axis=2)
+
+        max_b = self.max[:, :, np.newaxis]
+        self.zero = mask & (score == 0)
+        self.top = mask & (score == max_b) & (max_b > 0)
+        # A solo is a top score that no other club player found on that turn (the Solo's
+        # column of the uploads is computed by the federation over a wider field)
+        self.solo = self.top & (self.top.sum(axis=2, keepdims=True) == 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(mask & (max_b > 0), score / max_b * 100, np.nan)
+        self.pct_of_max = pct.astype(np.float32)
+
+        self._game_index = {date: i for i, date in enumerate(self.dates)}
+        self._player_index = {name: i for i, name in enumerate(self.players)}
+
+    @property
+    def shape(self):
+        return self.score.shape
+
+    @property
+    def nbytes(self):
+        """Memory used by the cube arrays in bytes"""
+        arrays = [self.score, self.mask, self.max, self.turn_played, self.zero, self.top, self.solo, self.pct_of_max]
+        return sum(a.nbytes for a in arrays)
+
+    def game_index(self, date_str):
+        return self._game_index.get(date_str)
+
+    def player_index(self, player_name):
+        return self._player_index.get(player_name)
+
+    def turn_max(self, date_str):
+        """Return {turn: best score} for the turns played in a game"""
+        g = self.game_index(date_str)
+        if g is None:
+            return {}
+        return {turn: int(self.max[g, t]) for t, turn in enumerate(self.turns) if self.turn_played[g, t]}
+
+    def player_turns(self, player_name, date_str):
+        """Return a dataframe with the turn-by-turn scores of one player in one game"""
+        g = self.game_index(date_str)
+        p = self.player_index(player_name)
+        if g is None or p is None:
+            return pd.DataFrame(columns=['Beurt', 'Score', 'Max Score', 'Percentage'])
+
+        played = self.mask[g, :, p]
+        pct = np.nan_to_num(self.pct_of_max[g, :, p][played].astype(float))
+        return pd.DataFrame({
+            'Beurt': np.asarray(self.turns)[played],
+            'Score': self.score[g, :, p][played].astype(int),
+            'Max Score': self.max[g, :][played].astype(int),
+            'Percentage': np.round(pct, 2),
+        })
+
+    def player_totals(self):
+        """Return the number of turns, maxes, zeros and solos per player over the season"""
+        return pd.DataFrame({
+            'Naam': self.players,
+            'Beurten': self.mask.sum(axis=(0, 1)),
+            'Max. scores': self.top.sum(axis=(0, 1)),
+            'Nulscores': self.zero.sum(axis=(0, 1)),
+            "Solo's": self.solo.sum(axis=(0, 1)),
+        })
+
+    def hardest_turns(self, n=10):
+        """Return the n turns of the season with the lowest average percentage of the maximum"""
+        avg_pct = _masked_mean(self.pct_of_max, self.mask & (self.max > 0)[:, :, np.newaxis], axis=2)
+        n_top = self.top.sum(axis=2)
+        n_players = self.mask.sum(axis=2)
+
+        g_idx, t_idx = np.nonzero(self.turn_played & (self.max > 0))
+        df_turns = pd.DataFrame({
+            'GameNr': self.game_numbers[g_idx],
+            'Datum': np.asarray(self.dates)[g_idx],
+            'Beurt': np.asarray(self.turns)[t_idx],
+            'Max': self.max[g_idx, t_idx].astype(int),
+            'Gem. %': np.round(avg_pct[g_idx, t_idx].astype(float), 2),
+            'Max gevonden': n_top[g_idx, t_idx],
+            'Spelers': n_players[g_idx, t_idx],
+        })
+        return df_turns.sort_values(['Gem. %', 'Max'], ascending=[True, False]).head(n).reset_index(drop=True)
+
+    def player_accuracy(self, min_max=None, quantile=0.75):
+        """
+        Return per player accuracy on high-value turns.
+
+        Args:
+            min_max (int): Only turns whose best score is at least this value are used.
+                When None, the given quantile of all turn maxima is used as threshold.
+            quantile (float): Quantile used to derive the threshold when min_max is None.
+
+        Returns:
+            pd.DataFrame: One row per player with the number of high-value turns played,
+            the average percentage of the maximum and the number of maxes found on them.
+        """
+        played_max = self.max[self.turn_played]
+        if played_max.size == 0:
+            return pd.DataFrame(columns=['Naam', 'Beurten', 'Gem. %', 'Max. scores'])
+        if min_max is None:
+            min_max = np.quantile(played_max, quantile)
+
+        high_value = (self.turn_played & (self.max >= min_max))[:, :, np.newaxis] & self.mask
+        n_turns = high_value.sum(axis=(0, 1))
+        avg_pct = _masked_mean(self.pct_of_max, high_value, axis=(0, 1))
+
+        df_accuracy = pd.DataFrame({
+            'Naam': self.players,
+            'Beurten': n_turns,
+            'Gem. %': np.round(avg_pct.astype(float), 2),
+            'Max. scores': (self.top & high_value).sum(axis=(0, 1)),
+        })
+        return df_accuracy[df_accuracy['Beurten'] > 0].sort_values('Gem. %', ascending=False).reset_index(drop=True)
+
+
+def build_turn_cube(df_global):
+    """Build a TurnCube from the season dataframe (one row per player per game)"""
+    if df_global is None or df_global.empty:
+        return None
+    turn_columns = get_turn_columns(df_global)
+    if not turn_columns:
+        return None
+
+    df = df_global[~df_global['Naam'].astype(str).str.upper().eq('MAXIMUM')]
+
+    games = df[['GameNr', 'Datum']].drop_duplicates('GameNr').sort_values('GameNr')
+    game_codes = pd.Categorical(df['GameNr'], categories=games['GameNr']).codes
+    player_cat = pd.Categorical(df['Naam'].astype(str))
+    player_codes = player_cat.codes
+
+    values = df[turn_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+    shape = (len(games), len(turn_columns), len(player_cat.categories))
+    score = np.zeros(shape, dtype=np.int16)
+    mask = np.zeros(shape, dtype=bool)
+    present = ~np.isnan(values)
+    score[game_codes, :, player_codes] = np.where(present, values, 0).astype(np.int16)
+    mask[game_codes, :, player_codes] = present
+
+    return TurnCube(games['GameNr'].to_numpy(), games['Datum'].tolist(), turn_columns,
+                    player_cat.categories.to_numpy(), score, mask)
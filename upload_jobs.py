@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import app_logging
+
+logger = app_logging.get_logger('jobs')
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class StageError(Exception):
+    """A stage failed with a message that can be shown to the user"""
+
+
+class Job:
+    """A background job: an ordered list of stages sharing a context dict"""
+
+    def __init__(self, stages, context, description=""):
+        self.id = uuid.uuid4().hex[:12]
+        self.description = description
+        self.context = context
+        self.stages = [{'name': name, 'status': QUEUED, 'duration_ms': None, 'note': None} for name, _ in stages]
+        self._functions = [fn for _, fn in stages]
+        self.status = QUEUED
+        self.error = None
+        self.result = None
+        self.attempts = 0
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def retryable(self):
+        """A failed job can be retried as long as it still has its context"""
+        return self.status == FAILED and self.context is not None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'description': self.description,
+            'status': self.status,
+            'error': self.error,
+            'result': self.result,
+            'attempts': self.attempts,
+            'created': self.created,
+            'finished': self.finished,
+            'stages': [dict(stage) for stage in self.stages],
+        }
+
+    def run(self):
+        """Run the stages that did not complete yet, a retry resumes at the failed stage"""
+        self.attempts += 1
+        self.status = RUNNING
+        self.error = None
+        for stage, fn in zip(self.stages, self._functions):
+            if stage['status'] == DONE:
+                continue
+            stage['status'] = RUNNING
+            start = time.perf_counter()
+            try:
+                stage['note'] = fn(self.context)
+            except Exception as e:
+                stage['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+                stage['status'] = FAILED
+                self.status = FAILED
+                self.error = str(e) if isinstance(e, StageError) else f"{type(e).__name__}: {e}"
+                self.finished = time.time()
+                if isinstance(e, StageError):
+                    logger.warning("Job %s failed in stage %s: %s", self.id, stage['name'], e)
+                else:
+                    logger.exception("Job %s failed in stage %s", self.id, stage['name'])
+                return
+            stage['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            stage['status'] = DONE
+            logger.info("Job %s stage %s done", self.id, stage['name'], extra={'duration_ms': stage['duration_ms']})
+
+        self.status = DONE
+        self.result = self.context.get('result')
+        self.finished = time.time()
+
+
+class JobRunner:
+    """
+    Runs jobs one at a time in a background thread and keeps the latest jobs for status queries.
+
+    One worker means uploads never write the same season workbook concurrently. Only the
+    latest keep_failed failed jobs keep their context (the parsed upload and season frame)
+    for a retry, older failed jobs only keep their status.
+    """
+
+    def __init__(self, max_jobs=50, keep_failed=3):
+        self.max_jobs = max_jobs
+        self.keep_failed = keep_failed
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, stages, context, description=""):
+        """Queue a new job and return it immediately"""
+        job = Job(stages, context, description)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        job.run()
+        if job.status == FAILED:
+            self._release_failed()
+
+    def _release_failed(self):
+        """Drop the context of the failed jobs but the latest keep_failed"""
+        with self._lock:
+            failed = [job for job in self._jobs.values() if job.retryable]
+            for job in failed[:max(len(failed) - self.keep_failed, 0)]:
+                job.context = None
+                logger.info("Released the context of failed job %s", job.id)
+
+    def retry(self, job_id):
+        """Queue a failed job again, returns the job or None when it can not be retried"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.retryable:
+                return None
+            job.status = QUEUED
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())